@@ -0,0 +1,332 @@
+"""Streamlit 없이 생성기를 JSON/SSE 엔드포인트로 제공하는 asyncio HTTP 서버
+
+    python api_server.py --port 8080 --workers 16 --max-pending 64
+
+엔드포인트 (모두 JSON 본문의 POST, ?stream=1 또는 Accept: text/event-stream이면 SSE로 응답)
+    POST /v1/ideas           generate_hackathon_idea_with_nova
+    POST /v1/prds            generate_streamlit_prd
+    POST /v1/introductions   generate_introduction_with_nova
+    GET  /healthz            실행기/대기열 상태
+    GET  /metrics            Prometheus 텍스트 형식 메트릭
+
+SSE 스트림은 부분 결과가 이어질 때 "chunk" 이벤트({"delta"}), 섹션 교정 등으로 앞부분이
+바뀌면 "replace" 이벤트({"text"}), 마지막에 "done" 또는 "error" 이벤트를 보냅니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from hackathon_generator import generate_hackathon_idea_with_nova, generate_streamlit_prd, get_rate_governor, get_telemetry
+from telemetry import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from introduction_generator import generate_introduction_with_nova
+
+MAX_BODY_BYTES = 1024 * 1024  # 요청 본문 최대 크기
+HEADER_TIMEOUT = 10.0  # 요청 헤더/본문을 받는 최대 시간 (초)
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout",
+    413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error", 502: "Bad Gateway",
+    503: "Service Unavailable"
+}
+
+IDEA_FIELDS = ["problem_area", "target_problem", "ai_technology", "target_users", "expected_impact"]
+INTRODUCTION_FIELDS = ["name", "major", "hobby", "experiences", "target_job"]
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def require_fields(payload, fields):
+    missing = [field for field in fields if not str(payload.get(field, "")).strip()]
+    if missing:
+        raise HttpError(400, f"필수 필드가 없습니다: {', '.join(missing)}")
+    return [payload[field] for field in fields]
+
+
+def run_idea(payload, on_chunk):
+    inputs = require_fields(payload, IDEA_FIELDS)
+    idea_length = payload.get("idea_length", "보통")
+    if idea_length not in ("간단", "보통", "상세"):
+        raise HttpError(400, "idea_length는 간단/보통/상세 중 하나여야 합니다.")
+    metrics = {}
+    text = generate_hackathon_idea_with_nova(
+        *inputs, idea_length,
+        on_chunk=on_chunk,
+        metrics=metrics,
+        fresh=bool(payload.get("fresh")),
+        parallel_sections=bool(payload.get("parallel_sections")),
+        enforce_section_limits=bool(payload.get("enforce_section_limits"))
+    )
+    return text, {"generated_content": text, "idea_length": idea_length, "metrics": metrics}
+
+
+def run_prd(payload, on_chunk):
+    idea_content, = require_fields(payload, ["idea_content"])
+    metrics = {}
+    text = generate_streamlit_prd(idea_content, on_chunk=on_chunk, metrics=metrics, fresh=bool(payload.get("fresh")))
+    return text, {"prd_content": text, "metrics": metrics}
+
+
+def run_introduction(payload, on_chunk):
+    inputs = require_fields(payload, INTRODUCTION_FIELDS)
+    text = generate_introduction_with_nova(*inputs, on_chunk=on_chunk)
+    return text, {"introduction": text}
+
+
+ROUTES = {
+    "/v1/ideas": run_idea,
+    "/v1/prds": run_prd,
+    "/v1/introductions": run_introduction
+}
+
+
+def error_status(text):
+    """생성기가 돌려준 사용자용 오류 문자열을 HTTP 상태 코드로 변환 (정상 결과면 None)"""
+    if text.startswith("⏳"):
+        return 429
+    if text.startswith("❌"):
+        return 502
+    return None
+
+
+class GenerationServer:
+    """제한된 스레드 풀에서 블로킹 생성기를 실행하는 asyncio HTTP 서버
+
+    모든 요청은 프로세스 하나의 Bedrock 클라이언트 풀과 호출 속도 조절기를 공유합니다.
+    실행 중이거나 실행을 기다리는 요청이 max_pending을 넘으면 바로 503과 Retry-After로
+    거절하여 대기열이 끝없이 쌓이지 않도록 하고, SSE 클라이언트가 느리면 쌓인 부분
+    결과를 합쳐 최신 상태만 보냅니다.
+    """
+
+    def __init__(self, workers=16, max_pending=64):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-generation")
+        self._workers = workers
+        self._pending = 0
+        self._stats = {"requests": 0, "rejected": 0, "errors": 0}
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, target, headers, body = await asyncio.wait_for(self._read_request(reader), HEADER_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HttpError(408, "요청을 받는 시간이 초과되었습니다.")
+            await self._route(method, target, headers, body, writer)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, e.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # 생성 함수의 예상하지 못한 오류도 응답 없이 연결을 끊지 않고 500으로 알림
+            self._stats["errors"] += 1
+            try:
+                await self._send_json(writer, 500, {"error": f"❌ 요청 처리 중 오류 발생: {e}"})
+            except ConnectionError:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def status(self):
+        return dict(
+            self._stats,
+            workers=self._workers,
+            pending=self._pending,
+            max_pending=self.max_pending,
+            governor=get_rate_governor().status()
+        )
+
+    async def _route(self, method, target, headers, body, writer):
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            await self._send_json(writer, 200, dict(self.status(), status="ok"))
+            return
+        if url.path == "/metrics":
+            await self._send_text(writer, 200, get_telemetry().render(), METRICS_CONTENT_TYPE)
+            return
+
+        handler = ROUTES.get(url.path)
+        if handler is None:
+            raise HttpError(404, "알 수 없는 경로입니다.")
+        if method != "POST":
+            raise HttpError(405, "POST 요청만 지원합니다.", {"Allow": "POST"})
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "요청 본문은 JSON 객체여야 합니다.")
+
+        stream = parse_qs(url.query).get("stream", ["0"])[0] in ("1", "true") or \
+            "text/event-stream" in headers.get("accept", "")
+
+        # 백프레셔: 처리 가능한 양을 넘는 요청은 대기열에 넣지 않고 바로 거절
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            retry_after = max(1, int(get_rate_governor().status()["estimated_wait"]))
+            raise HttpError(503, "요청이 많아 잠시 후 다시 시도해주세요.", {"Retry-After": str(retry_after)})
+
+        self._pending += 1
+        self._stats["requests"] += 1
+        try:
+            if stream:
+                await self._stream(handler, payload, writer)
+            else:
+                text, result = await asyncio.get_running_loop().run_in_executor(self._executor, handler, payload, None)
+                status = error_status(text)
+                if status:
+                    self._stats["errors"] += 1
+                    await self._send_json(writer, status, {"error": text})
+                else:
+                    await self._send_json(writer, 200, result)
+        finally:
+            self._pending -= 1
+
+    async def _stream(self, handler, payload, writer):
+        loop = asyncio.get_running_loop()
+        updated = asyncio.Event()
+        latest = {"text": ""}
+
+        def on_chunk(text):
+            # 작업 스레드에서 불리므로 최신 텍스트만 남기고 이벤트 루프에 알림
+            latest["text"] = text
+            loop.call_soon_threadsafe(updated.set)
+
+        future = loop.run_in_executor(self._executor, handler, payload, on_chunk)
+        sent = None  # 응답 헤더를 보내기 전에는 None (입력 오류는 일반 JSON 오류로 응답)
+        client_connected = True
+
+        while True:
+            waiter = asyncio.ensure_future(updated.wait())
+            await asyncio.wait([future, waiter], return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+            updated.clear()
+            if future.done() and future.exception() is not None and sent is None:
+                raise future.exception()
+            if client_connected and latest["text"] != (sent or ""):
+                try:
+                    if sent is None:
+                        sent = await self._start_stream(writer)
+                    sent = await self._send_progress(writer, sent, latest["text"])
+                except ConnectionError:
+                    # 연결이 끊겨도 생성은 끝까지 진행되어 응답 캐시에 남음
+                    client_connected = False
+            if future.done():
+                break
+
+        if not client_connected:
+            return
+        try:
+            text, result = future.result()
+        except Exception as e:
+            # 헤더를 이미 보냈으므로 상태 코드 대신 error 이벤트로 스트림을 끝냄
+            self._stats["errors"] += 1
+            message = str(e) if isinstance(e, HttpError) else f"❌ 요청 처리 중 오류 발생: {e}"
+            await self._send_event(writer, "error", {"error": message})
+            return
+        if sent is None:
+            await self._start_stream(writer)
+        if error_status(text):
+            self._stats["errors"] += 1
+            await self._send_event(writer, "error", {"error": text})
+        else:
+            await self._send_event(writer, "done", result)
+
+    async def _start_stream(self, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        await writer.drain()
+        return ""
+
+    async def _send_progress(self, writer, sent, text):
+        if text.startswith(sent):
+            await self._send_event(writer, "chunk", {"delta": text[len(sent):]})
+        else:
+            await self._send_event(writer, "replace", {"text": text})
+        return text
+
+    async def _send_event(self, writer, event, data):
+        writer.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+        # 클라이언트가 읽는 속도에 맞춰 쓰기 버퍼가 비워질 때까지 기다림
+        await writer.drain()
+
+    async def _send_json(self, writer, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False, default=str)
+        await self._send_text(writer, status, body, "application/json; charset=utf-8", headers)
+
+    async def _send_text(self, writer, status, text, content_type, headers=None):
+        body = text.encode("utf-8")
+        lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close"
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HttpError(400, "잘못된 요청 줄입니다.")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length 헤더가 올바르지 않습니다.")
+        if length < 0:
+            raise HttpError(400, "Content-Length 헤더가 올바르지 않습니다.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "요청 본문이 너무 큽니다.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+
+async def serve(host, port, workers, max_pending):
+    server = GenerationServer(workers, max_pending)
+    get_telemetry()  # 첫 생성 요청 전에도 /metrics가 게이지를 보고하도록 등록
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"🌐 생성 API 서버 실행 중: http://{host}:{port} (작업자 {workers}, 최대 대기 {max_pending})", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="생성기를 JSON/SSE HTTP API로 제공합니다.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=16, help="블로킹 생성 호출을 실행할 스레드 수 (기본값: 16)")
+    parser.add_argument("--max-pending", type=int, default=64, help="실행 중+대기 요청 최대 수, 넘으면 503 (기본값: 64)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
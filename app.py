@@ -1,390 +1,144 @@
 import streamlit as st
-import boto3
-import json
+import functools
 import os
+import time
 from datetime import datetime
-from botocore.exceptions import ClientError
-
-# AWS Bedrock 클라이언트 초기화
-@st.cache_resource
-def get_bedrock_client():
-    try:
-        return boto3.client('bedrock-runtime', region_name='us-east-1')
-    except Exception as e:
-        st.error(f"AWS Bedrock 클라이언트 초기화 실패: {e}")
-        return None
-
-def generate_hackathon_idea_with_nova(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통", debug_mode=False):
-    """Nova Lite 모델을 사용하여 리빙랩 해커톤 아이디어 생성"""
-    bedrock_client = get_bedrock_client()
-    
-    if not bedrock_client:
-        return "❌ AWS Bedrock 연결에 실패했습니다."
-    
-    # 길이 옵션에 따른 설정 (한국어 특성 고려하여 토큰 수 증가)
-    length_settings = {
-        "간단": {
-            "char_limit": 800,
-            "max_tokens": 1000,  # 800자 × 1.25 (한국어 여유분)
-            "sections": {
-                "title": "10자 이내",
-                "overview": "80자 이내",
-                "problem": "60자 이내", 
-                "ai_tech": "80자 이내",
-                "users": "40자 이내",
-                "features": "120자 이내, 3개 기능",
-                "impact": "80자 이내",
-                "tech_stack": "60자 이내",
-                "test_plan": "60자 이내",
-                "expansion": "60자 이내"
-            }
-        },
-        "보통": {
-            "char_limit": 1500,
-            "max_tokens": 2000,  # 1500자 × 1.33 (한국어 여유분)
-            "sections": {
-                "title": "20자 이내",
-                "overview": "150자 이내",
-                "problem": "100자 이내",
-                "ai_tech": "150자 이내",
-                "users": "80자 이내", 
-                "features": "200자 이내, 3-4개 기능",
-                "impact": "150자 이내",
-                "tech_stack": "100자 이내",
-                "test_plan": "120자 이내",
-                "expansion": "100자 이내"
-            }
-        },
-        "상세": {
-            "char_limit": 2500,
-            "max_tokens": 3200,  # 2500자 × 1.28 (한국어 여유분)
-            "sections": {
-                "title": "30자 이내",
-                "overview": "250자 이내",
-                "problem": "200자 이내",
-                "ai_tech": "300자 이내",
-                "users": "150자 이내",
-                "features": "400자 이내, 4-5개 기능",
-                "impact": "250자 이내",
-                "tech_stack": "200자 이내",
-                "test_plan": "200자 이내",
-                "expansion": "200자 이내"
-            }
-        }
-    }
-    
-    settings = length_settings[idea_length]
-    sections = settings["sections"]
-    
-    prompt = f"""
-당신은 지속가능한 세상을 위한 리빙랩 해커톤의 전문 멘토입니다. 다음 정보를 바탕으로 창의적이고 실현 가능한 해커톤 아이디어를 체계적으로 정리해주세요.
-
-입력 정보:
-- 문제 영역: {problem_area}
-- 해결하고자 하는 문제: {target_problem}
-- 활용할 AI 기술: {ai_technology}
-- 타겟 사용자: {target_users}
-- 기대 효과: {expected_impact}
-
-**중요**: 각 섹션은 간결하고 핵심적인 내용으로 작성해주세요. 전체 응답은 {settings["char_limit"]}자 이내로 제한합니다.
-
-다음 구조로 해커톤 아이디어를 정리해주세요:
-
-## 🎯 프로젝트 제목
-({sections["title"]}의 창의적이고 임팩트 있는 프로젝트명)
-
-## 📋 프로젝트 개요 ({sections["overview"]})
-프로젝트의 핵심 내용과 목적을 간단명료하게 설명
-
-## 🌍 해결 문제 ({sections["problem"]})
-구체적인 문제 정의와 현재 상황을 설명
-
-## 🤖 AI 기술 활용 ({sections["ai_tech"]})
-어떤 AI 기술을 어떻게 활용할지 구체적으로 설명
-
-## 👥 타겟 사용자 ({sections["users"]})
-주요 사용자와 이해관계자를 나열
-
-## 💡 핵심 기능 ({sections["features"]})
-주요 기능을 간단한 문장으로 나열
-- 기능 1: (한 줄 설명)
-- 기능 2: (한 줄 설명)
-- 기능 3: (한 줄 설명)
-
-## 🎊 기대 효과 ({sections["impact"]})
-지속가능성 측면에서의 기대효과를 구체적 수치나 결과로 설명
-
-## 🛠️ 기술 스택 ({sections["tech_stack"]})
-개발에 필요한 핵심 기술들을 나열
-
-## 📊 실증 계획 ({sections["test_plan"]})
-실제 환경에서의 테스트 방법을 설명
-
-## 🚀 확장 가능성 ({sections["expansion"]})
-향후 발전 방향을 설명
-
-한국어로 작성하며, 각 섹션은 지정된 글자 수를 엄격히 준수해주세요. 실현 가능하면서도 혁신적인 아이디어로 구성해주세요.
-"""
-
-    try:
-        # Nova Lite 모델 호출 (올바른 형식)
-        response = bedrock_client.invoke_model(
-            modelId="amazon.nova-lite-v1:0",  # Nova Lite 모델 ID
-            body=json.dumps({
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": settings["max_tokens"],  # 길이 옵션에 따라 동적 설정
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            })
-        )
-        
-        # 응답 파싱
-        response_body = json.loads(response.get('body').read())
-        
-        # 디버깅: 전체 응답 구조 확인 (디버깅 모드일 때만)
-        if debug_mode:
-            st.write("### 🔍 디버깅 정보")
-            st.write("**응답 구조:**", response_body.keys())
-        
-        # Nova 모델의 응답 구조에 맞게 텍스트 추출
-        if 'output' in response_body and 'message' in response_body['output']:
-            content = response_body['output']['message']['content']
-            if content and len(content) > 0 and 'text' in content[0]:
-                generated_text = content[0]['text']
-                
-                if debug_mode:
-                    # 디버깅 정보
-                    st.write(f"**생성된 텍스트 길이:** {len(generated_text)}자")
-                    st.write(f"**요청한 최대 토큰:** {settings['max_tokens']}")
-                    st.write(f"**목표 글자 수:** {settings['char_limit']}자")
-                    
-                    # 토큰 사용량 확인 (있는 경우)
-                    if 'usage' in response_body:
-                        usage = response_body['usage']
-                        st.write(f"**실제 사용 토큰:** {usage}")
-                
-                # 응답이 완료되었는지 확인 (항상 체크하지만 메시지는 조건부)
-                if 'stopReason' in response_body.get('output', {}):
-                    stop_reason = response_body['output']['stopReason']
-                    
-                    if debug_mode:
-                        st.write(f"**응답 종료 이유:** {stop_reason}")
-                    
-                    if stop_reason == 'max_tokens':
-                        if debug_mode:
-                            st.warning("⚠️ 토큰 제한으로 인해 응답이 잘렸습니다!")
-                        
-                        # 자동 재시도 (토큰 수 증가) - 디버깅 모드와 관계없이 실행
-                        if settings["max_tokens"] < 4000:  # 최대 4000 토큰까지
-                            if debug_mode:
-                                st.info("🔄 더 긴 응답을 위해 자동 재시도합니다...")
-                            
-                            increased_tokens = min(settings["max_tokens"] + 1000, 4000)
-                            
-                            # 재시도 요청
-                            retry_response = bedrock_client.invoke_model(
-                                modelId="amazon.nova-lite-v1:0",
-                                body=json.dumps({
-                                    "messages": [
-                                        {
-                                            "role": "user",
-                                            "content": [
-                                                {
-                                                    "text": prompt
-                                                }
-                                            ]
-                                        }
-                                    ],
-                                    "inferenceConfig": {
-                                        "maxTokens": increased_tokens,
-                                        "temperature": 0.7,
-                                        "topP": 0.9
-                                    }
-                                })
-                            )
-                            
-                            retry_body = json.loads(retry_response.get('body').read())
-                            if 'output' in retry_body and 'message' in retry_body['output']:
-                                retry_content = retry_body['output']['message']['content']
-                                if retry_content and len(retry_content) > 0 and 'text' in retry_content[0]:
-                                    retry_text = retry_content[0]['text']
-                                    if debug_mode:
-                                        st.write(f"**재시도 결과 길이:** {len(retry_text)}자")
-                                    return retry_text
-                    
-                    elif stop_reason == 'end_turn' and debug_mode:
-                        st.success("✅ 응답이 정상적으로 완료되었습니다.")
-                
-                return generated_text
-        
-        return '해커톤 아이디어 생성에 실패했습니다.'
-        
-    except ClientError as e:
-        return f"❌ AWS API 호출 오류: {e}"
-    except Exception as e:
-        return f"❌ 해커톤 아이디어 생성 중 오류 발생: {e}"
-
-def generate_streamlit_prd(idea_content):
-    """Nova Lite 모델을 사용하여 간단한 Streamlit 앱 PRD 생성"""
-    bedrock_client = get_bedrock_client()
-    
-    if not bedrock_client:
-        return "❌ AWS Bedrock 연결에 실패했습니다."
-    
-    prompt = f"""
-다음 해커톤 아이디어를 바탕으로 **초기 MVP(Minimum Viable Product)** 버전의 Streamlit 앱 구현을 위한 간단한 PRD를 Markdown 형식으로 작성해주세요.
-
-해커톤 아이디어:
-{idea_content}
-
-**중요 제약사항:**
-- 이것은 초기 MVP 버전이므로 핵심 기능만 포함
-- AI 기능은 **텍스트 처리만으로 제한** (이미지, 음성, 영상 처리 제외)
-- 복잡한 AI 모델보다는 간단한 텍스트 분석, 분류, 요약 등에 집중
-- 실제 1-2일 내에 구현 가능한 범위로 한정
-
-다음 구조로 간단하고 실용적인 PRD를 작성해주세요:
-
-# 프로젝트명 (MVP 버전)
-
-## 📋 프로젝트 개요
-- **목적**: (한 줄 설명)
-- **타겟 사용자**: (주요 사용자)
-- **MVP 범위**: 텍스트 기반 AI 기능만 포함
-
-## 🎯 주요 기능 (MVP 핵심)
-### 필수 기능 (텍스트 처리 한정)
-1. 기능 1 - 텍스트 입력 및 처리
-2. 기능 2 - 텍스트 분석/분류/요약 등
-3. 기능 3 - 결과 표시 및 피드백
-
-### 제외 기능 (향후 버전)
-- 이미지/음성/영상 처리
-- 복잡한 머신러닝 모델
-- 실시간 스트리밍
-
-## 📱 Streamlit 앱 구성
-### 화면 구성
-- **메인 페이지**: 텍스트 입력 및 설정
-- **결과 페이지**: 처리 결과 및 분석
-
-### 사용할 Streamlit 컴포넌트
-- 입력: `st.text_input()`, `st.text_area()`, `st.selectbox()`
-- 출력: `st.write()`, `st.markdown()`, `st.dataframe()`
-- 상호작용: `st.button()`, `st.tabs()`, `st.expander()`
-
-## 💾 데이터 처리 (텍스트만)
-- **입력 데이터**: 사용자 텍스트 입력
-- **처리 과정**: 간단한 텍스트 분석/처리 알고리즘
-- **출력 형태**: 텍스트 결과, 차트, 표 형태
-
-## 🤖 AI 기능 (텍스트 한정)
-- **사용 모델**: 간단한 텍스트 처리 라이브러리 또는 API
-- **처리 범위**: 텍스트 분류, 키워드 추출, 감정 분석, 요약 등
-- **제외 항목**: 이미지/음성/영상 AI 기능
-
-## 📚 필요한 라이브러리
-```python
-streamlit
-pandas
-matplotlib (또는 plotly)
-requests (API 사용시)
-nltk 또는 spacy (텍스트 처리)
-openai 또는 transformers (텍스트 AI, 선택적)
-```
-
-## ⚡ 구현 순서 (MVP 기준)
-1. **1단계**: 기본 UI 및 텍스트 입력 구성
-2. **2단계**: 핵심 텍스트 처리 기능 구현
-3. **3단계**: 결과 표시 및 기본 개선
-
-## 🚀 향후 확장 계획
-- 2차 버전: 이미지 처리 기능 추가
-- 3차 버전: 더 복잡한 AI 모델 적용
-
-**MVP 버전으로 간단하고 실용적으로 작성하되, 텍스트 기반 AI 기능만 포함하여 실제 구현 가능한 내용으로 해주세요.**
-"""
-
-    try:
-        # Nova Lite 모델 호출
-        response = bedrock_client.invoke_model(
-            modelId="amazon.nova-lite-v1:0",
-            body=json.dumps({
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": 1500,  # 간단한 PRD용으로 토큰 수 줄임
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            })
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from page_probe import begin_rerun_probe, end_rerun_probe, record_job_wait, RERUN_HISTORY_SIZE
+from hackathon_generator import LENGTH_INFO, PROBLEM_AREAS, get_session_store, session_store_report, submit_idea_job, submit_idea_candidates_job, submit_prd_job, MAX_IDEA_CANDIDATES, get_rate_governor, get_job_queue, show_engine_debug_info, token_budget_report, model_routing_report, region_health_report, start_speculative_prd, find_past_ideas, find_similar_ideas, reopen_artifact, artifact_history
+from bulk_generation import parse_briefs, bulk_output_path, submit_bulk_job, format_summary, BRIEF_FIELDS
+from job_queue import ACTIVE_JOB_STATES, JOB_DONE
+
+def save_result(key, value):
+    """생성 결과를 세션 결과 저장소에 두고 session_state[key]에는 핸들만 저장 (이전 값은 삭제)"""
+    ctx = get_script_run_ctx()
+    store = get_session_store()
+    previous = st.session_state.get(key)
+    if previous:
+        store.delete(previous)
+    st.session_state[key] = store.put(ctx.session_id if ctx else "default", value)
+
+def load_result(key, default=None):
+    """session_state[key] 핸들의 생성 결과 (없거나 만료되었으면 default)"""
+    handle = st.session_state.get(key)
+    if handle is None:
+        return default
+    value = get_session_store().get(handle)
+    if value is None:
+        del st.session_state[key]
+        return default
+    return value
+
+def clear_result(key):
+    handle = st.session_state.pop(key, None)
+    if handle:
+        get_session_store().delete(handle)
+
+def candidate_to_idea(candidates, rank, idea_length):
+    """점수 순 후보 목록의 rank번째 후보를 session_state.current_idea 형식으로 변환"""
+    candidate = candidates[rank]
+    metrics = dict(candidate["metrics"], candidate_rank=rank + 1, candidate_count=len(candidates), candidate_score=candidate["score"])
+    return {"generated_content": candidate["text"], "idea_length": idea_length, "metrics": metrics}
+
+def show_queue_status():
+    """모든 세션이 공유하는 Bedrock 호출 대기열 깊이와 예상 대기 시간 표시"""
+    status = get_rate_governor().status()
+    depth = status["queue_depth_by_priority"]
+    if status["queue_depth"] or status["estimated_wait"] >= 1:
+        st.caption(
+            f"🚦 대기열: {status['queue_depth']}건 (대화형 {depth['interactive']} · PRD {depth['prd']} · 대량 {depth['bulk']})"
+            f" · 예상 대기 약 {status['estimated_wait']:.0f}초"
         )
-        
-        # 응답 파싱
-        response_body = json.loads(response.get('body').read())
-        
-        # Nova 모델의 응답 구조에 맞게 텍스트 추출
-        if 'output' in response_body and 'message' in response_body['output']:
-            content = response_body['output']['message']['content']
-            if content and len(content) > 0 and 'text' in content[0]:
-                return content[0]['text']
-        
-        return 'PRD 생성에 실패했습니다.'
-        
-    except ClientError as e:
-        return f"❌ AWS API 호출 오류: {e}"
-    except Exception as e:
-        return f"❌ PRD 생성 중 오류 발생: {e}"
-
-def save_prd_to_markdown(prd_content, filename=None):
-    """PRD 내용을 Markdown 파일로 저장"""
-    try:
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"streamlit_app_prd_{timestamp}.md"
-        
-        # 현재 디렉토리에 저장
-        filepath = os.path.join(os.getcwd(), filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(prd_content)
-        
-        return True, filepath
-    except Exception as e:
-        return False, str(e)
+    else:
+        st.caption("🚦 대기열이 비어 있어 바로 처리됩니다.")
+
+def follow_job(job_key, spinner_text, stream=False):
+    """URL에 기록된 백그라운드 작업의 진행 상황을 끝날 때까지 표시하고 끝난 작업을 반환
+
+    작업 ID는 쿼리 파라미터(job_key)에 두므로 재실행이나 새로고침/재연결 뒤에도 같은 작업을
+    이어서 기다리며, 끝난 결과는 다시 호출하지 않고 가져옵니다. 기다릴 작업이 없으면 None.
+    """
+    job_id = st.query_params.get(job_key)
+    if not job_id:
+        return None
+    
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id)
+    if job is None:
+        del st.query_params[job_key]
+        st.warning("⚠️ 이전 생성 작업을 찾을 수 없습니다. (서버가 다시 시작되었거나 보관 기간이 지났습니다)")
+        return None
+    
+    if job["status"] in ACTIVE_JOB_STATES:
+        placeholder = st.empty()
+        with st.spinner(spinner_text):
+            while job["status"] in ACTIVE_JOB_STATES:
+                if stream and job["partial"]:
+                    placeholder.markdown(job["partial"] + "▌")
+                elif job["message"]:
+                    placeholder.progress(job["progress"], text=job["message"])
+                # 작업을 기다린 시간은 화면 재실행 시간에서 제외
+                wait_started = time.perf_counter()
+                job = job_queue.wait(job_id, job["version"])
+                record_job_wait(time.perf_counter() - wait_started)
+        placeholder.empty()
+    
+    del st.query_params[job_key]
+    return job
+
+def set_current_idea(idea, notice=None, speculative_prd=False):
+    """현재 아이디어를 바꾸고 PRD 탭도 새 아이디어를 보도록 앱 전체를 다시 실행
+
+    notice는 다시 실행한 화면의 아이디어 탭에 한 번 표시할 완료 메시지입니다.
+    """
+    save_result("current_idea", idea)
+    if speculative_prd:
+        start_speculative_prd(idea["generated_content"])
+    if notice:
+        st.session_state.idea_notice = notice
+    st.rerun()
+
+def record_rerun_timing(probe):
+    """사용자 조작 한 번의 실행 시간을 세션의 최근 재실행 기록에 추가 (중첩된 측정은 제외)"""
+    if probe["nested"]:
+        return
+    timings = st.session_state.setdefault("rerun_timings", [])
+    timings.append({"scope": probe["scope"], "ms": probe["seconds"] * 1000, "at": datetime.now().strftime("%H:%M:%S")})
+    del timings[:-RERUN_HISTORY_SIZE]
+
+def probed_fragment(scope):
+    """따로 다시 실행되는 프래그먼트로 만들고 실행할 때마다 실행 시간을 측정하는 데코레이터
+
+    프래그먼트 안의 위젯을 조작하면 앱 전체가 아니라 그 프래그먼트만 다시 실행됩니다.
+    '⏱️ 재실행 시간 표시'를 켜면 프래그먼트 아래에 이번 실행 시간을 표시합니다.
+    """
+    def decorator(render):
+        @functools.wraps(render)
+        def run(*args, **kwargs):
+            probe = begin_rerun_probe(scope)
+            try:
+                render(*args, **kwargs)
+            finally:
+                end_rerun_probe(probe)
+            record_rerun_timing(probe)
+            if st.session_state.get("show_rerun_timing"):
+                st.caption(f"⏱️ {scope} 실행 시간: {probe['seconds'] * 1000:.1f}ms" + (" (전체 재실행 중)" if probe["nested"] else ""))
+        return st.fragment(run)
+    return decorator
+
+app_probe = begin_rerun_probe("app", root=True)
 
 # 앱 제목
 st.title("🌱 AI × 지속가능성 리빙랩 해커톤 아이디어 생성기")
 
-# 탭 생성
-tab1, tab2 = st.tabs(["💡 아이디어 생성", "📋 PRD 생성"])
-
-with tab1:
+@probed_fragment("idea_tab")
+def idea_tab():
     # 입력 필드들
     st.write("## 💡 아이디어 핵심 요소 입력")
 
     problem_area = st.selectbox(
         "🌍 문제 영역",
-        ["환경 보호", "에너지 효율", "폐기물 관리", "지속가능한 농업", "스마트 시티", "기후 변화 대응", "순환 경제", "친환경 교통", "수자원 관리", "생물 다양성 보전", "기타"]
+        PROBLEM_AREAS
     )
 
     target_problem = st.text_area(
@@ -423,150 +177,450 @@ with tab1:
     with col2:
         # 디버깅 모드 체크박스
         debug_mode = st.checkbox("🔍 디버깅 모드", help="AI 응답 분석 정보를 표시합니다")
-
-        # 길이 정보 표시
-        length_info = {
-            "간단": {"chars": "800자", "time": "⚡ 빠름", "desc": "핵심만 간략히"},
-            "보통": {"chars": "1,500자", "time": "⚖️ 균형", "desc": "적당한 상세도"}, 
-            "상세": {"chars": "2,500자", "time": "🔍 상세", "desc": "충분한 설명"}
-        }
         
-        info = length_info[idea_length]
+        # 스트리밍 모드 체크박스
+        stream_mode = st.checkbox("⚡ 스트리밍 모드", value=True, help="생성되는 내용을 실시간으로 표시합니다")
+        
+        # 캐시 우회 체크박스
+        fresh_sample = st.checkbox("🎲 새로 생성", help="같은 입력의 이전 결과(캐시)를 사용하지 않고 새로 생성합니다")
+        
+        # 상세 옵션 전용: 섹션 병렬 생성
+        parallel_sections = False
+        if idea_length == "상세":
+            parallel_sections = st.checkbox("🧩 섹션 병렬 생성", help="제목/개요를 먼저 만든 뒤 나머지 섹션을 동시에 생성하여 대기 시간을 줄입니다")
+        
+        # 섹션별 글자 수 제한 검사
+        enforce_section_limits = st.checkbox("✂️ 섹션 글자 수 교정", value=True, help="글자 수 제한을 넘은 섹션만 다시 요청하여 교체합니다")
+        
+        # 설정을 달리한 후보 여러 개를 동시에 생성하여 비교
+        candidate_mode = st.checkbox("🎲 후보 동시 생성", help="temperature/topP를 달리한 후보를 동시에 생성하고 섹션 완성도·글자 수·다양성으로 순위를 매깁니다")
+        num_candidates = 3
+        if candidate_mode:
+            num_candidates = st.slider("후보 수", min_value=2, max_value=MAX_IDEA_CANDIDATES, value=3)
+        
+        # 아이디어가 완성되면 PRD를 미리 생성해 두고 PRD 탭에서 바로 사용
+        speculative_prd = st.checkbox("🔮 PRD 미리 생성", help="아이디어가 완성되자마자 PRD 생성을 백그라운드로 시작합니다 (호출 대기열이 밀려 있으면 건너뜁니다)")
+
+        # 길이 정보 표시 (hackathon_generator에서 미리 만들어 둔 값)
+        info = LENGTH_INFO[idea_length]
         st.write(f"**{info['time']}**")
         st.write(f"📝 {info['chars']}")
         st.write(f"💡 {info['desc']}")
+    
+    # 디버깅 모드: 길이 옵션별 토큰 예산 보정 현황
+    if debug_mode:
+        with st.expander("📐 토큰 예산 보정 리포트 (예측 vs 실제)"):
+            st.dataframe(token_budget_report(), hide_index=True)
+        with st.expander("🧭 모델 라우팅 현황 (모델별 지연 시간 분포와 선택 기록)"):
+            routing = model_routing_report()
+            st.dataframe(routing["models"], hide_index=True)
+            st.dataframe(routing["decisions"], hide_index=True)
+            if routing["fallbacks"]:
+                st.dataframe(routing["fallbacks"], hide_index=True)
+        with st.expander("🌐 리전별 상태 (회로 차단기, 오류율, 스로틀링 비율, 지연 시간)"):
+            st.dataframe(region_health_report(), hide_index=True)
+        with st.expander("🧠 세션 결과 저장소 (세션별 메모리/디스크 사용량)"):
+            ctx = get_script_run_ctx()
+            usage = get_session_store().session_stats(ctx.session_id if ctx else "default")
+            st.caption(
+                f"이 세션: 항목 {usage['items']}개 · 메모리 {usage['memory_bytes']:,}B · 디스크 {usage['disk_bytes']:,}B"
+                f" · 압축 전 {usage['raw_bytes']:,}B"
+            )
+            st.dataframe(session_store_report(), hide_index=True)
+
+    # 같은 입력으로 만든 이전 아이디어가 있으면 다시 생성하지 않고 열 수 있도록 안내
+    past_ideas = find_past_ideas(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length)
+    if past_ideas:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.caption(f"🗂️ 같은 입력으로 생성한 이전 아이디어가 {len(past_ideas)}개 있습니다. (가장 최근: #{past_ideas[0]['id']}, {datetime.fromtimestamp(past_ideas[0]['created_at']).strftime('%Y-%m-%d %H:%M')})")
+        with col2:
+            if st.button("📂 이전 결과 열기", key="reopen_past_idea"):
+                set_current_idea(reopen_artifact(past_ideas[0]['id']))
+    else:
+        # 입력이 조금만 다른 이전 아이디어가 있으면 새로 호출하기 전에 먼저 제안
+        similar_ideas = find_similar_ideas(problem_area, target_problem, ai_technology, target_users, expected_impact)
+        if similar_ideas:
+            similar = similar_ideas[0]
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.caption(
+                    f"🔁 입력이 비슷한 이전 아이디어가 있습니다. (#{similar['id']}, 유사도 {similar['similarity']:.0%}"
+                    f" · {similar['inputs'].get('idea_length', '보통')}) 새로 생성하지 않고 바로 볼 수 있습니다."
+                )
+            with col2:
+                if st.button("📂 비슷한 결과 열기", key="reopen_similar_idea"):
+                    set_current_idea(reopen_artifact(similar['id']))
 
     # 생성 버튼
+    show_queue_status()
     if st.button("🚀 해커톤 아이디어 생성하기", type="primary"):
         if problem_area and target_problem and ai_technology and target_users and expected_impact:
-            with st.spinner("AI가 혁신적인 아이디어를 생성하고 있습니다..."):
-                generated_idea = generate_hackathon_idea_with_nova(
-                    problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length, debug_mode
+            # 생성은 백그라운드 작업으로 실행하여 재실행/연결 끊김에도 결과가 남도록 함
+            if candidate_mode:
+                st.query_params["idea_candidates_job"] = submit_idea_candidates_job(
+                    problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length,
+                    num_candidates=num_candidates,
+                    fresh=fresh_sample
+                )
+            else:
+                st.query_params["idea_job"] = submit_idea_job(
+                    problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length,
+                    stream=stream_mode,
+                    fresh=fresh_sample,
+                    parallel_sections=parallel_sections,
+                    enforce_section_limits=enforce_section_limits
                 )
+        else:
+            st.error("모든 필드를 입력해 주세요!")
+    
+    # 작업이 끝나면 아이디어를 저장하고 앱 전체를 다시 실행 (완료 메시지는 다시 실행한 화면에 표시)
+    idea_job = follow_job("idea_job", "AI가 혁신적인 아이디어를 생성하고 있습니다...", stream=stream_mode)
+    if idea_job:
+        if idea_job["status"] == JOB_DONE:
+            set_current_idea(idea_job["result"], "✅ 아이디어가 생성되었습니다!", speculative_prd)
+        else:
+            st.error(f"❌ 해커톤 아이디어 생성 중 오류 발생: {idea_job['error']}")
+    
+    # 후보는 도착하는 대로 표시하고, 모두 도착하면 1위 후보를 현재 아이디어로 선택
+    candidates_job = follow_job("idea_candidates_job", "아이디어 후보를 동시에 생성하고 있습니다...", stream=True)
+    if candidates_job:
+        if candidates_job["status"] == JOB_DONE and not candidates_job["result"]["error"]:
+            save_result("idea_candidates", candidates_job["result"])
+            set_current_idea(
+                candidate_to_idea(candidates_job["result"]["candidates"], 0, candidates_job["result"]["idea_length"]),
+                f"✅ 후보 {len(candidates_job['result']['candidates'])}개를 생성하고 점수가 가장 높은 후보를 선택했습니다!",
+                speculative_prd
+            )
+        else:
+            st.error(candidates_job["result"]["error"] if candidates_job["status"] == JOB_DONE else f"❌ 아이디어 후보 생성 중 오류 발생: {candidates_job['error']}")
+    
+    idea_notice = st.session_state.pop("idea_notice", None)
+    if idea_notice:
+        st.success(idea_notice)
+        if debug_mode:
+            with st.expander("🔍 디버깅 정보", expanded=True):
+                st.json(load_result("current_idea", {}).get("metrics", {}))
+                show_engine_debug_info()
+    
+    idea_result_panel(speculative_prd)
+
+@probed_fragment("idea_result")
+def idea_result_panel(speculative_prd):
+    # 생성된 아이디어 표시 및 저장 기능 (session_state에는 세션 결과 저장소의 핸들만 있음)
+    current_idea = load_result("current_idea")
+    if not current_idea:
+        return
+    
+    # 아이디어 헤더 (길이 정보 포함)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.write("## 📋 생성된 해커톤 아이디어")
+    with col2:
+        idea_length_used = current_idea.get('idea_length', '보통')
+        st.info(f"📏 {LENGTH_INFO.get(idea_length_used, LENGTH_INFO['보통'])['badge']}")
+    
+        # 실제 글자 수 계산 및 표시
+    content_length = len(current_idea['generated_content'])
+    st.caption(f"📊 실제 생성된 글자 수: {content_length:,}자")
+    
+    # 첫 토큰 시간과 전체 지연 시간을 구분하여 표시
+    idea_metrics = current_idea.get('metrics', {})
+    if idea_metrics.get('reopened'):
+        st.caption(f"🗂️ 생성 기록 #{idea_metrics['artifact_id']}을 다시 열었습니다. (새 결과가 필요하면 '🎲 새로 생성'을 선택하세요)")
+    elif idea_metrics.get('cache_hit'):
+        st.caption("💾 같은 입력으로 생성된 이전 결과를 캐시에서 불러왔습니다. (새 결과가 필요하면 '🎲 새로 생성'을 선택하세요)")
+    elif idea_metrics.get('latency') is not None:
+        ttft = idea_metrics.get('ttft')
+        ttft_text = f"{ttft:.2f}초" if ttft is not None else "-"
+        st.caption(
+            f"⏱️ 첫 토큰: {ttft_text} · 전체 응답: {idea_metrics['latency']:.2f}초"
+            f" · 🔁 이어쓰기: {idea_metrics.get('continuation_rounds', 0)}회"
+            f" · 🧭 모델: {idea_metrics.get('model_id', '-')}"
+        )
+    
+    if idea_metrics.get('candidate_rank'):
+        st.caption(f"🎲 후보 {idea_metrics['candidate_count']}개 중 {idea_metrics['candidate_rank']}위 (점수 {idea_metrics['candidate_score']:.2f})")
+    
+    regenerated_sections = idea_metrics.get('regenerated_sections')
+    if regenerated_sections:
+        st.caption(f"✂️ 글자 수 제한을 넘은 {len(regenerated_sections)}개 섹션만 다시 작성했습니다.")
+    
+    st.markdown(current_idea['generated_content'])
+    
+    # 후보 동시 생성 결과가 있으면 다른 후보와 점수를 비교하고 바꿔 선택할 수 있도록 표시
+    idea_candidates = load_result("idea_candidates") if idea_metrics.get('candidate_rank') else None
+    if idea_candidates and idea_metrics.get('candidate_rank'):
+        with st.expander(f"🎲 후보 비교 ({len(idea_candidates['candidates'])}개)"):
+            for rank, candidate in enumerate(idea_candidates['candidates']):
+                scores = candidate['scores']
+                st.write(
+                    f"**{rank + 1}위 · 점수 {candidate['score']:.2f}** "
+                    f"(섹션 완성도 {scores['completeness']:.0%} · 글자 수 준수 {scores['length']:.0%} · 다양성 {scores['diversity']:.0%})"
+                    f" · temperature {candidate['temperature']}, topP {candidate['top_p']} · {len(candidate['text']):,}자"
+                )
+                if rank + 1 != idea_metrics['candidate_rank']:
+                    if st.button("이 후보 사용", key=f"use_candidate_{rank}"):
+                        set_current_idea(candidate_to_idea(idea_candidates['candidates'], rank, idea_candidates['idea_length']), speculative_prd=speculative_prd)
+    
+    st.write("---")
+    
+    # 새 아이디어 생성 버튼
+    if st.button("🔄 새 아이디어 생성", key="new_idea_button", type="primary"):
+        # 현재 세션 상태 초기화 (PRD 탭의 가져온 아이디어도 비우도록 앱 전체를 다시 실행)
+        clear_result("current_idea")
+        clear_result("idea_candidates")
+        st.rerun()
+
+@probed_fragment("prd_tab")
+def prd_tab():
+    st.write("## 📋 간단한 Streamlit 앱 PRD 생성")
+    
+    # 아이디어 입력 방식 선택
+    input_method = st.radio(
+        "📥 아이디어 입력 방식",
+        ["직접 입력", "아이디어 생성 탭에서 가져오기"],
+        horizontal=True
+    )
+    
+    if input_method == "아이디어 생성 탭에서 가져오기":
+        imported_idea = load_result("current_idea")
+        if imported_idea and 'generated_content' in imported_idea:
+            st.write("### 📝 가져온 아이디어")
+            with st.expander("생성된 아이디어 내용 보기"):
+                st.markdown(imported_idea['generated_content'])
+            idea_content = imported_idea['generated_content']
+        else:
+            st.warning("⚠️ 아이디어 생성 탭에서 먼저 아이디어를 생성해주세요.")
+            idea_content = ""
+    else:
+        idea_content = st.text_area(
+            "💡 해커톤 아이디어 내용",
+            height=200,
+            placeholder="생성된 해커톤 아이디어를 여기에 붙여넣어 주세요..."
+        )
+    
+    prd_stream_mode = st.checkbox("⚡ 스트리밍 모드", value=True, key="prd_stream_mode", help="생성되는 PRD를 실시간으로 표시합니다")
+    prd_fresh_sample = st.checkbox("🎲 새로 생성", key="prd_fresh_sample", help="같은 아이디어의 이전 PRD(캐시)를 사용하지 않고 새로 생성합니다")
+    
+    # 마지막으로 PRD를 만든 아이디어에서 일부만 고쳤으면 바뀐 섹션에 해당하는 PRD 섹션만 다시 생성
+    # (current_prd는 PRD 작업 결과와 같은 {"prd_content", "idea_content", "metrics"})
+    previous_prd = None
+    current_prd = load_result("current_prd")
+    if current_prd and idea_content.strip() and idea_content != current_prd["idea_content"]:
+        if st.checkbox("🧩 바뀐 부분만 다시 생성", value=True, key="prd_incremental", help="이전 아이디어와 비교하여 바뀐 섹션에 해당하는 PRD 섹션만 다시 생성하고 나머지는 그대로 둡니다"):
+            previous_prd = current_prd
+    
+    st.write("---")
+    
+    # PRD 생성 버튼
+    show_queue_status()
+    if st.button("📋 간단한 PRD 생성하기", type="primary"):
+        if idea_content.strip():
+            st.query_params["prd_job"] = submit_prd_job(idea_content, stream=prd_stream_mode, fresh=prd_fresh_sample, previous=previous_prd)
+        else:
+            st.error("❌ 아이디어 내용을 입력해주세요!")
+    
+    prd_job = follow_job("prd_job", "간단한 Streamlit 앱 PRD를 생성하고 있습니다...", stream=prd_stream_mode)
+    if prd_job:
+        if prd_job["status"] == JOB_DONE:
+            # PRD를 세션에 저장 (저장 버튼을 눌러 재실행되어도 내용이 유지됨)
+            save_result("current_prd", prd_job["result"])
+        else:
+            st.error(f"❌ PRD 생성 중 오류 발생: {prd_job['error']}")
+    
+    prd_result_panel()
+
+@probed_fragment("prd_result")
+def prd_result_panel():
+    # 생성된 PRD 표시 및 저장 (session_state에는 세션 결과 저장소의 핸들만 있음)
+    current_prd = load_result("current_prd")
+    if not current_prd:
+        return
+    
+    prd_content = current_prd["prd_content"]
+    st.write("## 📋 생성된 PRD")
+    st.markdown(prd_content)
+    
+    prd_metrics = current_prd.get('metrics', {})
+    if prd_metrics.get('reopened'):
+        st.caption(f"🗂️ 생성 기록 #{prd_metrics['artifact_id']}을 다시 열었습니다.")
+    elif prd_metrics.get('latency') is not None:
+        ttft = prd_metrics.get('ttft')
+        ttft_text = f"{ttft:.2f}초" if ttft is not None else "-"
+        st.caption(
+            f"⏱️ 첫 토큰: {ttft_text} · 전체 응답: {prd_metrics['latency']:.2f}초"
+            f" · 🔁 이어쓰기: {prd_metrics.get('continuation_rounds', 0)}회"
+            f" · 🧭 모델: {prd_metrics.get('model_id', '-')}"
+        )
+    
+    if prd_metrics.get('speculative'):
+        st.caption("🔮 아이디어가 완성되자마자 미리 생성해 둔 PRD를 사용했습니다.")
+    
+    prd_savings = prd_metrics.get('savings')
+    if prd_metrics.get('mode') == "unchanged":
+        st.caption("🧩 아이디어 섹션 내용이 바뀌지 않아 이전 PRD를 그대로 사용했습니다.")
+    elif prd_metrics.get('mode') == "incremental" and prd_savings:
+        saved_seconds = prd_savings['saved_seconds']
+        st.caption(
+            f"🧩 바뀐 아이디어 섹션 {len(prd_metrics['changed_idea_sections'])}개에 따라 PRD 섹션 {len(prd_metrics['regenerated_sections'])}개만 다시 생성"
+            f" · 출력 토큰 {prd_savings['output_tokens']:,}개 (전체 생성 {prd_savings['baseline_output_tokens']:,}개 대비 {prd_savings['saved_output_tokens']:,}개 절약)"
+            + (f" · 약 {saved_seconds:.1f}초 절약" if saved_seconds is not None else "")
+        )
+    
+    st.write("---")
+    
+    # 생성한 PRD는 기록 저장소에 자동으로 남고, 파일이 필요하면 내려받음
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        if prd_metrics.get('artifact_id'):
+            st.caption(f"🗂️ 생성 기록 #{prd_metrics['artifact_id']}에 저장됨")
+    
+    with col2:
+        # 내려받기는 화면을 다시 실행할 필요가 없음
+        st.download_button(
+            label="📥 MD 파일 다운로드",
+            data=prd_content,
+            file_name=f"streamlit_app_prd_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
+            mime="text/markdown",
+            key="download_current_prd",
+            on_click="ignore"
+        )
+
+@probed_fragment("bulk_tab")
+def bulk_tab():
+    st.write("## 📦 팀 브리프 대량 아이디어 생성")
+    st.caption(f"CSV 또는 JSONL 파일의 각 행에 `{'`, `'.join(BRIEF_FIELDS)}` 필드가 필요합니다. (`idea_length` 생략 시 보통, `id` 열이 있으면 재시작 시 기준으로 사용)")
+    
+    briefs_file = st.file_uploader("📥 브리프 파일 업로드", type=["csv", "jsonl"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        bulk_concurrency = st.slider("⚙️ 동시 호출 수", min_value=1, max_value=16, value=4)
+    with col2:
+        bulk_max_retries = st.slider("🔁 스로틀링 시 최대 재시도", min_value=0, max_value=8, value=4)
+    
+    bulk_output_name = st.text_input(
+        "💾 결과 파일 이름 (같은 이름으로 다시 실행하면 이어서 처리)",
+        "bulk_ideas.jsonl"
+    )
+    
+    show_queue_status()
+    if st.button("📦 대량 생성 시작", type="primary"):
+        if briefs_file is None:
+            st.error("❌ 브리프 파일을 업로드해주세요!")
+        else:
+            try:
+                file_format = "jsonl" if briefs_file.name.endswith(".jsonl") else "csv"
+                briefs = parse_briefs(briefs_file.getvalue().decode('utf-8-sig'), file_format)
+            except ValueError as e:
+                st.error(f"❌ 브리프 파일 오류: {e}")
+                briefs = []
             
-            # 생성된 아이디어를 세션 상태에 저장
-            st.session_state.current_idea = {
-                "generated_content": generated_idea,
-                "idea_length": idea_length
-            }
-            st.session_state.idea_generated = True
+            try:
+                output_path = bulk_output_path(bulk_output_name)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                briefs = []
             
-            st.success("✅ 아이디어가 생성되었습니다!")
+            if briefs:
+                st.query_params["bulk_job"] = submit_bulk_job(briefs, output_path, bulk_concurrency, bulk_max_retries)
+    
+    bulk_job = follow_job("bulk_job", "대량 생성을 진행하고 있습니다...")
+    if bulk_job:
+        if bulk_job["status"] == JOB_DONE:
+            st.success("✅ 대량 생성이 완료되었습니다!")
+            st.text(format_summary(bulk_job["result"]["summary"]))
+            
+            result_path = bulk_job["result"]["output_path"]
+            if os.path.exists(result_path):
+                with open(result_path, 'r', encoding='utf-8') as f:
+                    st.download_button(
+                        label="📥 결과 JSONL 다운로드",
+                        data=f.read(),
+                        file_name=os.path.basename(result_path),
+                        mime="application/jsonl",
+                        on_click="ignore"
+                    )
         else:
-            st.error("모든 필드를 입력해 주세요!")
+            st.error(f"❌ 대량 생성 중 오류 발생: {bulk_job['error']}")
 
-    # 생성된 아이디어 표시 및 저장 기능 (세션 상태 기반)
-    if hasattr(st.session_state, 'idea_generated') and st.session_state.idea_generated and hasattr(st.session_state, 'current_idea'):
-        current_idea = st.session_state.current_idea
-        
-        # 아이디어 헤더 (길이 정보 포함)
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write("## 📋 생성된 해커톤 아이디어")
-        with col2:
-            idea_length_used = current_idea.get('idea_length', '보통')
-            length_badge = {
-                "간단": "⚡ 간단형 (800자)",
-                "보통": "⚖️ 표준형 (1,500자)",
-                "상세": "🔍 상세형 (2,500자)"
-            }
-            st.info(f"📏 {length_badge.get(idea_length_used, '표준형')}")
-        
-            # 실제 글자 수 계산 및 표시
-        content_length = len(current_idea['generated_content'])
-        st.caption(f"📊 실제 생성된 글자 수: {content_length:,}자")
-        
-        st.markdown(current_idea['generated_content'])
-        
-        st.write("---")
-        
-        # 새 아이디어 생성 버튼
-        if st.button("🔄 새 아이디어 생성", key="new_idea_button", type="primary"):
-            # 현재 세션 상태 초기화
-            if 'current_idea' in st.session_state:
-                del st.session_state.current_idea
-            if 'idea_generated' in st.session_state:
-                del st.session_state.idea_generated
-            st.rerun()
+@probed_fragment("history_tab")
+def history_tab():
+    st.write("## 🗂️ 생성 기록")
+    st.caption("생성한 아이디어와 PRD는 입력값, 모델, 사용량, 소요 시간과 함께 자동으로 기록됩니다. 다시 생성하지 않고 이전 결과를 열 수 있습니다.")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        history_query = st.text_input("🔎 검색 (본문/입력값)", key="history_query", placeholder="예: 음식물 쓰레기")
+    with col2:
+        history_kind = st.selectbox("종류", ["전체", "아이디어", "PRD"], key="history_kind")
+    kind_filter = {"전체": None, "아이디어": "idea", "PRD": "prd"}[history_kind]
+    
+    history_page = st.session_state.get("history_page", 1)
+    history = artifact_history(history_query, kind_filter, history_page)
+    if history_page > history["pages"]:
+        history_page = st.session_state.history_page = history["pages"]
+        history = artifact_history(history_query, kind_filter, history_page)
+    
+    st.caption(f"📚 {history['total']:,}건 · {history['page']}/{history['pages']} 페이지")
+    for item in history["items"]:
+        kind_label = "💡 아이디어" if item["kind"] == "idea" else "📋 PRD"
+        created = datetime.fromtimestamp(item["created_at"]).strftime("%Y-%m-%d %H:%M")
+        title = item["inputs"].get("target_problem") or item["preview"].strip().splitlines()[0]
+        with st.expander(f"#{item['id']} {kind_label} · {created} · {title[:60]}"):
+            st.caption(f"🧭 모델: {item['model_id'] or '-'} · 📊 {item['chars']:,}자")
+            st.text(item["preview"] + ("…" if item["chars"] > len(item["preview"]) else ""))
+            if st.button("📂 열기", key=f"open_artifact_{item['id']}"):
+                # 연 결과는 다른 탭에 표시되므로 앱 전체를 다시 실행
+                reopened = reopen_artifact(item["id"])
+                if item["kind"] == "idea":
+                    save_result("current_idea", reopened)
+                    st.toast(f"💡 아이디어 탭에서 기록 #{item['id']}을 확인하세요.")
+                else:
+                    save_result("current_prd", reopened)
+                    st.toast(f"📋 PRD 탭에서 기록 #{item['id']}을 확인하세요.")
+                st.rerun()
+    
+    # 페이지 이동은 생성 기록 탭만 다시 실행
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("◀ 이전", key="history_prev", disabled=history["page"] <= 1):
+            st.session_state.history_page = history["page"] - 1
+            st.rerun(scope="fragment")
+    with col2:
+        if st.button("다음 ▶", key="history_next", disabled=history["page"] >= history["pages"]):
+            st.session_state.history_page = history["page"] + 1
+            st.rerun(scope="fragment")
 
+# 탭 생성 (각 탭은 프래그먼트라서 탭 안의 위젯을 조작하면 그 탭만 다시 실행됨)
+tab1, tab2, tab3, tab4 = st.tabs(["💡 아이디어 생성", "📋 PRD 생성", "📦 대량 생성", "🗂️ 생성 기록"])
+
+with tab1:
+    idea_tab()
     st.write("---")
     st.info("🌱 지속가능한 세상을 위한 혁신적인 AI 솔루션 아이디어를 만들어보세요! AWS Bedrock Nova Lite가 도와드립니다.")
 
-    with tab2:
-        st.write("## 📋 간단한 Streamlit 앱 PRD 생성")
-        
-        # 아이디어 입력 방식 선택
-        input_method = st.radio(
-            "📥 아이디어 입력 방식",
-            ["직접 입력", "아이디어 생성 탭에서 가져오기"],
-            horizontal=True
+with tab2:
+    prd_tab()
+
+with tab3:
+    bulk_tab()
+
+with tab4:
+    history_tab()
+
+# 전체 재실행 시간 측정을 마치고 사이드바에 최근 재실행 시간 표시
+record_rerun_timing(end_rerun_probe(app_probe))
+
+with st.sidebar:
+    st.toggle("⏱️ 재실행 시간 표시", key="show_rerun_timing", help="조작할 때마다 다시 실행된 범위(app=앱 전체, 그 외=해당 프래그먼트)와 실행 시간을 표시합니다 (작업 대기 시간 제외)")
+    if st.session_state.show_rerun_timing:
+        rerun_timings = st.session_state.get("rerun_timings", [])
+        for scope in sorted({timing["scope"] for timing in rerun_timings}):
+            scope_ms = sorted(timing["ms"] for timing in rerun_timings if timing["scope"] == scope)
+            st.caption(f"{scope}: 중앙값 {scope_ms[len(scope_ms) // 2]:.1f}ms ({len(scope_ms)}회)")
+        st.dataframe(
+            [{"시각": timing["at"], "범위": timing["scope"], "실행 시간(ms)": round(timing["ms"], 1)} for timing in reversed(rerun_timings)],
+            hide_index=True
         )
-        
-        if input_method == "아이디어 생성 탭에서 가져오기":
-            if hasattr(st.session_state, 'current_idea') and 'generated_content' in st.session_state.current_idea:
-                st.write("### 📝 가져온 아이디어")
-                with st.expander("생성된 아이디어 내용 보기"):
-                    st.markdown(st.session_state.current_idea['generated_content'])
-                idea_content = st.session_state.current_idea['generated_content']
-            else:
-                st.warning("⚠️ 아이디어 생성 탭에서 먼저 아이디어를 생성해주세요.")
-                idea_content = ""
-        else:
-            idea_content = st.text_area(
-                "💡 해커톤 아이디어 내용",
-                height=200,
-                placeholder="생성된 해커톤 아이디어를 여기에 붙여넣어 주세요..."
-            )
-        
-        st.write("---")
-        
-        # PRD 생성 버튼
-        if st.button("📋 간단한 PRD 생성하기", type="primary"):
-            if idea_content.strip():
-                with st.spinner("간단한 Streamlit 앱 PRD를 생성하고 있습니다..."):
-                    prd_content = generate_streamlit_prd(idea_content)
-                
-                st.write("## 📋 생성된 PRD")
-                st.markdown(prd_content)
-                
-                # PRD를 세션에 저장
-                st.session_state.current_prd = prd_content
-                
-                st.write("---")
-                
-                # 파일 저장 옵션
-                col1, col2 = st.columns([1, 3])
-                with col1:
-                    if st.button("💾 MD 파일로 저장", type="secondary"):
-                        success, result = save_prd_to_markdown(prd_content)
-                        if success:
-                            st.success(f"✅ PRD가 저장되었습니다!")
-                            st.info(f"📁 저장 위치: `{result}`")
-                        else:
-                            st.error(f"❌ 저장 실패: {result}")
-                
-                with col2:
-                    st.download_button(
-                        label="📥 MD 파일 다운로드",
-                        data=prd_content,
-                        file_name=f"streamlit_app_prd_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                        mime="text/markdown"
-                    )
-            else:
-                st.error("❌ 아이디어 내용을 입력해주세요!")
-        
-        # 기존 PRD 표시 (세션에 있는 경우)
-        if hasattr(st.session_state, 'current_prd'):
-            st.write("---")
-            st.write("### 📋 현재 세션의 PRD")
-            with st.expander("PRD 내용 보기"):
-                st.markdown(st.session_state.current_prd)
-                
-                # 기존 PRD도 다운로드 가능
-                st.download_button(
-                    label="📥 현재 PRD 다운로드",
-                    data=st.session_state.current_prd,
-                    file_name=f"current_prd_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                    mime="text/markdown",
-                    key="download_current_prd"
-                ) 
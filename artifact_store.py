@@ -0,0 +1,183 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# 목록/검색 결과에 함께 돌려주는 본문 미리보기 길이 (전체 본문은 get()으로 조회)
+PREVIEW_CHARS = 200
+
+SUMMARY_COLUMNS = "id, kind, input_hash, inputs, model_id, created_at, substr(content, 1, ?) AS preview, length(content) AS chars"
+
+
+def make_input_hash(kind, inputs):
+    """생성 종류와 입력값으로 입력 해시(SHA-256) 생성 (같은 입력의 이전 결과 조회용)"""
+    payload = json.dumps({"kind": kind, "inputs": inputs}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_match_query(query):
+    """검색어를 FTS5 MATCH 식으로 변환 (공백으로 나눈 각 단어를 모두 포함, 특수 문자는 그대로 검색)"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class ArtifactStore:
+    """생성한 아이디어/PRD를 입력값, 모델, 사용량, 소요 시간과 함께 보관하는 SQLite 기록 저장소
+
+    본문과 입력값은 FTS5 전문 검색 색인에 함께 넣습니다. 한국어는 공백 단위 토큰화로는
+    조사가 붙은 단어를 찾지 못하므로 trigram 토크나이저(부분 문자열 검색)를 쓰고,
+    지원하지 않는 SQLite에서는 unicode61, FTS5 자체가 없으면 LIKE 검색으로 대신합니다.
+    trigram은 3글자 미만 검색어를 색인으로 찾을 수 없으므로 이때도 LIKE를 사용합니다.
+    """
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, input_hash TEXT NOT NULL, "
+            "inputs TEXT NOT NULL, content TEXT NOT NULL, model_id TEXT, usage TEXT, timings TEXT, "
+            "created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_input_hash ON artifacts (input_hash, id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_kind ON artifacts (kind, id)")
+        self.tokenizer = self._create_search_index()
+        self._db.commit()
+
+    def add(self, kind, inputs, content, model_id=None, usage=None, timings=None):
+        """결과 하나를 기록하고 기록 ID 반환"""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO artifacts (kind, input_hash, inputs, content, model_id, usage, timings, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind, make_input_hash(kind, inputs), json.dumps(inputs, ensure_ascii=False), content, model_id,
+                    json.dumps(usage or {}), json.dumps(timings or {}), time.time()
+                )
+            )
+            self._db.commit()
+            return cursor.lastrowid
+
+    def get(self, artifact_id):
+        """기록 하나의 전체 내용 (없으면 None)"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(
+            row,
+            inputs=json.loads(row["inputs"]),
+            usage=json.loads(row["usage"] or "{}"),
+            timings=json.loads(row["timings"] or "{}")
+        )
+
+    def find_by_input_hash(self, input_hash, limit=5):
+        """같은 입력으로 만든 기록 요약 목록 (최신순)"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM artifacts WHERE input_hash = ? ORDER BY id DESC LIMIT ?",
+                (PREVIEW_CHARS, input_hash, limit)
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def list(self, kind=None, page=1, page_size=20):
+        """기록 요약 목록을 최신순으로 페이지 단위 조회 {"items", "total", "page", "page_size", "pages"}"""
+        where, params = ("WHERE kind = ?", [kind]) if kind else ("", [])
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM artifacts {where}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM artifacts {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                [PREVIEW_CHARS] + params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        return self._page(rows, total, page, page_size)
+
+    def search(self, query, kind=None, page=1, page_size=20):
+        """본문/입력값 전문 검색 결과를 최신순으로 페이지 단위 조회 (list()와 같은 형식)"""
+        query = query.strip()
+        if not query:
+            return self.list(kind, page, page_size)
+
+        use_index = self.tokenizer and not (self.tokenizer == "trigram" and min(len(term) for term in query.split()) < 3)
+        if use_index:
+            condition = "id IN (SELECT rowid FROM artifacts_fts WHERE artifacts_fts MATCH ?)"
+            params = [build_match_query(query)]
+        else:
+            terms = query.split()
+            condition = " AND ".join(["(content LIKE ? ESCAPE '\\' OR inputs LIKE ? ESCAPE '\\')"] * len(terms))
+            params = []
+            for term in terms:
+                pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                params += [pattern, pattern]
+        if kind:
+            condition += " AND kind = ?"
+            params.append(kind)
+
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM artifacts WHERE {condition}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM artifacts WHERE {condition} ORDER BY id DESC LIMIT ? OFFSET ?",
+                [PREVIEW_CHARS] + params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        return self._page(rows, total, page, page_size)
+
+    def iter_inputs(self, kind, after_id=0, batch_size=500):
+        """after_id 이후 기록의 (기록 ID, 입력값)을 ID 순서로 반환 (다른 색인을 채울 때 사용)"""
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, inputs FROM artifacts WHERE kind = ? AND id > ? ORDER BY id LIMIT ?",
+                    (kind, after_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], json.loads(row["inputs"])
+            after_id = rows[-1]["id"]
+
+    def stats(self):
+        """종류별 기록 수와 검색 색인 종류"""
+        with self._lock:
+            rows = self._db.execute("SELECT kind, COUNT(*) FROM artifacts GROUP BY kind").fetchall()
+        return {"counts": {row[0]: row[1] for row in rows}, "tokenizer": self.tokenizer or "like"}
+
+    def _create_search_index(self):
+        """FTS5 색인과 동기화 트리거 생성 후 사용한 토크나이저 이름 반환 (FTS5가 없으면 None)"""
+        existing = self._db.execute("SELECT sql FROM sqlite_master WHERE name = 'artifacts_fts'").fetchone()
+        if existing is not None:
+            return "trigram" if "trigram" in existing[0] else "unicode61"
+
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE artifacts_fts USING fts5("
+                    f"content, inputs, content='artifacts', content_rowid='id', tokenize='{tokenizer}')"
+                )
+            except sqlite3.OperationalError:
+                continue
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS artifacts_fts_insert AFTER INSERT ON artifacts BEGIN "
+                "INSERT INTO artifacts_fts (rowid, content, inputs) VALUES (new.id, new.content, new.inputs); END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS artifacts_fts_delete AFTER DELETE ON artifacts BEGIN "
+                "INSERT INTO artifacts_fts (artifacts_fts, rowid, content, inputs) "
+                "VALUES ('delete', old.id, old.content, old.inputs); END"
+            )
+            # 색인을 처음 만드는 경우 기존 기록도 색인에 넣음
+            self._db.execute("INSERT INTO artifacts_fts (artifacts_fts) VALUES ('rebuild')")
+            return tokenizer
+        return None
+
+    def _summary(self, row):
+        return dict(row, inputs=json.loads(row["inputs"]))
+
+    def _page(self, rows, total, page, page_size):
+        return {
+            "items": [self._summary(row) for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": max(1, -(-total // page_size))
+        }
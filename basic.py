@@ -1,83 +1,10 @@
 import streamlit as st
-import boto3
-import json
-from botocore.exceptions import ClientError
-
-# AWS Bedrock 클라이언트 초기화
-@st.cache_resource
-def get_bedrock_client():
-    try:
-        return boto3.client('bedrock-runtime', region_name='us-east-1')
-    except Exception as e:
-        st.error(f"AWS Bedrock 클라이언트 초기화 실패: {e}")
-        return None
-
-def generate_introduction_with_nova(name, major, hobby, experiences, target_job):
-    """Nova Lite 모델을 사용하여 자기소개서 생성"""
-    bedrock_client = get_bedrock_client()
-    
-    if not bedrock_client:
-        return "❌ AWS Bedrock 연결에 실패했습니다."
-    
-    prompt = f"""
-당신은 전문적인 자기소개서 작성 도우미입니다. 다음 정보를 바탕으로 매력적이고 전문적인 자기소개서를 작성해주세요.
-
-개인 정보:
-- 이름: {name}
-- 전공: {major}
-- 취미: {hobby}
-- 경험/활동: {experiences}
-- 희망 직무: {target_job}
-
-다음 구조로 자기소개서를 작성해주세요:
-1. 인사말 및 자기소개
-2. 전공 관련 역량
-3. 경험 및 활동
-4. 취미를 통한 개성 표현
-5. 희망 직무에 대한 열정
-6. 마무리
-
-한국어로 작성하며, 진정성 있고 전문적인 톤으로 작성해주세요.
-"""
-
-    try:
-        # Nova Lite 모델 호출 (올바른 형식)
-        response = bedrock_client.invoke_model(
-            modelId="amazon.nova-lite-v1:0",  # Nova Lite 모델 ID
-            body=json.dumps({
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": 1000,
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            })
-        )
-        
-        # 응답 파싱
-        response_body = json.loads(response.get('body').read())
-        
-        # Nova 모델의 응답 구조에 맞게 텍스트 추출
-        if 'output' in response_body and 'message' in response_body['output']:
-            content = response_body['output']['message']['content']
-            if content and len(content) > 0 and 'text' in content[0]:
-                return content[0]['text']
-        
-        return '자기소개서 생성에 실패했습니다.'
-        
-    except ClientError as e:
-        return f"❌ AWS API 호출 오류: {e}"
-    except Exception as e:
-        return f"❌ 자기소개서 생성 중 오류 발생: {e}"
+import os
+from datetime import datetime
+from introduction_generator import generate_introduction_with_nova
+from batch_introductions import BATCH_ROLE_ARN, BATCH_S3_URI, RESULTS_FILE, ROSTER_FIELDS, format_summary, parse_roster, submit_batch_job
+from hackathon_generator import get_job_queue
+from job_queue import ACTIVE_JOB_STATES, JOB_DONE
 
 # 앱 제목
 st.title("🤖 AI 자기소개서 생성기")
@@ -103,5 +30,50 @@ if st.button("🤖 자기소개서 생성하기", type="primary"):
     else:
         st.error("모든 필드를 입력해 주세요!")
 
+# 명단 일괄 생성 (Bedrock 배치 추론: 결과가 나오기까지 오래 걸리므로 작업 ID를 URL에 두고 상태만 확인)
+st.write("---")
+st.write("## 📦 명단 일괄 생성")
+st.caption(f"CSV 또는 JSONL 파일의 각 행에 `{'`, `'.join(ROSTER_FIELDS)}` 필드가 필요합니다. (`id` 열이 있으면 재시작 시 기준으로 사용)")
+roster_file = st.file_uploader("📥 명단 파일 업로드", type=["csv", "jsonl"])
+
+if not (BATCH_S3_URI and BATCH_ROLE_ARN):
+    st.info("💡 배치 추론을 사용하려면 환경 변수 BATCH_S3_URI와 BATCH_ROLE_ARN을 설정해 주세요.")
+elif st.button("📦 배치로 생성하기"):
+    if roster_file is None:
+        st.error("❌ 명단 파일을 업로드해주세요!")
+    else:
+        try:
+            file_format = "jsonl" if roster_file.name.endswith(".jsonl") else "csv"
+            students = parse_roster(roster_file.getvalue().decode('utf-8-sig'), file_format)
+        except ValueError as e:
+            st.error(f"❌ 명단 파일 오류: {e}")
+            students = []
+        
+        if students:
+            output_dir = os.path.join("introductions", datetime.now().strftime('%Y%m%d_%H%M%S'))
+            st.query_params["batch_job"] = submit_batch_job(students, output_dir)
+
+batch_job_id = st.query_params.get("batch_job")
+batch_job = get_job_queue().get(batch_job_id) if batch_job_id else None
+if batch_job:
+    if batch_job["status"] in ACTIVE_JOB_STATES:
+        st.progress(batch_job["progress"], text=batch_job["message"] or "배치 작업을 준비하고 있습니다...")
+        st.button("🔄 상태 새로고침")
+    elif batch_job["status"] == JOB_DONE:
+        st.success("✅ 배치 생성이 완료되었습니다!")
+        st.text(format_summary(batch_job["result"]["summary"]))
+        
+        results_path = os.path.join(batch_job["result"]["output_dir"], RESULTS_FILE)
+        if os.path.exists(results_path):
+            with open(results_path, 'r', encoding='utf-8') as f:
+                st.download_button(
+                    label="📥 결과 JSONL 다운로드",
+                    data=f.read(),
+                    file_name=RESULTS_FILE,
+                    mime="application/jsonl"
+                )
+    else:
+        st.error(f"❌ 배치 생성 중 오류 발생: {batch_job['error']}")
+
 st.write("---")
 st.info("💡 AWS Bedrock Nova Lite 모델을 사용한 AI 자기소개서 생성기입니다.")
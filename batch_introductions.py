@@ -0,0 +1,444 @@
+"""학생 명단으로 자기소개서를 한꺼번에 만드는 Bedrock 배치 추론 모드
+
+명단의 각 행을 배치 추론 입력 JSONL 레코드로 만들어 객체 저장소(S3)에 올리고, 모델 호출
+작업(CreateModelInvocationJob)을 제출한 뒤 끝날 때까지 상태를 확인합니다. 작업이 끝나면
+출력 JSONL을 한 줄씩 읽어 학생별 마크다운 파일과 결과 JSONL로 기록합니다. 객체 저장소와
+작업 API는 바꿔 끼울 수 있어 --local로 실행하면 로컬 디렉터리와 bedrock-runtime 호출
+(BEDROCK_REGIONS로 로컬 대역 서버도 지정 가능)로 같은 흐름을 비용 없이 시험할 수 있습니다.
+
+    python batch_introductions.py roster.csv -o intros --s3-uri s3://bucket/batch --role-arn arn:aws:iam::123456789012:role/BedrockBatch
+    python batch_introductions.py roster.csv -o intros --local .batch_local --compare-realtime 20
+
+Bedrock 배치 작업은 작업당 최소 레코드 수(모델별, 보통 100건)가 있으므로 인원이 적은
+명단은 실시간 경로(basic.py)를 사용하세요.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import boto3
+from nova_engine import DEFAULT_REGION, NOVA_LITE_MODEL_ID, build_request_body, extract_text
+from introduction_generator import build_introduction_request, generate_introduction_with_nova
+from bulk_generation import load_completed_ids
+from hackathon_generator import get_bedrock_client, get_job_queue
+from job_queue import BULK_POOL
+
+# 명단 한 행을 구성하는 입력 필드
+ROSTER_FIELDS = ["name", "major", "hobby", "experiences", "target_job"]
+
+# 배치 입력/출력 위치와 Bedrock이 S3에 접근할 때 사용할 서비스 역할
+BATCH_S3_URI = os.environ.get("BATCH_S3_URI", "")
+BATCH_ROLE_ARN = os.environ.get("BATCH_ROLE_ARN", "")
+BATCH_POLL_SECONDS = 60  # 작업 상태 확인 간격 (배치 작업은 보통 수십 분~수 시간 걸림)
+
+# Bedrock 모델 호출 작업 상태
+BATCH_ACTIVE_STATES = ("Submitted", "Validating", "Scheduled", "InProgress", "Stopping")
+BATCH_RESULT_STATES = ("Completed", "PartiallyCompleted")
+
+RESULTS_FILE = "results.jsonl"
+
+
+def parse_roster(text, file_format):
+    """CSV 또는 JSONL 텍스트를 학생 목록으로 변환
+
+    각 학생에는 재시작 시 이어서 처리할 수 있도록 student_id가 붙습니다.
+    'id' 열이 있으면 그 값을, 없으면 행 번호를 사용합니다.
+    """
+    if file_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    elif file_format == "jsonl":
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {file_format}")
+
+    students = []
+    seen = set()
+    for index, row in enumerate(rows, start=1):
+        missing = [field for field in ROSTER_FIELDS if not str(row.get(field) or "").strip()]
+        if missing:
+            raise ValueError(f"{index}번째 행에 필수 필드가 없습니다: {', '.join(missing)}")
+
+        student = {field: str(row.get(field)).strip() for field in ROSTER_FIELDS}
+        student["student_id"] = str(row.get("id") or f"row-{index}")
+        # 배치 출력은 recordId로 학생을 찾으므로 ID가 겹치면 안 됨
+        if student["student_id"] in seen:
+            raise ValueError(f"{index}번째 행의 ID가 중복되었습니다: {student['student_id']}")
+        seen.add(student["student_id"])
+        students.append(student)
+    return students
+
+
+def read_roster(path):
+    """파일 확장자(.csv/.jsonl)에 맞춰 명단 파일을 읽음"""
+    file_format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return parse_roster(f.read(), file_format)
+
+
+def split_s3_uri(uri):
+    """'s3://버킷/키'를 (버킷, 키)로 분리"""
+    if not uri.startswith("s3://"):
+        raise ValueError(f"S3 URI가 아닙니다: {uri}")
+    bucket, _, key = uri[len("s3://"):].partition("/")
+    return bucket, key
+
+
+def batch_output_uri(output_uri, job_id, input_uri):
+    """Bedrock이 결과를 쓰는 위치 ('출력 위치/작업 ID/입력 파일 이름.out')"""
+    job_folder = job_id.rsplit("/", 1)[-1]  # 작업 ARN의 마지막 부분이 작업 ID
+    return f"{output_uri.rstrip('/')}/{job_folder}/{os.path.basename(split_s3_uri(input_uri)[1])}.out"
+
+
+class S3ObjectStore:
+    """배치 입력/출력을 S3에 읽고 쓰는 객체 저장소"""
+
+    def __init__(self, s3_client=None, region_name=DEFAULT_REGION):
+        self._s3 = s3_client or boto3.client("s3", region_name=region_name)
+
+    def put_text(self, uri, text):
+        bucket, key = split_s3_uri(uri)
+        self._s3.put_object(Bucket=bucket, Key=key, Body=text.encode("utf-8"))
+
+    def iter_lines(self, uri):
+        """객체를 한꺼번에 내려받지 않고 한 줄씩 읽음"""
+        bucket, key = split_s3_uri(uri)
+        body = self._s3.get_object(Bucket=bucket, Key=key)["Body"]
+        for line in body.iter_lines():
+            yield line.decode("utf-8")
+
+
+class LocalObjectStore:
+    """'s3://버킷/키'를 root/버킷/키 파일로 다루는 객체 저장소 대역"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, uri):
+        bucket, key = split_s3_uri(uri)
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def put_text(self, uri, text):
+        path = self.path(uri)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def iter_lines(self, uri):
+        with open(self.path(uri), 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+class BedrockBatchJobs:
+    """Bedrock 모델 호출 작업(배치 추론) API"""
+
+    def __init__(self, role_arn, bedrock_client=None, region_name=DEFAULT_REGION):
+        self.role_arn = role_arn
+        self._bedrock = bedrock_client or boto3.client("bedrock", region_name=region_name)
+
+    def submit(self, job_name, model_id, input_uri, output_uri):
+        """작업을 제출하고 작업 ID(ARN) 반환"""
+        response = self._bedrock.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=model_id,
+            inputDataConfig={"s3InputDataConfig": {"s3Uri": input_uri, "s3InputFormat": "JSONL"}},
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": output_uri}}
+        )
+        return response["jobArn"]
+
+    def status(self, job_id):
+        """작업 상태 {"status", "message"}"""
+        response = self._bedrock.get_model_invocation_job(jobIdentifier=job_id)
+        return {"status": response["status"], "message": response.get("message", "")}
+
+
+class LocalBatchJobs:
+    """입력 JSONL의 레코드를 bedrock-runtime으로 직접 호출해 Bedrock과 같은 형식의 .out을 만드는 작업 API 대역
+
+    runtime_client는 get_bedrock_client()처럼 invoke_model을 제공하면 되므로 로컬 대역
+    서버(bedrock_stub.py)를 가리키게 하면 비용 없이 전체 흐름을 시험할 수 있습니다.
+    """
+
+    def __init__(self, store, runtime_client, concurrency=8):
+        self.store = store
+        self.runtime_client = runtime_client
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def submit(self, job_name, model_id, input_uri, output_uri):
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._jobs[job_id] = {"status": "Submitted", "message": ""}
+        threading.Thread(
+            target=self._run, args=(job_id, model_id, input_uri, batch_output_uri(output_uri, job_id, input_uri)),
+            name=f"batch-{job_name}", daemon=True
+        ).start()
+        return job_id
+
+    def status(self, job_id):
+        with self._lock:
+            return dict(self._jobs[job_id])
+
+    def _set_status(self, job_id, status, message=""):
+        with self._lock:
+            self._jobs[job_id] = {"status": status, "message": message}
+
+    def _invoke(self, model_id, record):
+        try:
+            response = self.runtime_client.invoke_model(modelId=model_id, body=json.dumps(record["modelInput"]))
+            return dict(record, modelOutput=json.loads(response["body"].read()))
+        except Exception as e:
+            return dict(record, error={"errorCode": 500, "errorMessage": str(e)})
+
+    def _run(self, job_id, model_id, input_uri, result_uri):
+        try:
+            records = [json.loads(line) for line in self.store.iter_lines(input_uri) if line.strip()]
+            self._set_status(job_id, "InProgress")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                outputs = list(executor.map(lambda record: self._invoke(model_id, record), records))
+            self.store.put_text(result_uri, "".join(json.dumps(output, ensure_ascii=False) + "\n" for output in outputs))
+            failed = sum(1 for output in outputs if "error" in output)
+            if failed == len(outputs):
+                self._set_status(job_id, "Failed", "모든 레코드 호출이 실패했습니다.")
+            else:
+                self._set_status(job_id, "PartiallyCompleted" if failed else "Completed", f"실패 {failed}건" if failed else "")
+        except Exception as e:
+            self._set_status(job_id, "Failed", str(e))
+
+
+def build_batch_record(student, model_id=NOVA_LITE_MODEL_ID):
+    """학생 한 명의 배치 입력 레코드 {"recordId", "modelInput"} (실시간 호출과 같은 프롬프트/설정)"""
+    prompt, inference_config = build_introduction_request(
+        student["name"], student["major"], student["hobby"], student["experiences"], student["target_job"]
+    )
+    return {"recordId": student["student_id"], "modelInput": build_request_body(prompt, inference_config, model_id=model_id)}
+
+
+def parse_batch_output(line):
+    """출력 JSONL 한 줄을 (recordId, 결과) 로 변환 (결과는 성공 시 생성 내용/사용량, 실패 시 오류)"""
+    record = json.loads(line)
+    if "error" in record or "modelOutput" not in record:
+        error = record.get("error") or {}
+        return record.get("recordId"), {"status": "error", "error": error.get("errorMessage") or str(error)}
+    output = record["modelOutput"]
+    return record.get("recordId"), {
+        "status": "ok",
+        "generated_content": extract_text(output),
+        "stop_reason": output.get("stopReason") or output.get("output", {}).get("stopReason"),
+        "usage": output.get("usage")
+    }
+
+
+def wait_for_batch_job(jobs, job_id, poll_seconds=BATCH_POLL_SECONDS, on_status=None):
+    """작업이 끝날 때까지 poll_seconds마다 상태를 확인하고 마지막 상태 반환"""
+    last_status = None
+    while True:
+        status = jobs.status(job_id)
+        if on_status and status["status"] != last_status:
+            on_status(status)
+        last_status = status["status"]
+        if status["status"] not in BATCH_ACTIVE_STATES:
+            return status
+        time.sleep(poll_seconds)
+
+
+def student_file_name(student_id):
+    """학생 ID를 파일 이름으로 쓸 수 있게 정리"""
+    return re.sub(r"[^\w.-]", "_", student_id) + ".md"
+
+
+def run_batch(students, output_dir, store, jobs, s3_uri, model_id=NOVA_LITE_MODEL_ID, poll_seconds=BATCH_POLL_SECONDS, on_status=None, on_result=None):
+    """명단을 배치 추론 작업 하나로 생성하고 결과를 학생별 파일과 results.jsonl에 기록
+
+    output_dir/results.jsonl에 이미 성공으로 기록된 학생은 건너뛰므로 실패한 학생만 다시
+    제출하려면 같은 명령을 다시 실행하면 됩니다. on_status(status)는 작업 상태가 바뀔 때,
+    on_result(record, done, total)는 결과를 하나 기록할 때마다 불립니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = os.path.join(output_dir, RESULTS_FILE)
+    completed_ids = load_completed_ids(results_path, id_field="student_id")
+    pending = {student["student_id"]: student for student in students if student["student_id"] not in completed_ids}
+    summary = {"skipped": len(students) - len(pending), "succeeded": 0, "failed": 0, "input_tokens": 0, "output_tokens": 0}
+    start_time = time.perf_counter()
+    if not pending:
+        return dict(summary, job_id=None, status="Skipped", elapsed_seconds=0.0, students_per_minute=0.0,
+                    upload_seconds=0.0, wait_seconds=0.0, download_seconds=0.0)
+
+    run_id = f"introductions-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    input_uri = f"{s3_uri.rstrip('/')}/input/{run_id}.jsonl"
+    output_uri = f"{s3_uri.rstrip('/')}/output/"
+    store.put_text(input_uri, "".join(
+        json.dumps(build_batch_record(student, model_id), ensure_ascii=False) + "\n" for student in pending.values()
+    ))
+    uploaded_at = time.perf_counter()
+
+    job_id = jobs.submit(run_id, model_id, input_uri, output_uri)
+    status = wait_for_batch_job(jobs, job_id, poll_seconds, on_status)
+    finished_at = time.perf_counter()
+
+    if status["status"] in BATCH_RESULT_STATES:
+        with open(results_path, 'a', encoding='utf-8') as results_file:
+            for line in store.iter_lines(batch_output_uri(output_uri, job_id, input_uri)):
+                if not line.strip():
+                    continue
+                record_id, result = parse_batch_output(line)
+                student = pending.pop(record_id, None)
+                if student is None:
+                    continue
+                record = dict(student, job_id=job_id, completed_at=datetime.now().isoformat(timespec='seconds'), **result)
+                write_student_result(output_dir, results_file, record)
+                summary["succeeded" if record["status"] == "ok" else "failed"] += 1
+                summary["input_tokens"] += (record.get("usage") or {}).get("inputTokens", 0)
+                summary["output_tokens"] += (record.get("usage") or {}).get("outputTokens", 0)
+                if on_result:
+                    on_result(record, summary["succeeded"] + summary["failed"], len(students) - summary["skipped"])
+
+    # 출력에 없는 학생(작업 실패 등)도 실패로 기록해 다음 실행에서 다시 제출되도록 함
+    with open(results_path, 'a', encoding='utf-8') as results_file:
+        for student in pending.values():
+            record = dict(student, job_id=job_id, status="error", error=status["message"] or f"배치 작업 상태: {status['status']}")
+            write_student_result(output_dir, results_file, record)
+            summary["failed"] += 1
+
+    elapsed = time.perf_counter() - start_time
+    return dict(
+        summary,
+        job_id=job_id,
+        status=status["status"],
+        elapsed_seconds=elapsed,
+        students_per_minute=summary["succeeded"] / (elapsed / 60) if elapsed > 0 else 0.0,
+        upload_seconds=uploaded_at - start_time,
+        wait_seconds=finished_at - uploaded_at,
+        download_seconds=time.perf_counter() - finished_at
+    )
+
+
+def write_student_result(output_dir, results_file, record):
+    """결과 한 건을 results.jsonl에 추가하고 성공했으면 학생별 마크다운 파일로도 저장"""
+    results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    results_file.flush()
+    if record["status"] == "ok":
+        with open(os.path.join(output_dir, student_file_name(record["student_id"])), 'w', encoding='utf-8') as f:
+            f.write(record["generated_content"])
+
+
+def measure_realtime(students, concurrency=4):
+    """같은 학생들을 실시간 경로(generate_introduction_with_nova)로 생성해 처리량 측정"""
+    def generate(student):
+        text = generate_introduction_with_nova(
+            student["name"], student["major"], student["hobby"], student["experiences"], student["target_job"]
+        )
+        return not text.startswith(("❌", "⏳"))
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        succeeded = sum(executor.map(generate, students))
+    elapsed = time.perf_counter() - start_time
+    return {
+        "sampled": len(students),
+        "succeeded": succeeded,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "students_per_minute": succeeded / (elapsed / 60) if elapsed > 0 else 0.0
+    }
+
+
+def create_batch_backends(local_dir=None, role_arn=BATCH_ROLE_ARN):
+    """(객체 저장소, 작업 API) 생성 (local_dir를 주면 로컬 대역 사용)"""
+    if local_dir:
+        store = LocalObjectStore(local_dir)
+        bedrock_client = get_bedrock_client()
+        if not bedrock_client:
+            raise RuntimeError("AWS Bedrock 연결에 실패했습니다.")
+        return store, LocalBatchJobs(store, bedrock_client)
+    if not role_arn:
+        raise RuntimeError("배치 추론에 사용할 서비스 역할(BATCH_ROLE_ARN)을 지정해 주세요.")
+    return S3ObjectStore(), BedrockBatchJobs(role_arn)
+
+
+def submit_batch_job(students, output_dir, s3_uri=BATCH_S3_URI, role_arn=BATCH_ROLE_ARN, local_dir=None, poll_seconds=BATCH_POLL_SECONDS):
+    """배치 생성을 백그라운드 작업으로 등록하고 작업 ID 반환 (결과는 {"summary", "output_dir"})"""
+    def run(job):
+        store, jobs = create_batch_backends(local_dir, role_arn)
+
+        def show_status(status):
+            job.report(0.0, f"배치 작업 상태: {status['status']}" + (f" ({status['message']})" if status['message'] else ""))
+
+        def show_progress(record, done, total):
+            job.report(done / total, f"결과 기록 중 ({done}/{total})")
+
+        summary = run_batch(students, output_dir, store, jobs, s3_uri, poll_seconds=poll_seconds, on_status=show_status, on_result=show_progress)
+        return {"summary": summary, "output_dir": output_dir}
+
+    return get_job_queue().submit("batch_introductions", run, pool=BULK_POOL)
+
+
+def format_summary(summary, realtime=None):
+    """요약(과 실시간 경로 측정 결과)을 사람이 읽기 쉬운 여러 줄 문자열로 변환"""
+    lines = [
+        f"🗂️ 배치 작업: {summary['job_id'] or '-'} ({summary['status']})",
+        f"✅ 성공: {summary['succeeded']}건 · ❌ 실패: {summary['failed']}건 · ⏭️ 건너뜀: {summary['skipped']}건",
+        f"⏱️ 전체 소요 시간: {summary['elapsed_seconds']:.1f}초 (업로드 {summary['upload_seconds']:.1f}초 · "
+        f"작업 대기 {summary['wait_seconds']:.1f}초 · 결과 기록 {summary['download_seconds']:.1f}초) · "
+        f"처리량: {summary['students_per_minute']:.1f}명/분",
+        f"🔢 토큰 사용량: 입력 {summary['input_tokens']:,} · 출력 {summary['output_tokens']:,}"
+    ]
+    if realtime and realtime["students_per_minute"]:
+        total = summary["succeeded"] + summary["failed"]
+        estimated_seconds = total / realtime["students_per_minute"] * 60
+        ratio = summary["students_per_minute"] / realtime["students_per_minute"]
+        lines.append(
+            f"⚡ 실시간 경로: {realtime['students_per_minute']:.1f}명/분 (표본 {realtime['sampled']}명, 동시 {realtime['concurrency']}건) · "
+            f"같은 명단 예상 {estimated_seconds:.1f}초 · 배치 처리량은 실시간의 {ratio:.2f}배"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/JSONL 학생 명단으로 자기소개서를 Bedrock 배치 추론으로 생성합니다.")
+    parser.add_argument("roster", help="명단 파일 경로 (.csv 또는 .jsonl, 열: name, major, hobby, experiences, target_job, 선택: id)")
+    parser.add_argument("-o", "--output-dir", default="introductions", help="학생별 결과를 저장할 디렉터리 (기본값: introductions)")
+    parser.add_argument("--s3-uri", default=BATCH_S3_URI or None, help="배치 입력/출력을 둘 S3 위치 (기본값: 환경 변수 BATCH_S3_URI)")
+    parser.add_argument("--role-arn", default=BATCH_ROLE_ARN, help="Bedrock 배치 작업 서비스 역할 ARN (기본값: 환경 변수 BATCH_ROLE_ARN)")
+    parser.add_argument("--model-id", default=NOVA_LITE_MODEL_ID, help=f"모델 ID (기본값: {NOVA_LITE_MODEL_ID})")
+    parser.add_argument("--poll-seconds", type=float, default=None, help=f"작업 상태 확인 간격 (기본값: {BATCH_POLL_SECONDS}초, --local이면 1초)")
+    parser.add_argument("--local", metavar="DIR", help="S3/배치 작업 API 대신 로컬 디렉터리와 bedrock-runtime 직접 호출 사용")
+    parser.add_argument("--compare-realtime", type=int, default=0, metavar="N", help="명단 앞 N명을 실시간 경로로도 생성해 처리량 비교")
+    parser.add_argument("--realtime-concurrency", type=int, default=4, help="실시간 경로 비교 시 동시 호출 수 (기본값: 4)")
+    args = parser.parse_args(argv)
+
+    s3_uri = args.s3_uri or ("s3://local-batch" if args.local else None)
+    if not s3_uri:
+        parser.error("--s3-uri 또는 환경 변수 BATCH_S3_URI를 지정해 주세요.")
+    poll_seconds = args.poll_seconds if args.poll_seconds is not None else (1.0 if args.local else BATCH_POLL_SECONDS)
+
+    students = read_roster(args.roster)
+    store, jobs = create_batch_backends(args.local, args.role_arn)
+
+    def report_status(status):
+        print(f"[배치] {status['status']} {status['message']}".rstrip(), flush=True)
+
+    def report(record, done, total):
+        status = "✅" if record["status"] == "ok" else f"❌ {record.get('error')}"
+        print(f"[{done}/{total}] {record['student_id']} {status}", flush=True)
+
+    summary = run_batch(students, args.output_dir, store, jobs, s3_uri, args.model_id, poll_seconds, report_status, report)
+    realtime = None
+    if args.compare_realtime:
+        realtime = measure_realtime(students[:args.compare_realtime], args.realtime_concurrency)
+    print(format_summary(summary, realtime))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from botocore.exceptions import ClientError, ConnectionError as BotocoreConnectionError, HTTPClientError
+from nova_engine import DEFAULT_REGION, create_bedrock_client
+from rate_governor import is_throttling_error
+
+# 사용할 리전 목록 (쉼표 구분, "리전=엔드포인트 URL"로 로컬 스텁 서버 등을 지정할 수 있음)
+#   BEDROCK_REGIONS="us-east-1,us-west-2"
+#   BEDROCK_REGIONS="stub-a=http://127.0.0.1:8001,stub-b=http://127.0.0.1:8002"
+BEDROCK_REGIONS = os.environ.get("BEDROCK_REGIONS", DEFAULT_REGION)
+
+# 회로 차단기 설정
+CIRCUIT_WINDOW_SIZE = 50  # 상태 판단에 쓰는 리전별 최근 호출 수
+CIRCUIT_MIN_REQUESTS = 5  # 이보다 적게 호출된 리전은 차단하지 않음
+CIRCUIT_FAILURE_THRESHOLD = 0.5  # 최근 호출 중 실패(오류+스로틀링) 비율이 이 이상이면 차단
+CIRCUIT_OPEN_SECONDS = 30.0  # 차단 후 시험 호출을 허용하기까지의 시간
+
+# 회로 차단기 상태
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def parse_region_specs(text):
+    """'us-east-1,stub=http://127.0.0.1:8001' 형식을 [(리전, 엔드포인트 URL 또는 None)]로 변환"""
+    specs = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        region, _, endpoint_url = item.partition("=")
+        specs.append((region.strip(), endpoint_url.strip() or None))
+    return specs
+
+
+def is_retryable_error(error):
+    """다른 리전으로 넘겨 재시도할 만한 오류인지 확인 (스로틀링/일시적 오류/연결 오류)"""
+    if isinstance(error, ClientError):
+        return is_throttling_error(error)
+    return isinstance(error, (BotocoreConnectionError, HTTPClientError))
+
+
+def classify_outcome(error):
+    """호출 결과를 리전 상태 기록용 "ok" / "throttle" / "error"로 분류"""
+    if error is None:
+        return "ok"
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        if code in ("ThrottlingException", "TooManyRequestsException"):
+            return "throttle"
+        if not is_retryable_error(error):
+            # 잘못된 요청 등 리전 상태와 무관한 오류는 정상 응답으로 간주
+            return "ok"
+    return "error"
+
+
+class RegionHealth:
+    """리전 하나의 최근 호출 결과와 회로 차단기 상태"""
+
+    def __init__(self, region, endpoint_url, client, weight=1.0):
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.client = client
+        self.weight = weight
+        self.in_flight = 0
+        self.outcomes = deque(maxlen=CIRCUIT_WINDOW_SIZE)  # (결과, 지연 시간)
+        self.state = CIRCUIT_CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.totals = {"calls": 0, "errors": 0, "throttles": 0, "failovers": 0, "circuit_opens": 0}
+
+    def rates(self):
+        """최근 호출 기준 (오류율, 스로틀링 비율, 평균 지연 시간)"""
+        if not self.outcomes:
+            return 0.0, 0.0, None
+        errors = sum(1 for outcome, _ in self.outcomes if outcome == "error")
+        throttles = sum(1 for outcome, _ in self.outcomes if outcome == "throttle")
+        latencies = [latency for outcome, latency in self.outcomes if outcome == "ok"]
+        count = len(self.outcomes)
+        return errors / count, throttles / count, sum(latencies) / len(latencies) if latencies else None
+
+
+class BedrockClientPool:
+    """여러 리전의 bedrock-runtime 클라이언트를 묶어 상태 기반으로 분배하는 풀
+
+    bedrock-runtime 클라이언트와 같은 invoke_model / invoke_model_with_response_stream을
+    제공하므로 기존 호출 코드에 그대로 넘길 수 있습니다. 리전별 최근 오류율, 스로틀링
+    비율, 지연 시간을 기록하고, 실패 비율이 높은 리전은 회로 차단기로 일정 시간 제외한 뒤
+    시험 호출 하나로 회복 여부를 확인합니다. 호출할 리전은 strategy에 따라
+    "least_loaded"(가중치 대비 진행 중 호출 수와 평균 지연 시간이 가장 작은 리전) 또는
+    "weighted"(가중치 × 성공률 비례 무작위)로 고르며, 스로틀링/연결 오류가 나면 다른
+    리전으로 넘겨 다시 호출합니다.
+    """
+
+    def __init__(self, region_specs, client_factory=create_bedrock_client, weights=None, strategy="least_loaded"):
+        if not region_specs:
+            raise ValueError("리전이 하나 이상 필요합니다.")
+        weights = weights or {}
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._regions = [
+            RegionHealth(region, endpoint_url, client_factory(region, endpoint_url), weights.get(region, 1.0))
+            for region, endpoint_url in region_specs
+        ]
+
+    def invoke_model(self, **kwargs):
+        return self._dispatch("invoke_model", kwargs)
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        return self._dispatch("invoke_model_with_response_stream", kwargs)
+
+    def status(self):
+        """리전별 회로 상태, 진행 중 호출 수, 최근 오류율/스로틀링 비율/평균 지연 시간과 누적 횟수"""
+        with self._lock:
+            rows = []
+            for health in self._regions:
+                self._refresh_state(health, time.monotonic())
+                error_rate, throttle_rate, average_latency = health.rates()
+                rows.append({
+                    "region": health.region,
+                    "endpoint_url": health.endpoint_url,
+                    "state": health.state,
+                    "weight": health.weight,
+                    "in_flight": health.in_flight,
+                    "error_rate": round(error_rate, 3),
+                    "throttle_rate": round(throttle_rate, 3),
+                    "average_latency": round(average_latency, 3) if average_latency is not None else None,
+                    **health.totals
+                })
+            return rows
+
+    def _dispatch(self, method, kwargs):
+        tried = set()
+        last_error = None
+        while True:
+            health = self._acquire(tried)
+            if health is None:
+                raise last_error
+            tried.add(health.region)
+
+            start_time = time.perf_counter()
+            try:
+                response = getattr(health.client, method)(**kwargs)
+            except Exception as e:
+                self._release(health, e, time.perf_counter() - start_time)
+                if not is_retryable_error(e):
+                    raise
+                last_error = e
+                with self._lock:
+                    health.totals["failovers"] += 1
+                continue
+
+            if method == "invoke_model_with_response_stream":
+                # 스트리밍은 본문을 끝까지 읽었을 때 호출이 끝난 것으로 기록
+                response = dict(response, body=self._track_stream(health, response.get("body"), start_time))
+            else:
+                self._release(health, None, time.perf_counter() - start_time)
+            return response
+
+    def _track_stream(self, health, body, start_time):
+        error = None
+        try:
+            for stream_event in body:
+                yield stream_event
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(health, error, time.perf_counter() - start_time)
+
+    def _acquire(self, tried):
+        """아직 시도하지 않은 리전 중 하나를 골라 진행 중 호출로 등록 (없으면 None)"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [health for health in self._regions if health.region not in tried]
+            if not candidates:
+                return None
+
+            for health in candidates:
+                self._refresh_state(health, now)
+            available = [
+                health for health in candidates
+                if health.state == CIRCUIT_CLOSED or (health.state == CIRCUIT_HALF_OPEN and not health.trial_in_flight)
+            ]
+            if not available:
+                # 모든 리전이 차단된 경우 아무 호출도 못 하는 것보다 가장 오래 차단된 리전을 시험
+                if tried:
+                    return None
+                available = [min(candidates, key=lambda health: health.opened_at)]
+
+            health = self._choose(available)
+            if health.state != CIRCUIT_CLOSED:
+                health.trial_in_flight = True
+            health.in_flight += 1
+            return health
+
+    def _choose(self, available):
+        if self.strategy == "weighted":
+            weights = []
+            for health in available:
+                error_rate, throttle_rate, _ = health.rates()
+                weights.append(max(health.weight * (1.0 - error_rate - throttle_rate), 0.01))
+            return random.choices(available, weights=weights)[0]
+
+        def load(health):
+            average_latency = health.rates()[2]
+            return ((health.in_flight + 1) / health.weight, average_latency or 0.0)
+        return min(available, key=load)
+
+    def _release(self, health, error, latency):
+        outcome = classify_outcome(error)
+        with self._lock:
+            health.in_flight -= 1
+            health.outcomes.append((outcome, latency))
+            health.totals["calls"] += 1
+            if outcome == "error":
+                health.totals["errors"] += 1
+            elif outcome == "throttle":
+                health.totals["throttles"] += 1
+
+            if health.trial_in_flight:
+                # 시험 호출 결과로 회복 여부 결정
+                health.trial_in_flight = False
+                if outcome == "ok":
+                    health.state = CIRCUIT_CLOSED
+                    health.outcomes.clear()
+                else:
+                    self._open(health)
+            elif health.state == CIRCUIT_CLOSED and len(health.outcomes) >= CIRCUIT_MIN_REQUESTS:
+                failures = sum(1 for result, _ in health.outcomes if result != "ok")
+                if failures / len(health.outcomes) >= CIRCUIT_FAILURE_THRESHOLD:
+                    self._open(health)
+
+    def _open(self, health):
+        health.state = CIRCUIT_OPEN
+        health.opened_at = time.monotonic()
+        health.totals["circuit_opens"] += 1
+
+    def _refresh_state(self, health, now):
+        if health.state == CIRCUIT_OPEN and now - health.opened_at >= CIRCUIT_OPEN_SECONDS:
+            health.state = CIRCUIT_HALF_OPEN
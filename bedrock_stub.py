@@ -0,0 +1,249 @@
+"""비용 없이 부하 테스트를 하기 위한 로컬 bedrock-runtime 대역 서버
+
+boto3가 그대로 호출할 수 있도록 InvokeModel(/model/{id}/invoke)과 이벤트 스트림 형식의
+InvokeModelWithResponseStream(/model/{id}/invoke-with-response-stream)을 흉내 내며,
+첫 토큰 지연(로그 정규 분포), 토큰 생성 속도, 출력 길이, stopReason 비율, 스로틀링
+비율을 설정할 수 있습니다.
+
+    python bedrock_stub.py --port 8001 --throttle-rate 0.05 --stop-mix end_turn=0.8,max_tokens=0.2
+    BEDROCK_REGIONS="stub=http://127.0.0.1:8001" AWS_ACCESS_KEY_ID=stub AWS_SECRET_ACCESS_KEY=stub streamlit run app.py
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 출력 텍스트를 만들 때 반복하는 문장 (한국어는 대략 2글자당 1토큰)
+FILLER_SENTENCE = "지속가능한 리빙랩 해커톤 아이디어를 위한 시험용 응답 문장입니다. "
+STREAM_CHUNK_TOKENS = 5  # 스트리밍 이벤트 하나에 담는 토큰 수
+
+
+def parse_stop_mix(text):
+    """'end_turn=0.8,max_tokens=0.2' 형식을 {stopReason: 비율}로 변환"""
+    mix = {}
+    for item in text.split(","):
+        if item.strip():
+            reason, _, weight = item.partition("=")
+            mix[reason.strip()] = float(weight)
+    return mix
+
+
+def encode_event_message(headers, payload):
+    """AWS 이벤트 스트림(application/vnd.amazon.eventstream) 메시지 하나를 인코딩"""
+    header_bytes = b""
+    for name, value in headers.items():
+        name_bytes = name.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        # 헤더 값 형식 7 = 문자열
+        header_bytes += struct.pack("!B", len(name_bytes)) + name_bytes + struct.pack("!BH", 7, len(value_bytes)) + value_bytes
+    total_length = 12 + len(header_bytes) + len(payload) + 4
+    prelude = struct.pack("!II", total_length, len(header_bytes))
+    prelude += struct.pack("!I", zlib.crc32(prelude))
+    message = prelude + header_bytes + payload
+    return message + struct.pack("!I", zlib.crc32(message))
+
+
+def encode_chunk_event(body):
+    """Nova 스트리밍 청크({"bytes": base64(JSON)})를 이벤트 스트림 메시지로 인코딩"""
+    payload = json.dumps({"bytes": base64.b64encode(json.dumps(body, ensure_ascii=False).encode("utf-8")).decode("ascii")})
+    return encode_event_message(
+        {":event-type": "chunk", ":content-type": "application/json", ":message-type": "event"},
+        payload.encode("utf-8")
+    )
+
+
+class BedrockStubServer:
+    """설정 가능한 지연/종료 이유/스로틀링으로 응답하는 bedrock-runtime 대역 서버
+
+    ttft_median/ttft_sigma는 첫 토큰까지의 로그 정규 분포, tokens_per_second는 이후 생성
+    속도, output_tokens_mean/output_tokens_sigma는 end_turn일 때의 출력 토큰 수 분포입니다.
+    stopReason이 max_tokens로 뽑히면 요청한 maxTokens만큼 출력하고 잘린 것으로 응답합니다.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, ttft_median=0.4, ttft_sigma=0.5, tokens_per_second=120.0,
+                 output_tokens_mean=700, output_tokens_sigma=200, stop_mix=None, throttle_rate=0.0, seed=None):
+        self.ttft_median = ttft_median
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens_mean = output_tokens_mean
+        self.output_tokens_sigma = output_tokens_sigma
+        self.stop_mix = stop_mix or {"end_turn": 1.0}
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "streaming": 0, "throttled": 0, "stop_reasons": {}, "output_tokens": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bedrock-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, stop_reasons=dict(self._stats["stop_reasons"]))
+
+    def plan_response(self, request_body):
+        """요청 하나의 (스로틀링 여부, stopReason, 출력 토큰 수, 첫 토큰 지연, 입력 토큰 수)"""
+        max_tokens = request_body.get("inferenceConfig", {}).get("maxTokens", 1000)
+        input_chars = sum(
+            len(block.get("text", ""))
+            for message in request_body.get("messages", [])
+            for block in message.get("content", [])
+        )
+        with self._lock:
+            throttled = self._random.random() < self.throttle_rate
+            reasons, weights = zip(*self.stop_mix.items())
+            stop_reason = self._random.choices(reasons, weights=weights)[0]
+            if stop_reason == "max_tokens":
+                output_tokens = max_tokens
+            else:
+                sampled = int(self._random.gauss(self.output_tokens_mean, self.output_tokens_sigma))
+                output_tokens = max(1, min(sampled, max_tokens - 1))
+            ttft = self.ttft_median * math.exp(self._random.gauss(0, self.ttft_sigma))
+
+            self._stats["requests"] += 1
+            if throttled:
+                self._stats["throttled"] += 1
+            else:
+                self._stats["stop_reasons"][stop_reason] = self._stats["stop_reasons"].get(stop_reason, 0) + 1
+                self._stats["output_tokens"] += output_tokens
+        return throttled, stop_reason, output_tokens, ttft, input_chars // 2
+
+    def record_streaming(self):
+        with self._lock:
+            self._stats["streaming"] += 1
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                match = re.fullmatch(r"/model/([^/]+)/(invoke|invoke-with-response-stream)", self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not match:
+                    self._send_error(404, "UnknownOperationException", "Unknown operation")
+                    return
+                try:
+                    request_body = json.loads(body)
+                except ValueError:
+                    self._send_error(400, "ValidationException", "Malformed input request")
+                    return
+
+                throttled, stop_reason, output_tokens, ttft, input_tokens = stub.plan_response(request_body)
+                if throttled:
+                    self._send_error(429, "ThrottlingException", "Too many requests, please wait before trying again.")
+                    return
+
+                text = (FILLER_SENTENCE * (output_tokens * 2 // len(FILLER_SENTENCE) + 1))[:output_tokens * 2]
+                usage = {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": input_tokens + output_tokens}
+                if match.group(2) == "invoke":
+                    time.sleep(ttft + output_tokens / stub.tokens_per_second)
+                    self._send_json(200, {
+                        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+                        "stopReason": stop_reason,
+                        "usage": usage
+                    })
+                else:
+                    stub.record_streaming()
+                    self._send_stream(text, stop_reason, usage, ttft)
+
+            def _send_stream(self, text, stop_reason, usage, ttft):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/vnd.amazon.eventstream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(ttft)
+
+                events = [{"messageStart": {"role": "assistant"}}]
+                chunk_chars = STREAM_CHUNK_TOKENS * 2
+                for index in range(0, len(text), chunk_chars):
+                    events.append({"contentBlockDelta": {"delta": {"text": text[index:index + chunk_chars]}, "contentBlockIndex": 0}})
+                events += [
+                    {"contentBlockStop": {"contentBlockIndex": 0}},
+                    {"messageStop": {"stopReason": stop_reason}},
+                    {"metadata": {"usage": usage}}
+                ]
+                for event in events:
+                    if "contentBlockDelta" in event:
+                        time.sleep(STREAM_CHUNK_TOKENS / stub.tokens_per_second)
+                    self._write_chunk(encode_chunk_event(event))
+                self._write_chunk(b"")
+
+            def _write_chunk(self, data):
+                # HTTP/1.1 chunked 전송 인코딩 (빈 조각은 본문 끝)
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status, data, headers=None):
+                payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_error(self, status, code, message):
+                self._send_json(status, {"message": message}, {"x-amzn-ErrorType": code})
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 bedrock-runtime 대역 서버를 실행합니다.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft-median", type=float, default=0.4, help="첫 토큰 지연 중앙값 (초)")
+    parser.add_argument("--ttft-sigma", type=float, default=0.5, help="첫 토큰 지연 로그 정규 분포의 시그마")
+    parser.add_argument("--tokens-per-second", type=float, default=120.0)
+    parser.add_argument("--output-tokens-mean", type=int, default=700)
+    parser.add_argument("--output-tokens-sigma", type=int, default=200)
+    parser.add_argument("--stop-mix", default="end_turn=0.9,max_tokens=0.1", help="stopReason 비율 (기본값: end_turn=0.9,max_tokens=0.1)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="ThrottlingException으로 응답할 비율")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = BedrockStubServer(
+        args.host, args.port, args.ttft_median, args.ttft_sigma, args.tokens_per_second,
+        args.output_tokens_mean, args.output_tokens_sigma, parse_stop_mix(args.stop_mix), args.throttle_rate, args.seed
+    )
+    print(f"🧪 bedrock-runtime 대역 서버 실행 중: {server.endpoint_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
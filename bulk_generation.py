@@ -0,0 +1,243 @@
+"""여러 팀의 브리프로 해커톤 아이디어를 한 번에 생성하는 대량 생성 모드
+
+Streamlit 탭에서 사용하거나 다음처럼 헤드리스 CLI로 실행할 수 있습니다.
+
+    python bulk_generation.py briefs.csv -o ideas.jsonl --concurrency 8
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from hackathon_generator import get_bedrock_client, get_job_queue, build_idea_request, generate_with_routing, record_idea_usage
+from job_queue import BULK_POOL
+
+# 브리프 한 행을 구성하는 입력 필드
+BRIEF_FIELDS = ["problem_area", "target_problem", "ai_technology", "target_users", "expected_impact", "idea_length"]
+
+# 웹 화면에서 시작한 대량 생성 결과를 쓰는 디렉터리 (파일 이름만 입력받아 이 안에만 씀)
+BULK_OUTPUT_DIR = os.environ.get("BULK_OUTPUT_DIR", "bulk_outputs")
+
+
+def parse_briefs(text, file_format):
+    """CSV 또는 JSONL 텍스트를 브리프 목록으로 변환
+
+    각 브리프에는 재시작 시 이어서 처리할 수 있도록 brief_id가 붙습니다.
+    'id' 열이 있으면 그 값을, 없으면 행 번호를 사용합니다.
+    """
+    if file_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    elif file_format == "jsonl":
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {file_format}")
+
+    briefs = []
+    for index, row in enumerate(rows, start=1):
+        missing = [field for field in BRIEF_FIELDS[:-1] if not str(row.get(field) or "").strip()]
+        if missing:
+            raise ValueError(f"{index}번째 행에 필수 필드가 없습니다: {', '.join(missing)}")
+
+        brief = {field: str(row.get(field) or "").strip() for field in BRIEF_FIELDS}
+        brief["idea_length"] = brief["idea_length"] or "보통"
+        brief["brief_id"] = str(row.get("id") or f"row-{index}")
+        briefs.append(brief)
+    return briefs
+
+
+def read_briefs(path):
+    """파일 확장자(.csv/.jsonl)에 맞춰 브리프 파일을 읽음"""
+    file_format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return parse_briefs(f.read(), file_format)
+
+
+def load_completed_ids(output_path, id_field="brief_id"):
+    """이미 성공한 브리프 ID 집합 (실패한 항목은 재시작 시 다시 처리, id_field로 ID 필드 지정)"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 중단 시점에 잘린 마지막 줄은 무시
+                continue
+            if record.get("status") == "ok":
+                completed.add(record.get(id_field))
+    return completed
+
+
+def generate_brief(bedrock_client, brief, max_retries=4):
+    """브리프 하나를 생성 (대량 작업 우선순위로 호출 속도 조절기를 거치며 스로틀링 시 재시도)"""
+    prompt_prefix, prompt, inference_config, _ = build_idea_request(
+        brief["problem_area"], brief["target_problem"], brief["ai_technology"],
+        brief["target_users"], brief["expected_impact"], brief["idea_length"]
+    )
+    start_time = time.perf_counter()
+    result = generate_with_routing(
+        bedrock_client, brief["idea_length"], prompt, inference_config,
+        priority="bulk", max_retries=max_retries, label="idea", prompt_prefix=prompt_prefix
+    )
+    record_idea_usage(brief["idea_length"], inference_config, result)
+
+    return {
+        "generated_content": result["text"],
+        "stop_reason": result["stop_reason"],
+        "usage": result["usage"],
+        "continuation_rounds": result["continuation_rounds"],
+        "cache_hit": result["cache_hit"],
+        "model_id": result["model_id"],
+        "latency": time.perf_counter() - start_time,
+        "queue_wait": result["queue_wait"],
+        "attempts": result["attempts"]
+    }
+
+
+def percentile(values, fraction):
+    """정렬된 값에서 최근접 순위 방식으로 백분위수 계산"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_results(records, elapsed_seconds):
+    """처리량(아이디어/분), p50/p95 지연 시간, 토큰 사용량 요약"""
+    succeeded = [record for record in records if record["status"] == "ok"]
+    latencies = [record["latency"] for record in succeeded]
+    # 캐시에서 반환된 결과는 실제로 토큰을 쓰지 않았으므로 사용량에서 제외
+    billed = [record for record in succeeded if not record.get("cache_hit")]
+    minutes = elapsed_seconds / 60 if elapsed_seconds > 0 else 0
+
+    return {
+        "succeeded": len(succeeded),
+        "failed": len(records) - len(succeeded),
+        "elapsed_seconds": elapsed_seconds,
+        "ideas_per_minute": len(succeeded) / minutes if minutes else 0.0,
+        "p50_latency": percentile(latencies, 0.50),
+        "p95_latency": percentile(latencies, 0.95),
+        "input_tokens": sum((record.get("usage") or {}).get("inputTokens", 0) for record in billed),
+        "output_tokens": sum((record.get("usage") or {}).get("outputTokens", 0) for record in billed),
+        "retries": sum(
+            max(record.get("attempts", 1) - 1 - record.get("continuation_rounds", 0), 0) for record in records
+        )
+    }
+
+
+def run_bulk(briefs, output_path, concurrency=4, max_retries=4, on_result=None):
+    """브리프를 제한된 스레드 풀로 생성하고 완료되는 대로 JSONL에 기록
+
+    출력 파일에 이미 성공으로 기록된 브리프는 건너뛰므로 중단 후 같은 명령으로
+    다시 실행하면 이어서 처리됩니다. on_result(record, done, total)는 호출한
+    스레드에서 결과가 나올 때마다 불립니다.
+    """
+    bedrock_client = get_bedrock_client()
+    if not bedrock_client:
+        raise RuntimeError("AWS Bedrock 연결에 실패했습니다.")
+
+    completed_ids = load_completed_ids(output_path)
+    pending = [brief for brief in briefs if brief["brief_id"] not in completed_ids]
+    write_lock = threading.Lock()
+    records = []
+    start_time = time.perf_counter()
+
+    with open(output_path, 'a', encoding='utf-8') as output_file, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(generate_brief, bedrock_client, brief, max_retries): brief
+            for brief in pending
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            brief = futures[future]
+            record = dict(brief, completed_at=datetime.now().isoformat(timespec='seconds'))
+            try:
+                record.update(future.result(), status="ok")
+            except Exception as e:
+                record.update(status="error", error=str(e), latency=0.0)
+
+            # 완료 즉시 한 줄씩 기록하여 중단되어도 결과가 남도록 함
+            with write_lock:
+                output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output_file.flush()
+
+            records.append(record)
+            if on_result:
+                on_result(record, done, len(pending))
+
+    summary = summarize_results(records, time.perf_counter() - start_time)
+    summary["skipped"] = len(briefs) - len(pending)
+    return summary
+
+
+def bulk_output_path(file_name):
+    """웹에서 입력받은 결과 파일 이름을 BULK_OUTPUT_DIR 안의 경로로 변환
+
+    경로 구분자나 '..'가 들어 있으면 다른 위치의 파일을 덮어쓰거나 내려받을 수 있으므로 ValueError.
+    """
+    file_name = file_name.strip()
+    if not file_name:
+        raise ValueError("결과 파일 이름을 입력해주세요.")
+    if "/" in file_name or "\\" in file_name or ".." in file_name or file_name != os.path.basename(file_name):
+        raise ValueError("결과 파일 이름에는 경로(/, \\, ..)를 쓸 수 없습니다.")
+    os.makedirs(BULK_OUTPUT_DIR, exist_ok=True)
+    return os.path.join(BULK_OUTPUT_DIR, file_name)
+
+
+def submit_bulk_job(briefs, output_path, concurrency=4, max_retries=4):
+    """대량 생성을 백그라운드 작업으로 등록하고 작업 ID 반환 (결과는 {"summary", "output_path"})"""
+    def run(job):
+        def show_progress(record, done, total):
+            status = "✅" if record["status"] == "ok" else "❌"
+            job.report(done / total, f"{status} {record['brief_id']} 완료 ({done}/{total})")
+
+        summary = run_bulk(briefs, output_path, concurrency, max_retries, show_progress)
+        return {"summary": summary, "output_path": output_path}
+
+    return get_job_queue().submit("bulk", run, pool=BULK_POOL)
+
+
+def format_summary(summary):
+    """요약을 사람이 읽기 쉬운 여러 줄 문자열로 변환"""
+    def seconds(value):
+        return f"{value:.2f}초" if value is not None else "-"
+
+    return "\n".join([
+        f"✅ 성공: {summary['succeeded']}건 · ❌ 실패: {summary['failed']}건 · ⏭️ 건너뜀: {summary['skipped']}건",
+        f"⏱️ 전체 소요 시간: {summary['elapsed_seconds']:.1f}초 · 처리량: {summary['ideas_per_minute']:.1f}개/분",
+        f"📈 지연 시간 p50: {seconds(summary['p50_latency'])} · p95: {seconds(summary['p95_latency'])}",
+        f"🔢 토큰 사용량: 입력 {summary['input_tokens']:,} · 출력 {summary['output_tokens']:,} · 재시도 {summary['retries']}회"
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/JSONL 브리프 파일로 해커톤 아이디어를 대량 생성합니다.")
+    parser.add_argument("briefs", help="브리프 파일 경로 (.csv 또는 .jsonl)")
+    parser.add_argument("-o", "--output", default="bulk_ideas.jsonl", help="결과 JSONL 경로 (기본값: bulk_ideas.jsonl)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="동시 호출 수 (기본값: 4)")
+    parser.add_argument("--max-retries", type=int, default=4, help="스로틀링 시 최대 재시도 횟수 (기본값: 4)")
+    args = parser.parse_args(argv)
+
+    briefs = read_briefs(args.briefs)
+
+    def report(record, done, total):
+        status = "✅" if record["status"] == "ok" else f"❌ {record.get('error')}"
+        print(f"[{done}/{total}] {record['brief_id']} {status}", flush=True)
+
+    summary = run_bulk(briefs, args.output, args.concurrency, args.max_retries, report)
+    print(format_summary(summary))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
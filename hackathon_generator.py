@@ -0,0 +1,1398 @@
+import streamlit as st
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime
+from botocore.exceptions import ClientError
+from response_cache import ResponseCache, make_cache_key
+from single_flight import SingleFlight
+from rate_governor import RateGovernor, is_throttling_error
+from token_budget import TokenBudgetEstimator
+from model_router import ModelRouter
+from bedrock_pool import BEDROCK_REGIONS, BedrockClientPool, parse_region_specs
+from job_queue import JobQueue
+from artifact_store import ArtifactStore, make_input_hash
+from similarity_index import SimilarityIndex
+from speculative_store import SpeculativeStore
+from session_store import SessionResultStore
+from idea_ranking import rank_candidates
+from prd_sections import (
+    PRD_SECTION_HEADINGS, PRD_SECTIONS, PRD_TITLE_KEY, changed_idea_sections, dependent_prd_sections,
+    replace_prd_sections, split_prd_sections
+)
+from telemetry import (
+    METRICS_PORT, OTEL_SPANS_ENABLED, OpenTelemetrySpans, PrometheusMetrics, opentelemetry_available,
+    start_metrics_server
+)
+from idea_sections import (
+    IDEA_SECTIONS, OUTLINE_SECTION_KEYS, IdeaSectionParser, assemble_idea_sections, find_overlong_sections,
+    replace_section_bodies, section_char_limit, split_idea_sections
+)
+from nova_engine import (
+    InvocationStats, PromptCacheStats, add_metrics_hook,
+    generate_with_continuation, measure, metrics_context
+)
+
+logger = logging.getLogger(__name__)
+
+# 호출 메트릭 수집기 초기화 (모든 세션이 공유)
+@st.cache_resource
+def get_invocation_stats():
+    stats = InvocationStats()
+    add_metrics_hook(stats)
+    return stats
+
+# 정적 프롬프트 앞부분의 캐시 효과 수집기 (모든 세션이 공유)
+@st.cache_resource
+def get_prompt_cache_stats():
+    stats = PromptCacheStats()
+    add_metrics_hook(stats)
+    return stats
+
+# AWS Bedrock 클라이언트 초기화 (BEDROCK_REGIONS의 리전별 클라이언트를 묶은 풀)
+@st.cache_resource
+def get_bedrock_client():
+    try:
+        return BedrockClientPool(parse_region_specs(BEDROCK_REGIONS))
+    except Exception as e:
+        st.error(f"AWS Bedrock 클라이언트 초기화 실패: {e}")
+        return None
+
+# 응답 캐시 초기화 (모든 세션이 공유)
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(os.path.join(os.getcwd(), ".bedrock_response_cache.sqlite3"))
+
+# 동일한 진행 중 요청 합치기 (모든 세션이 공유)
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
+
+# 길이 옵션별 토큰 예산 추정기 (모든 세션이 공유)
+@st.cache_resource
+def get_token_budget_estimator():
+    return TokenBudgetEstimator(os.path.join(os.getcwd(), ".token_budget.sqlite3"))
+
+# Bedrock 호출 속도 제한 (계정의 모델별 할당량에 맞춰 조정)
+BEDROCK_REQUESTS_PER_MINUTE = 100
+BEDROCK_TOKENS_PER_MINUTE = 200000
+
+# 모든 세션이 공유하는 호출 속도 조절기
+@st.cache_resource
+def get_rate_governor():
+    return RateGovernor(BEDROCK_REQUESTS_PER_MINUTE, BEDROCK_TOKENS_PER_MINUTE)
+
+# 백그라운드 작업 스레드 수 (대화형 아이디어/PRD 작업, 대량/배치 작업)
+JOB_WORKERS = 8
+BULK_JOB_WORKERS = 2
+
+# 스크립트 재실행과 무관하게 생성 작업을 실행하는 백그라운드 작업 대기열 (모든 세션이 공유)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(JOB_WORKERS, BULK_JOB_WORKERS)
+
+# 생성한 아이디어/PRD 기록 저장소 (모든 세션이 공유)
+@st.cache_resource
+def get_artifact_store():
+    return ArtifactStore(os.path.join(os.getcwd(), ".artifacts.sqlite3"))
+
+# 비슷한 이전 아이디어로 안내할 입력 유사도 기준 (글자 3-gram 자카드 유사도 추정값)
+IDEA_SIMILARITY_THRESHOLD = 0.75
+
+# 아이디어 입력의 유사도 색인 (모든 세션이 공유)
+@st.cache_resource
+def get_similarity_index():
+    index = SimilarityIndex(os.path.join(os.getcwd(), ".similarity_index.sqlite3"))
+    # 색인보다 먼저 기록된 아이디어는 화면을 막지 않도록 백그라운드에서 채움
+    threading.Thread(target=backfill_similarity_index, args=(index,), name="similarity-backfill", daemon=True).start()
+    return index
+
+def backfill_similarity_index(index):
+    try:
+        for artifact_id, inputs in get_artifact_store().iter_inputs("idea", index.max_item_id()):
+            index.add(artifact_id, idea_similarity_text(inputs))
+    except sqlite3.Error:
+        pass
+
+# 세션 결과 저장소 한도: 메모리에 둘 압축 본문 합계, 디스크로 내리기까지의 유휴 시간(초), 디스크 보관 시간(초)
+SESSION_STORE_MEMORY_BUDGET = int(os.environ.get("SESSION_STORE_MEMORY_MB", "64")) * 1024 * 1024
+SESSION_STORE_IDLE_SECONDS = 30 * 60
+SESSION_STORE_DISK_TTL_SECONDS = 24 * 60 * 60
+
+# 세션별 아이디어/PRD 본문을 압축해 보관하는 저장소 (session_state에는 핸들만 둠, 모든 세션이 공유)
+@st.cache_resource
+def get_session_store():
+    return SessionResultStore(
+        os.path.join(os.getcwd(), ".session_spill"), SESSION_STORE_MEMORY_BUDGET,
+        SESSION_STORE_IDLE_SECONDS, SESSION_STORE_DISK_TTL_SECONDS
+    )
+
+# 요청별 모델 선택기 (모든 세션이 공유하며 호출 지연 시간을 모델별로 기록)
+@st.cache_resource
+def get_model_router():
+    router = ModelRouter()
+    add_metrics_hook(router)
+    return router
+
+# Prometheus 메트릭 수집기 (모든 세션이 공유, METRICS_PORT를 지정하면 /metrics 서버도 시작)
+@st.cache_resource
+def get_telemetry():
+    metrics = PrometheusMetrics()
+    metrics.add_gauge_collector(collect_runtime_gauges)
+    add_metrics_hook(metrics)
+    if OTEL_SPANS_ENABLED and opentelemetry_available():
+        add_metrics_hook(OpenTelemetrySpans())
+    if METRICS_PORT:
+        try:
+            start_metrics_server(metrics, port=METRICS_PORT)
+        except OSError as e:
+            # 다른 프로세스가 이미 포트를 쓰고 있어도 앱은 계속 동작
+            logger.warning("메트릭 서버를 시작하지 못했습니다 (포트 %s): %s", METRICS_PORT, e)
+    return metrics
+
+def collect_runtime_gauges():
+    """수집 시점의 호출 속도 조절기/작업 대기열/리전 상태 게이지"""
+    governor = get_rate_governor().status()
+    gauges = [("nova_governor_estimated_wait_seconds", {}, governor["estimated_wait"])]
+    for priority, depth in governor["queue_depth_by_priority"].items():
+        gauges.append(("nova_governor_queue_depth", {"priority": priority}, depth))
+    for status, count in get_job_queue().stats().items():
+        gauges.append(("nova_jobs", {"status": status}, count))
+    speculative = get_speculative_store().stats()
+    for outcome in ("started", "claimed", "claimed_in_flight", "misses", "expired", "rejected"):
+        gauges.append(("nova_speculative_prd", {"outcome": outcome}, speculative[outcome]))
+    gauges.append(("nova_speculative_prd_entries", {}, speculative["entries"]))
+    sessions = get_session_store().stats()
+    for tier in ("memory", "disk", "raw"):
+        gauges.append(("nova_session_store_bytes", {"tier": tier}, sessions[f"{tier}_bytes"]))
+    gauges.append(("nova_session_store_sessions", {}, sessions["session_count"]))
+    return gauges
+
+def generate_with_cache(bedrock_client, model_id, prompt, inference_config, on_chunk=None, fresh=False, priority="interactive", max_retries=None, label=None, prompt_prefix=None):
+    """동일한 프롬프트/모델/설정의 응답은 캐시에서 반환하고, 없으면 생성 후 저장
+
+    fresh=True이면 캐시를 건너뛰고 새 샘플을 생성한 뒤 그 결과로 캐시를 갱신합니다.
+    같은 요청이 이미 다른 세션에서 진행 중이면 업스트림 호출 하나의 결과를 공유합니다.
+    prompt_prefix는 prompt 앞에 붙는 정적 부분으로, Bedrock 프롬프트 캐싱 대상이 됩니다.
+    """
+    get_invocation_stats()  # 호출 메트릭 훅이 등록되어 있도록 보장
+    get_prompt_cache_stats()
+    get_telemetry()
+    response_cache = get_response_cache()
+    cache_key = make_cache_key(model_id, (prompt_prefix or "") + prompt, inference_config)
+    
+    if not fresh:
+        with measure(label, "cache_lookup") as event:
+            cached = response_cache.get(cache_key)
+            event["cache_hit"] = cached is not None
+        if cached is not None:
+            if on_chunk:
+                on_chunk(cached["text"])
+            return dict(cached, ttft=0.0, latency=0.0, queue_wait=0.0, attempts=0, cache_hit=True, shared=False)
+    
+    def call_upstream(publish):
+        # 리더의 스트리밍 조각을 같은 요청을 기다리는 다른 세션에도 전달
+        def forward(text):
+            publish(text)
+            on_chunk(text)
+        
+        result = generate_with_continuation(
+            bedrock_client, model_id, prompt, inference_config, forward if on_chunk else None,
+            get_rate_governor(), priority, max_retries, label, prompt_prefix
+        )
+        
+        # 내용이 있는 응답만 저장 (지연 시간은 호출마다 다르므로 제외)
+        if result["text"].strip():
+            response_cache.set(cache_key, {
+                "text": result["text"],
+                "stop_reason": result["stop_reason"],
+                "usage": result["usage"],
+                "continuation_rounds": result["continuation_rounds"]
+            })
+        return result
+    
+    # 같은 키로 이미 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 기다림
+    start_time = time.perf_counter()
+    result, shared = get_single_flight().do(cache_key, call_upstream, on_chunk)
+    
+    if shared:
+        waited = time.perf_counter() - start_time
+        if on_chunk:
+            on_chunk(result["text"])
+        ttft = min(result["ttft"], waited) if result["ttft"] is not None else None
+        return dict(result, ttft=ttft, latency=waited, cache_hit=False, shared=True)
+    
+    return dict(result, cache_hit=False, shared=False)
+
+def generate_with_routing(bedrock_client, route_key, prompt, inference_config, on_chunk=None, fresh=False, priority="interactive", max_retries=None, label=None, prompt_prefix=None):
+    """라우터가 고른 모델로 generate_with_cache를 호출하고, 스로틀링되면 다음 후보 모델로 대체
+
+    route_key는 길이 옵션(간단/보통/상세) 또는 "prd"입니다. 대체 모델이 남아 있는 동안은
+    스로틀링 재시도 없이 바로 다음 모델로 넘어가고, 마지막 후보만 max_retries만큼 재시도합니다.
+    결과에는 실제 사용한 model_id와 라우팅 이유(routing_reason)가 추가됩니다.
+    """
+    router = get_model_router()
+    decision = router.route(route_key, len(prompt_prefix or "") + len(prompt))
+    models = decision["models"]
+    # 아이디어 호출은 route_key가 길이 옵션이므로 이 호출의 측정 이벤트에 idea_length로 기록
+    # (route_key도 함께 기록하여 라우터가 요청 종류별로 지연 시간을 나눠 봄)
+    idea_length = route_key if route_key in LENGTH_SETTINGS else ""
+    
+    for index, model_id in enumerate(models):
+        is_last = index == len(models) - 1
+        try:
+            with metrics_context(idea_length=idea_length, route_key=route_key):
+                result = generate_with_cache(
+                    bedrock_client, model_id, prompt, inference_config, on_chunk, fresh,
+                    priority, max_retries if is_last else 0, label, prompt_prefix
+                )
+        except ClientError as e:
+            if not is_throttling_error(e):
+                raise
+            router.record_throttle(model_id)
+            if is_last:
+                raise
+            router.record_fallback(model_id, models[index + 1])
+            continue
+        return dict(result, model_id=model_id, routing_reason=decision["reason"] if index == 0 else "fallback")
+
+def region_health_report():
+    """리전별 회로 차단기 상태와 최근 오류율/스로틀링 비율/지연 시간"""
+    bedrock_client = get_bedrock_client()
+    return bedrock_client.status() if isinstance(bedrock_client, BedrockClientPool) else []
+
+def model_routing_report():
+    """모델별 지연 시간 히스토그램과 라우팅 결정/대체 호출 기록"""
+    return get_model_router().report()
+
+def session_store_report():
+    """세션별 결과 저장소 사용량 (메모리 사용량이 큰 세션부터)"""
+    sessions = get_session_store().stats()["sessions"]
+    rows = [dict(usage, session_id=session_id) for session_id, usage in sessions.items()]
+    return sorted(rows, key=lambda row: row["memory_bytes"], reverse=True)
+
+def show_engine_debug_info():
+    """생성기별 누적 호출 통계와 응답 캐시/요청 합치기 카운터를 디버깅용으로 표시"""
+    for label, stats in get_invocation_stats().snapshot().items():
+        st.write(
+            f"**{label} 호출 통계:** {stats['calls']}회 (오류 {stats['errors']}회) · "
+            f"평균 {stats['average_latency']:.2f}초 / 최대 {stats['max_latency']:.2f}초 · "
+            f"토큰 입력 {stats['input_tokens']:,} / 출력 {stats['output_tokens']:,} · "
+            f"종료 이유 {stats['stop_reasons']}"
+        )
+    stats = get_response_cache().stats()
+    flight_stats = get_single_flight().stats()
+    st.write(
+        f"**요청 합치기 통계:** 업스트림 호출 {flight_stats['leaders']}회 · "
+        f"공유된 요청 {flight_stats['followers']}회 · 진행 중 {flight_stats['in_flight']}건"
+    )
+    st.write(
+        f"**캐시 통계:** 메모리 적중 {stats['memory_hits']}회 · 디스크 적중 {stats['disk_hits']}회 · "
+        f"미스 {stats['misses']}회 · 적중률 {stats['hit_rate']:.0%} · "
+        f"항목 수 (메모리 {stats['memory_entries']} / 디스크 {stats['disk_entries']})"
+    )
+    cache_stats = get_prompt_cache_stats().snapshot()
+    if cache_stats["calls"]:
+        st.write(
+            f"**프롬프트 캐시:** 캐시 읽기 {cache_stats['cache_read_tokens']:,} / 쓰기 {cache_stats['cache_write_tokens']:,} 토큰 · "
+            f"캐싱 미지원 모델의 재사용 가능 앞부분 {cache_stats['local_reusable_tokens']:,} 토큰 (추정) · "
+            f"입력 토큰 절약 비율 {cache_stats['saved_ratio']:.0%}"
+        )
+    sessions = get_session_store().stats()
+    if sessions["items"]:
+        st.write(
+            f"**세션 결과 저장소:** 세션 {sessions['session_count']}개 · 항목 {sessions['items']}개 · "
+            f"메모리 {sessions['memory_bytes'] / 1024:,.1f} KB / 예산 {sessions['memory_budget_bytes'] / 1024 / 1024:,.0f} MB · "
+            f"디스크 {sessions['disk_bytes'] / 1024:,.1f} KB · 압축 전 {sessions['raw_bytes'] / 1024:,.1f} KB "
+            f"({sessions['codec']} 압축률 {sessions['compression_ratio']:.0%})"
+        )
+    speculative = speculative_stats_report()
+    if speculative["started"]:
+        st.write(
+            f"**PRD 미리 생성:** 시작 {speculative['started']}회 · 사용 {speculative['claimed']}회 "
+            f"(진행 중 사용 {speculative['claimed_in_flight']}회, 적중률 {speculative['hit_rate']:.0%}) · "
+            f"만료 {speculative['expired']}회 · 예산 초과로 건너뜀 {speculative['rejected']}회"
+        )
+
+# 길이 옵션에 따른 기본 설정 (한국어 특성 고려하여 토큰 수 증가)
+LENGTH_SETTINGS = {
+    "간단": {
+        "char_limit": 800,
+        "max_tokens": 1000,  # 800자 × 1.25 (한국어 여유분)
+        "sections": {
+            "title": "10자 이내",
+            "overview": "80자 이내",
+            "problem": "60자 이내", 
+            "ai_tech": "80자 이내",
+            "users": "40자 이내",
+            "features": "120자 이내, 3개 기능",
+            "impact": "80자 이내",
+            "tech_stack": "60자 이내",
+            "test_plan": "60자 이내",
+            "expansion": "60자 이내"
+        }
+    },
+    "보통": {
+        "char_limit": 1500,
+        "max_tokens": 2000,  # 1500자 × 1.33 (한국어 여유분)
+        "sections": {
+            "title": "20자 이내",
+            "overview": "150자 이내",
+            "problem": "100자 이내",
+            "ai_tech": "150자 이내",
+            "users": "80자 이내", 
+            "features": "200자 이내, 3-4개 기능",
+            "impact": "150자 이내",
+            "tech_stack": "100자 이내",
+            "test_plan": "120자 이내",
+            "expansion": "100자 이내"
+        }
+    },
+    "상세": {
+        "char_limit": 2500,
+        "max_tokens": 3200,  # 2500자 × 1.28 (한국어 여유분)
+        "sections": {
+            "title": "30자 이내",
+            "overview": "250자 이내",
+            "problem": "200자 이내",
+            "ai_tech": "300자 이내",
+            "users": "150자 이내",
+            "features": "400자 이내, 4-5개 기능",
+            "impact": "250자 이내",
+            "tech_stack": "200자 이내",
+            "test_plan": "200자 이내",
+            "expansion": "200자 이내"
+        }
+    }
+}
+
+# 길이 옵션마다 고정된 지시/구조를 앞에 두어 프롬프트 캐싱이 가능하도록 하고, 입력 정보는 뒤에 붙임
+IDEA_PROMPT_PREFIX_TEMPLATE = """
+당신은 지속가능한 세상을 위한 리빙랩 해커톤의 전문 멘토입니다. 마지막에 주어지는 입력 정보를 바탕으로 창의적이고 실현 가능한 해커톤 아이디어를 체계적으로 정리해주세요.
+
+**중요**: 각 섹션은 간결하고 핵심적인 내용으로 작성해주세요. 전체 응답은 {char_limit}자 이내로 제한합니다.
+
+다음 구조로 해커톤 아이디어를 정리해주세요:
+
+## 🎯 프로젝트 제목
+({title}의 창의적이고 임팩트 있는 프로젝트명)
+
+## 📋 프로젝트 개요 ({overview})
+프로젝트의 핵심 내용과 목적을 간단명료하게 설명
+
+## 🌍 해결 문제 ({problem})
+구체적인 문제 정의와 현재 상황을 설명
+
+## 🤖 AI 기술 활용 ({ai_tech})
+어떤 AI 기술을 어떻게 활용할지 구체적으로 설명
+
+## 👥 타겟 사용자 ({users})
+주요 사용자와 이해관계자를 나열
+
+## 💡 핵심 기능 ({features})
+주요 기능을 간단한 문장으로 나열
+- 기능 1: (한 줄 설명)
+- 기능 2: (한 줄 설명)
+- 기능 3: (한 줄 설명)
+
+## 🎊 기대 효과 ({impact})
+지속가능성 측면에서의 기대효과를 구체적 수치나 결과로 설명
+
+## 🛠️ 기술 스택 ({tech_stack})
+개발에 필요한 핵심 기술들을 나열
+
+## 📊 실증 계획 ({test_plan})
+실제 환경에서의 테스트 방법을 설명
+
+## 🚀 확장 가능성 ({expansion})
+향후 발전 방향을 설명
+
+한국어로 작성하며, 각 섹션은 지정된 글자 수를 엄격히 준수해주세요. 실현 가능하면서도 혁신적인 아이디어로 구성해주세요.
+"""
+
+IDEA_INPUT_TEMPLATE = """
+입력 정보:
+- 문제 영역: {problem_area}
+- 해결하고자 하는 문제: {target_problem}
+- 활용할 AI 기술: {ai_technology}
+- 타겟 사용자: {target_users}
+- 기대 효과: {expected_impact}
+"""
+
+# 요청마다 다시 만들지 않도록 불러올 때 한 번만 구성하는 길이 옵션별 값
+IDEA_PROMPT_PREFIXES = {
+    idea_length: IDEA_PROMPT_PREFIX_TEMPLATE.format(char_limit=settings["char_limit"], **settings["sections"])
+    for idea_length, settings in LENGTH_SETTINGS.items()
+}
+SECTION_CHAR_LIMITS = {
+    idea_length: {key: section_char_limit(limit_text) for key, limit_text in settings["sections"].items()}
+    for idea_length, settings in LENGTH_SETTINGS.items()
+}
+
+# 화면에 표시하는 길이 옵션 안내
+LENGTH_INFO = {
+    idea_length: {
+        "chars": f"{LENGTH_SETTINGS[idea_length]['char_limit']:,}자",
+        "time": time_label,
+        "desc": desc,
+        "badge": f"{badge} ({LENGTH_SETTINGS[idea_length]['char_limit']:,}자)"
+    }
+    for idea_length, time_label, desc, badge in [
+        ("간단", "⚡ 빠름", "핵심만 간략히", "⚡ 간단형"),
+        ("보통", "⚖️ 균형", "적당한 상세도", "⚖️ 표준형"),
+        ("상세", "🔍 상세", "충분한 설명", "🔍 상세형")
+    ]
+}
+
+# 아이디어 입력의 문제 영역 선택지
+PROBLEM_AREAS = ["환경 보호", "에너지 효율", "폐기물 관리", "지속가능한 농업", "스마트 시티", "기후 변화 대응", "순환 경제", "친환경 교통", "수자원 관리", "생물 다양성 보전", "기타"]
+
+def build_idea_request(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통"):
+    """아이디어 생성용 정적 프롬프트 앞부분, 입력 프롬프트, inferenceConfig, 길이 설정을 구성"""
+    settings = LENGTH_SETTINGS[idea_length]
+    prompt_prefix = IDEA_PROMPT_PREFIXES[idea_length]
+    
+    prompt = IDEA_INPUT_TEMPLATE.format(
+        problem_area=problem_area,
+        target_problem=target_problem,
+        ai_technology=ai_technology,
+        target_users=target_users,
+        expected_impact=expected_impact
+    )
+    
+    inference_config = {
+        # 실제 사용 기록으로 보정한 값 (기록이 쌓이기 전에는 기본 max_tokens)
+        "maxTokens": get_token_budget_estimator().max_tokens_for(idea_length, settings["max_tokens"]),
+        "temperature": 0.7,
+        "topP": 0.9
+    }
+    
+    return prompt_prefix, prompt, inference_config, settings
+
+def record_idea_usage(idea_length, inference_config, result):
+    """실제 호출 결과의 토큰 사용량을 길이 옵션별 토큰 예산 기록에 추가"""
+    # 캐시/공유 결과는 새 호출이 아니므로 기록하지 않음
+    if result.get("cache_hit") or result.get("shared") or not result.get("usage"):
+        return
+    
+    estimator = get_token_budget_estimator()
+    estimator.record(
+        idea_length,
+        output_chars=len(result["text"]),
+        output_tokens=result["usage"].get("outputTokens", 0),
+        max_tokens=inference_config["maxTokens"],
+        truncated=result["continuation_rounds"] > 0,
+        completed=result["stop_reason"] != 'max_tokens',
+        predicted_tokens=estimator.predict_tokens(idea_length, LENGTH_SETTINGS[idea_length]["char_limit"])
+    )
+
+def token_budget_report():
+    """길이 옵션별 예측 토큰과 실제 토큰 비교 리포트"""
+    return get_token_budget_estimator().report(
+        {idea_length: settings["max_tokens"] for idea_length, settings in LENGTH_SETTINGS.items()}
+    )
+
+def record_artifact(kind, inputs, result):
+    """새로 생성한 결과를 기록 저장소에 남기고 기록 ID 반환
+
+    캐시에서 가져온 결과는 이미 기록되어 있으므로 같은 입력의 최신 기록 ID를 돌려줍니다.
+    기록 저장에 실패해도 생성 결과는 그대로 사용할 수 있도록 None을 반환합니다.
+    """
+    store = get_artifact_store()
+    try:
+        if result["cache_hit"] or result.get("shared"):
+            existing = store.find_by_input_hash(make_input_hash(kind, inputs), limit=1)
+            return existing[0]["id"] if existing else None
+        if not result["text"].strip():
+            return None
+        artifact_id = store.add(kind, inputs, result["text"], result.get("model_id"), result["usage"], {
+            "ttft": result["ttft"],
+            "latency": result["latency"],
+            "queue_wait": result["queue_wait"],
+            "continuation_rounds": result["continuation_rounds"]
+        })
+        if kind == "idea":
+            get_similarity_index().add(artifact_id, idea_similarity_text(inputs))
+        return artifact_id
+    except sqlite3.Error:
+        return None
+
+def idea_inputs(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length):
+    """아이디어 기록의 입력값 (입력 해시 계산에 쓰이므로 키 이름을 바꾸지 말 것)"""
+    return {
+        "problem_area": problem_area,
+        "target_problem": target_problem,
+        "ai_technology": ai_technology,
+        "target_users": target_users,
+        "expected_impact": expected_impact,
+        "idea_length": idea_length
+    }
+
+def idea_similarity_text(inputs):
+    """유사도 비교에 쓰는 아이디어 입력 텍스트 (자유 입력 필드만 사용, 길이 옵션은 제외)"""
+    return "\n".join(inputs.get(field, "") for field in ("target_problem", "expected_impact", "ai_technology", "target_users"))
+
+def find_similar_ideas(problem_area, target_problem, ai_technology, target_users, expected_impact, threshold=None, limit=3):
+    """입력이 비슷한 이전 아이디어 기록 [{"id", "similarity", "inputs", "created_at", "preview"}] (유사도 높은 순)
+
+    문제 영역이 같은 기록만 돌려주며, threshold를 생략하면 IDEA_SIMILARITY_THRESHOLD를 씁니다.
+    """
+    text = idea_similarity_text({
+        "target_problem": target_problem, "expected_impact": expected_impact,
+        "ai_technology": ai_technology, "target_users": target_users
+    })
+    store = get_artifact_store()
+    try:
+        matches = get_similarity_index().query(text, threshold or IDEA_SIMILARITY_THRESHOLD, limit * 2)
+        similar = []
+        for match in matches:
+            artifact = store.get(match["item_id"])
+            if artifact is None or artifact["inputs"].get("problem_area") != problem_area:
+                continue
+            similar.append({
+                "id": artifact["id"],
+                "similarity": match["similarity"],
+                "inputs": artifact["inputs"],
+                "created_at": artifact["created_at"],
+                "preview": artifact["content"][:200]
+            })
+        return similar[:limit]
+    except sqlite3.Error:
+        return []
+
+def find_past_ideas(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length, limit=5):
+    """같은 입력으로 만든 이전 아이디어 기록 요약 목록 (최신순)"""
+    inputs = idea_inputs(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length)
+    try:
+        return get_artifact_store().find_by_input_hash(make_input_hash("idea", inputs), limit)
+    except sqlite3.Error:
+        return []
+
+def reopen_artifact(artifact_id):
+    """기록을 다시 열어 session_state.current_idea/current_prd와 같은 형식으로 반환 (없으면 None)
+
+    아이디어는 {"generated_content", "idea_length", "metrics"}, PRD는 {"prd_content", "idea_content", "metrics"}입니다.
+    """
+    artifact = get_artifact_store().get(artifact_id)
+    if artifact is None:
+        return None
+    metrics = dict(artifact["timings"], usage=artifact["usage"], model_id=artifact["model_id"], artifact_id=artifact["id"], reopened=True)
+    if artifact["kind"] == "idea":
+        return {"generated_content": artifact["content"], "idea_length": artifact["inputs"].get("idea_length", "보통"), "metrics": metrics}
+    return {"prd_content": artifact["content"], "idea_content": artifact["inputs"].get("idea_content", ""), "metrics": metrics}
+
+def artifact_history(query="", kind=None, page=1, page_size=20):
+    """기록 저장소의 목록/검색 결과 페이지 (query가 비어 있으면 최신순 목록)"""
+    return get_artifact_store().search(query, kind, page, page_size)
+
+def build_section_request(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length, section_key, outline, previous_draft=None):
+    """섹션 하나만 작성하도록 요청하는 프롬프트와 섹션 글자 수에 맞춘 inferenceConfig 구성
+
+    previous_draft가 주어지면 글자 수를 넘은 초안을 제한 안으로 줄여 다시 쓰도록 요청합니다.
+    """
+    settings = LENGTH_SETTINGS[idea_length]
+    limit_text = settings["sections"][section_key]
+    _, heading, description = next(section for section in IDEA_SECTIONS if section[0] == section_key)
+    
+    prompt = f"""
+당신은 지속가능한 세상을 위한 리빙랩 해커톤의 전문 멘토입니다. 아래 해커톤 아이디어의 한 섹션만 작성해주세요.
+
+입력 정보:
+- 문제 영역: {problem_area}
+- 해결하고자 하는 문제: {target_problem}
+- 활용할 AI 기술: {ai_technology}
+- 타겟 사용자: {target_users}
+- 기대 효과: {expected_impact}
+
+아이디어 개요:
+{outline}
+
+작성할 섹션: {heading} ({limit_text})
+{description}
+
+섹션 헤더(##)는 쓰지 말고 본문만 한국어로 작성하며, 지정된 글자 수를 엄격히 준수해주세요.
+"""
+    
+    if previous_draft:
+        prompt += f"""
+아래 초안은 {len(previous_draft)}자로 제한({limit_text})을 넘었습니다. 핵심 내용은 유지하면서 제한 안으로 줄여 다시 작성해주세요.
+
+초안:
+{previous_draft}
+"""
+    
+    # 섹션 글자 수를 학습된 글자/토큰 비율로 환산하고 여유분을 더함 (기록이 없으면 1글자 = 1토큰)
+    chars_per_token = get_token_budget_estimator().chars_per_token(idea_length) or 1.0
+    char_limit = SECTION_CHAR_LIMITS[idea_length][section_key] or 200
+    max_tokens = int(math.ceil(char_limit / chars_per_token * 1.3 / 50) * 50) + 50
+    
+    return prompt, {"maxTokens": max_tokens, "temperature": 0.7, "topP": 0.9}
+
+def generate_idea_by_sections(bedrock_client, problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="상세", on_chunk=None, fresh=False, max_workers=8):
+    """공통 개요(제목/개요)를 먼저 생성한 뒤 나머지 섹션을 동시에 작은 호출로 생성하여 조립
+
+    긴 단일 디코딩 대신 섹션별 짧은 디코딩을 병렬로 실행하므로 전체 대기 시간이
+    가장 긴 섹션 하나의 시간에 가까워집니다. 결과는 generate_with_cache와 같은 형태입니다.
+    """
+    start_time = time.perf_counter()
+    inputs = (problem_area, target_problem, ai_technology, target_users, expected_impact)
+    
+    # 1단계: 제목과 개요만 담은 짧은 개요를 먼저 생성
+    outline_prefix, outline_prompt, outline_config, _ = build_idea_request(*inputs, idea_length)
+    outline_prompt += "\n\n**이번 응답에서는 위 구조 중 '🎯 프로젝트 제목'과 '📋 프로젝트 개요' 두 섹션만 작성해주세요.**\n"
+    outline_limit = sum(SECTION_CHAR_LIMITS[idea_length][key] or 0 for key in OUTLINE_SECTION_KEYS)
+    outline_config = dict(outline_config, maxTokens=max(200, outline_limit * 2))
+    outline_result = generate_with_routing(
+        bedrock_client, idea_length, outline_prompt, outline_config,
+        on_chunk, fresh, label="idea_section", prompt_prefix=outline_prefix
+    )
+    
+    outline_sections = split_idea_sections(outline_result["text"])
+    section_texts = {key: outline_sections.get(key, "") for key in OUTLINE_SECTION_KEYS}
+    if not any(section_texts.values()):
+        # 헤더 없이 답한 경우 전체를 개요로 사용
+        section_texts["overview"] = outline_result["text"].strip()
+    outline = assemble_idea_sections(section_texts)
+    if on_chunk:
+        on_chunk(outline)
+    
+    # 2단계: 나머지 섹션을 각자의 토큰 예산으로 동시에 생성
+    results = [outline_result]
+    section_latencies = {"outline": outline_result["latency"]}
+    remaining_keys = [key for key, _, _ in IDEA_SECTIONS if key not in OUTLINE_SECTION_KEYS]
+    
+    def generate_section(section_key):
+        prompt, inference_config = build_section_request(*inputs, idea_length, section_key, outline)
+        return generate_with_routing(
+            bedrock_client, idea_length, prompt, inference_config, fresh=fresh, label="idea_section"
+        )
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(generate_section, key): key for key in remaining_keys}
+        for future in as_completed(futures):
+            section_key = futures[future]
+            result = future.result()
+            results.append(result)
+            section_latencies[section_key] = result["latency"]
+            
+            # 모델이 헤더를 반복한 경우 제거
+            body = result["text"].strip()
+            if body.startswith("## "):
+                body = body.split("\n", 1)[1].strip() if "\n" in body else ""
+            section_texts[section_key] = body
+            
+            # 섹션이 완료될 때마다 조립된 부분 결과를 표시 (콜백은 호출한 스레드에서 실행)
+            if on_chunk:
+                on_chunk(assemble_idea_sections(section_texts))
+    
+    usage = {
+        key: sum((result["usage"] or {}).get(key, 0) for result in results)
+        for key in ("inputTokens", "outputTokens")
+    }
+    stop_reasons = [result["stop_reason"] for result in results]
+    
+    return {
+        "text": assemble_idea_sections(section_texts),
+        "stop_reason": 'max_tokens' if 'max_tokens' in stop_reasons else outline_result["stop_reason"],
+        "usage": usage,
+        "ttft": outline_result["ttft"],
+        "latency": time.perf_counter() - start_time,
+        "continuation_rounds": sum(result["continuation_rounds"] for result in results),
+        "queue_wait": max(result["queue_wait"] for result in results),
+        "attempts": sum(result["attempts"] for result in results),
+        "cache_hit": all(result["cache_hit"] for result in results),
+        "shared": False,
+        "model_id": outline_result["model_id"],
+        "routing_reason": outline_result["routing_reason"],
+        "section_latencies": section_latencies
+    }
+
+class SectionLimitEnforcer:
+    """섹션별 글자 수 제한을 검사하여 넘은 섹션만 다시 요청하고 본문을 교체
+
+    watch()로 감싼 콜백에 스트리밍 누적 텍스트를 넘기면 섹션이 끝나는 즉시 검사하여
+    생성이 끝나기 전에 재작성 요청을 시작하고, apply()에서 최종 텍스트의 초과 섹션을
+    모두 확인한 뒤 더 짧아진 재작성 결과로 해당 섹션 본문만 교체합니다.
+    """
+    
+    def __init__(self, bedrock_client, inputs, idea_length, fresh=False, max_workers=4):
+        self.bedrock_client = bedrock_client
+        self.inputs = inputs
+        self.idea_length = idea_length
+        self.fresh = fresh
+        self.limits = SECTION_CHAR_LIMITS[idea_length]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = {}
+        self._parser = IdeaSectionParser(self._check_streamed_section)
+    
+    def watch(self, on_chunk=None):
+        """스트리밍 누적 텍스트를 파서에 넣은 뒤 원래 콜백으로 전달하는 콜백 반환"""
+        def forward(text):
+            self._parser.feed(text)
+            if on_chunk:
+                on_chunk(text)
+        return forward
+    
+    def apply(self, text):
+        """초과 섹션을 재작성 결과로 교체한 텍스트와 재작성 정보 반환"""
+        start_time = time.perf_counter()
+        sections = split_idea_sections(text)
+        overlong = find_overlong_sections(sections, self.limits)
+        for key in overlong:
+            self._submit(key, sections[key], sections)
+        
+        replacements = {}
+        regenerated = {}
+        usage = {"inputTokens": 0, "outputTokens": 0}
+        for key, (chars, limit) in overlong.items():
+            try:
+                result = self._pending[key][1].result()
+            except Exception:
+                # 재작성 실패 시 원래 본문 유지
+                continue
+            for usage_key in usage:
+                usage[usage_key] += (result["usage"] or {}).get(usage_key, 0)
+            body = result["text"].strip()
+            if body.startswith("## "):
+                body = body.split("\n", 1)[1].strip() if "\n" in body else ""
+            if body and len(body) < chars:
+                replacements[key] = body
+                regenerated[key] = {"before": chars, "after": len(body), "limit": limit}
+        
+        # 최종 텍스트에서 더 이상 초과하지 않는 섹션의 미리 시작한 요청은 기다리지 않음
+        self.close()
+        
+        return replace_section_bodies(text, replacements), {
+            "regenerated_sections": regenerated,
+            "usage": usage,
+            "latency": time.perf_counter() - start_time
+        }
+    
+    def close(self):
+        """재작성 스레드 풀 정리 (apply() 전에 생성이 실패해도 스레드가 남지 않도록 호출)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _check_streamed_section(self, key, body):
+        if key in find_overlong_sections({key: body}, self.limits):
+            sections = {k: section["body"] for k, section in self._parser.sections.items()}
+            self._submit(key, body, sections)
+    
+    def _submit(self, key, draft, sections):
+        # 같은 초안으로 이미 요청했다면 그 결과를 재사용
+        if key in self._pending and self._pending[key][0] == draft:
+            return
+        outline = assemble_idea_sections({
+            outline_key: sections.get(outline_key, "")
+            for outline_key in OUTLINE_SECTION_KEYS if outline_key != key
+        })
+        prompt, inference_config = build_section_request(
+            *self.inputs, self.idea_length, key, outline, previous_draft=draft
+        )
+        future = self._executor.submit(
+            generate_with_routing, self.bedrock_client, self.idea_length, prompt, inference_config,
+            fresh=self.fresh, label="idea_section_fix"
+        )
+        self._pending[key] = (draft, future)
+
+def generate_hackathon_idea_with_nova(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통", on_chunk=None, metrics=None, fresh=False, parallel_sections=False, enforce_section_limits=False):
+    """Nova 모델을 사용하여 리빙랩 해커톤 아이디어 생성 (길이 옵션별로 라우터가 모델 선택)
+
+    on_chunk가 주어지면 스트리밍 API로 호출하여 부분 결과를 실시간으로 전달하고,
+    metrics 딕셔너리가 주어지면 첫 토큰 시간(ttft), 전체 지연 시간(latency),
+    토큰 사용량(usage)과 이어쓰기 횟수(continuation_rounds)를 기록합니다.
+    같은 입력은 응답 캐시에서 반환하며, fresh=True이면 캐시를 건너뛰고 새로 생성합니다.
+    parallel_sections=True이고 '상세' 옵션이면 섹션별 병렬 생성을 사용하고,
+    enforce_section_limits=True이면 글자 수 제한을 넘은 섹션만 다시 요청하여 교체합니다.
+    """
+    bedrock_client = get_bedrock_client()
+    
+    if not bedrock_client:
+        return "❌ AWS Bedrock 연결에 실패했습니다."
+    
+    prompt_prefix, prompt, inference_config, _ = build_idea_request(
+        problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length
+    )
+
+    enforcer = None
+    if enforce_section_limits:
+        enforcer = SectionLimitEnforcer(
+            bedrock_client, (problem_area, target_problem, ai_technology, target_users, expected_impact), idea_length, fresh
+        )
+    
+    try:
+        if parallel_sections and idea_length == "상세":
+            # 공통 개요 생성 후 나머지 섹션을 동시에 생성하여 조립
+            result = generate_idea_by_sections(
+                bedrock_client, problem_area, target_problem, ai_technology, target_users, expected_impact,
+                idea_length, on_chunk, fresh
+            )
+        else:
+            # 스트리밍 중에는 섹션이 끝나는 대로 글자 수를 검사하여 초과 섹션 재작성을 미리 시작
+            if enforcer and on_chunk:
+                on_chunk = enforcer.watch(on_chunk)
+            
+            # 토큰 제한으로 잘리면 부분 결과를 유지한 채 이어서 생성 (같은 입력은 캐시에서 반환)
+            result = generate_with_routing(
+                bedrock_client,
+                idea_length,
+                prompt,
+                inference_config,
+                on_chunk,
+                fresh,
+                label="idea",
+                prompt_prefix=prompt_prefix
+            )
+            
+            record_idea_usage(idea_length, inference_config, result)
+        
+        if enforcer:
+            # 글자 수 제한을 넘은 섹션만 재작성 결과로 교체
+            fixed_text, enforcement = enforcer.apply(result["text"])
+            result = dict(
+                result,
+                text=fixed_text,
+                latency=result["latency"] + enforcement["latency"],
+                usage={key: (result["usage"] or {}).get(key, 0) + value for key, value in enforcement["usage"].items()},
+                regenerated_sections=enforcement["regenerated_sections"]
+            )
+        
+        artifact_id = record_artifact(
+            "idea",
+            idea_inputs(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length),
+            result
+        )
+        
+        if metrics is not None:
+            metrics.update(
+                ttft=result["ttft"],
+                latency=result["latency"],
+                stop_reason=result["stop_reason"],
+                usage=result["usage"],
+                continuation_rounds=result["continuation_rounds"],
+                cache_hit=result["cache_hit"],
+                queue_wait=result["queue_wait"],
+                model_id=result["model_id"],
+                regenerated_sections=result.get("regenerated_sections", {}),
+                artifact_id=artifact_id
+            )
+        
+        return result["text"] or '해커톤 아이디어 생성에 실패했습니다.'
+        
+    except ClientError as e:
+        if is_throttling_error(e):
+            return "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."
+        return f"❌ AWS API 호출 오류: {e}"
+    except Exception as e:
+        return f"❌ 해커톤 아이디어 생성 중 오류 발생: {e}"
+    finally:
+        if enforcer:
+            enforcer.close()
+
+# 후보 동시 생성에서 후보마다 바꿔 쓰는 (temperature, topP) 조합 (앞에서부터 N개 사용)
+CANDIDATE_SAMPLING = [(0.7, 0.9), (0.9, 0.95), (0.5, 0.8), (1.0, 0.99), (0.8, 0.85)]
+MAX_IDEA_CANDIDATES = len(CANDIDATE_SAMPLING)
+
+def generate_idea_candidates(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통", num_candidates=3, on_candidate=None, fresh=False):
+    """temperature/topP를 달리한 아이디어 후보 N개를 동시에 생성하고 로컬 점수로 정렬
+
+    여러 번 '새 아이디어 생성'을 누르며 차례로 기다리는 대신, 한 번의 호출 시간 안에
+    후보를 모두 받아 비교할 수 있도록 합니다. on_candidate(candidate)는 후보가 도착할
+    때마다 호출됩니다. 반환값은 {"candidates", "error"}이며 candidates는 점수 순으로
+    {"text", "temperature", "top_p", "metrics", "score", "scores"}를 담고, 모든 후보가
+    실패했을 때만 error에 사용자용 오류 문자열이 들어갑니다.
+    """
+    bedrock_client = get_bedrock_client()
+    
+    if not bedrock_client:
+        return {"candidates": [], "error": "❌ AWS Bedrock 연결에 실패했습니다."}
+    
+    prompt_prefix, prompt, inference_config, settings = build_idea_request(
+        problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length
+    )
+    inputs = idea_inputs(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length)
+    sampling = CANDIDATE_SAMPLING[:max(1, min(num_candidates, MAX_IDEA_CANDIDATES))]
+    
+    def generate_candidate(temperature, top_p):
+        config = dict(inference_config, temperature=temperature, topP=top_p)
+        result = generate_with_routing(
+            bedrock_client, idea_length, prompt, config, fresh=fresh, label="idea_candidate", prompt_prefix=prompt_prefix
+        )
+        # 토큰 예산 기록은 기본 샘플링 설정의 출력 길이 기준이므로 기본 설정 후보만 반영
+        if (temperature, top_p) == (inference_config["temperature"], inference_config["topP"]):
+            record_idea_usage(idea_length, config, result)
+        return {
+            "text": result["text"],
+            "temperature": temperature,
+            "top_p": top_p,
+            "metrics": {
+                "ttft": result["ttft"],
+                "latency": result["latency"],
+                "stop_reason": result["stop_reason"],
+                "usage": result["usage"],
+                "continuation_rounds": result["continuation_rounds"],
+                "cache_hit": result["cache_hit"],
+                "queue_wait": result["queue_wait"],
+                "model_id": result["model_id"],
+                "artifact_id": record_artifact("idea", inputs, result)
+            }
+        }
+    
+    candidates = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=len(sampling)) as executor:
+        futures = [executor.submit(generate_candidate, temperature, top_p) for temperature, top_p in sampling]
+        for future in as_completed(futures):
+            try:
+                candidate = future.result()
+            except Exception as e:
+                # 일부 후보가 실패해도 도착한 후보로 비교할 수 있도록 계속 진행
+                errors.append(e)
+                continue
+            if not candidate["text"].strip():
+                continue
+            candidates.append(candidate)
+            if on_candidate:
+                on_candidate(candidate)
+    
+    if not candidates:
+        if errors and all(isinstance(e, ClientError) and is_throttling_error(e) for e in errors):
+            return {"candidates": [], "error": "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."}
+        detail = f": {errors[0]}" if errors else ""
+        return {"candidates": [], "error": f"❌ 아이디어 후보 생성 중 오류 발생{detail}"}
+    
+    ranked = []
+    for rank in rank_candidates([candidate["text"] for candidate in candidates], settings):
+        ranked.append(dict(candidates[rank["index"]], score=rank["score"], scores=rank["scores"]))
+    return {"candidates": ranked, "error": None}
+
+# PRD 생성 지시와 문서 구조 (아이디어와 무관한 정적 앞부분이므로 프롬프트 캐싱 대상)
+PRD_PROMPT_PREFIX = """
+마지막에 주어지는 해커톤 아이디어를 바탕으로 **초기 MVP(Minimum Viable Product)** 버전의 Streamlit 앱 구현을 위한 간단한 PRD를 Markdown 형식으로 작성해주세요.
+
+**중요 제약사항:**
+- 이것은 초기 MVP 버전이므로 핵심 기능만 포함
+- AI 기능은 **텍스트 처리만으로 제한** (이미지, 음성, 영상 처리 제외)
+- 복잡한 AI 모델보다는 간단한 텍스트 분석, 분류, 요약 등에 집중
+- 실제 1-2일 내에 구현 가능한 범위로 한정
+
+다음 구조로 간단하고 실용적인 PRD를 작성해주세요:
+
+# 프로젝트명 (MVP 버전)
+
+## 📋 프로젝트 개요
+- **목적**: (한 줄 설명)
+- **타겟 사용자**: (주요 사용자)
+- **MVP 범위**: 텍스트 기반 AI 기능만 포함
+
+## 🎯 주요 기능 (MVP 핵심)
+### 필수 기능 (텍스트 처리 한정)
+1. 기능 1 - 텍스트 입력 및 처리
+2. 기능 2 - 텍스트 분석/분류/요약 등
+3. 기능 3 - 결과 표시 및 피드백
+
+### 제외 기능 (향후 버전)
+- 이미지/음성/영상 처리
+- 복잡한 머신러닝 모델
+- 실시간 스트리밍
+
+## 📱 Streamlit 앱 구성
+### 화면 구성
+- **메인 페이지**: 텍스트 입력 및 설정
+- **결과 페이지**: 처리 결과 및 분석
+
+### 사용할 Streamlit 컴포넌트
+- 입력: `st.text_input()`, `st.text_area()`, `st.selectbox()`
+- 출력: `st.write()`, `st.markdown()`, `st.dataframe()`
+- 상호작용: `st.button()`, `st.tabs()`, `st.expander()`
+
+## 💾 데이터 처리 (텍스트만)
+- **입력 데이터**: 사용자 텍스트 입력
+- **처리 과정**: 간단한 텍스트 분석/처리 알고리즘
+- **출력 형태**: 텍스트 결과, 차트, 표 형태
+
+## 🤖 AI 기능 (텍스트 한정)
+- **사용 모델**: 간단한 텍스트 처리 라이브러리 또는 API
+- **처리 범위**: 텍스트 분류, 키워드 추출, 감정 분석, 요약 등
+- **제외 항목**: 이미지/음성/영상 AI 기능
+
+## 📚 필요한 라이브러리
+```python
+streamlit
+pandas
+matplotlib (또는 plotly)
+requests (API 사용시)
+nltk 또는 spacy (텍스트 처리)
+openai 또는 transformers (텍스트 AI, 선택적)
+```
+
+## ⚡ 구현 순서 (MVP 기준)
+1. **1단계**: 기본 UI 및 텍스트 입력 구성
+2. **2단계**: 핵심 텍스트 처리 기능 구현
+3. **3단계**: 결과 표시 및 기본 개선
+
+## 🚀 향후 확장 계획
+- 2차 버전: 이미지 처리 기능 추가
+- 3차 버전: 더 복잡한 AI 모델 적용
+
+**MVP 버전으로 간단하고 실용적으로 작성하되, 텍스트 기반 AI 기능만 포함하여 실제 구현 가능한 내용으로 해주세요.**
+"""
+
+def generate_streamlit_prd(idea_content, on_chunk=None, metrics=None, fresh=False, priority="prd", label="prd", record_history=True):
+    """Nova 모델을 사용하여 간단한 Streamlit 앱 PRD 생성 (라우터가 모델 선택)
+
+    on_chunk가 주어지면 스트리밍 API로 호출하여 부분 결과를 실시간으로 전달합니다.
+    같은 아이디어는 응답 캐시에서 반환하며, fresh=True이면 캐시를 건너뜁니다.
+    record_history=False이면 기록 저장소에 남기지 않습니다 (미리 생성하는 PRD용).
+    """
+    bedrock_client = get_bedrock_client()
+    
+    if not bedrock_client:
+        return "❌ AWS Bedrock 연결에 실패했습니다."
+    
+    prompt = f"""
+해커톤 아이디어:
+{idea_content}
+"""
+
+    try:
+        # 라우터가 고른 Nova 모델 호출 (잘린 경우 이어서 생성, 같은 아이디어는 캐시에서 반환)
+        result = generate_with_routing(
+            bedrock_client,
+            "prd",
+            prompt,
+            {
+                "maxTokens": 1500,  # 간단한 PRD용으로 토큰 수 줄임
+                "temperature": 0.7,
+                "topP": 0.9
+            },
+            on_chunk,
+            fresh,
+            priority=priority,
+            label=label,
+            prompt_prefix=PRD_PROMPT_PREFIX
+        )
+        
+        artifact_id = record_artifact("prd", {"idea_content": idea_content}, result) if record_history else None
+        
+        if metrics is not None:
+            metrics.update(
+                ttft=result["ttft"],
+                latency=result["latency"],
+                stop_reason=result["stop_reason"],
+                usage=result["usage"],
+                continuation_rounds=result["continuation_rounds"],
+                cache_hit=result["cache_hit"],
+                queue_wait=result["queue_wait"],
+                model_id=result["model_id"],
+                artifact_id=artifact_id
+            )
+        
+        return result["text"] or 'PRD 생성에 실패했습니다.'
+        
+    except ClientError as e:
+        if is_throttling_error(e):
+            return "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."
+        return f"❌ AWS API 호출 오류: {e}"
+    except Exception as e:
+        return f"❌ PRD 생성 중 오류 발생: {e}"
+
+# 다시 생성할 PRD 섹션이 이 비율을 넘으면 부분 재생성 대신 전체를 새로 생성
+INCREMENTAL_PRD_MAX_RATIO = 0.6
+
+def regenerate_prd_incrementally(previous_idea, previous_prd, idea_content, previous_metrics=None, on_chunk=None, metrics=None, fresh=False):
+    """이전 아이디어/PRD 쌍과 비교하여 바뀐 아이디어 섹션에 기대는 PRD 섹션만 다시 생성
+
+    바뀐 섹션이 없으면 이전 PRD를 그대로 돌려주고, 아이디어/PRD의 섹션 구조를 찾지
+    못하거나 다시 생성할 섹션이 많으면 generate_streamlit_prd로 전체를 생성합니다.
+    metrics에는 mode(unchanged/incremental/full), 바뀐 아이디어 섹션, 다시 생성한 PRD 섹션과
+    이전 전체 생성 대비 절약한 출력 토큰/시간(savings)이 기록됩니다.
+    """
+    changed = changed_idea_sections(previous_idea, idea_content)
+    targets = dependent_prd_sections(changed) if changed is not None else None
+    previous_sections = split_prd_sections(previous_prd)
+    # 절약량의 기준은 마지막 전체 생성 (이전 PRD도 부분 재생성이면 그 기준을 이어받음)
+    previous_metrics = previous_metrics or {}
+    baseline = previous_metrics.get("savings") or {
+        "baseline_output_tokens": (previous_metrics.get("usage") or {}).get("outputTokens"),
+        "baseline_latency": None if previous_metrics.get("cache_hit") else previous_metrics.get("latency")
+    }
+    # 기록이 없으면 2글자당 1토큰으로 추정
+    baseline_tokens = baseline["baseline_output_tokens"] or len(previous_prd) // 2
+    baseline_latency = baseline["baseline_latency"]
+    
+    def savings(output_tokens, latency):
+        return {
+            "baseline_output_tokens": baseline_tokens,
+            "output_tokens": output_tokens,
+            "saved_output_tokens": baseline_tokens - output_tokens,
+            "baseline_latency": baseline_latency,
+            "latency": latency,
+            "saved_seconds": baseline_latency - latency if baseline_latency is not None else None
+        }
+    
+    if targets == []:
+        if on_chunk:
+            on_chunk(previous_prd)
+        if metrics is not None:
+            metrics.update(mode="unchanged", changed_idea_sections=[], regenerated_sections=[], latency=0.0, savings=savings(0, 0.0))
+        return previous_prd
+    
+    # 아이디어 섹션 구조를 찾지 못했거나(targets가 None) 이전 PRD에 없는 섹션이 있으면 전체 생성
+    if targets is None or any(key not in previous_sections for key in targets) or len(targets) > INCREMENTAL_PRD_MAX_RATIO * (len(PRD_SECTIONS) + 1):
+        prd_content = generate_streamlit_prd(idea_content, on_chunk, metrics, fresh)
+        if metrics is not None:
+            metrics.update(mode="full", changed_idea_sections=sorted(changed or []), regenerated_sections=[])
+        return prd_content
+    
+    bedrock_client = get_bedrock_client()
+    
+    if not bedrock_client:
+        return "❌ AWS Bedrock 연결에 실패했습니다."
+    
+    changed_headings = ", ".join(heading for key, heading, _ in IDEA_SECTIONS if key in changed)
+    target_headings = "\n".join(
+        f"# {PRD_SECTION_HEADINGS[key]}" if key == PRD_TITLE_KEY else f"## {PRD_SECTION_HEADINGS[key]}" for key in targets
+    )
+    prompt = f"""
+해커톤 아이디어:
+{idea_content}
+
+기존 PRD:
+{previous_prd}
+
+아이디어에서 다음 부분이 바뀌었습니다: {changed_headings}
+기존 PRD에서 아래 섹션만 바뀐 아이디어에 맞게 다시 작성해주세요. 다른 섹션은 출력하지 말고, 각 섹션은 아래와 같은 헤더로 시작해주세요.
+{target_headings}
+"""
+    
+    def splice(text):
+        replacements = {key: body for key, body in split_prd_sections(text).items() if key in targets}
+        return replace_prd_sections(previous_prd, replacements)
+    
+    try:
+        result = generate_with_routing(
+            bedrock_client,
+            "prd",
+            prompt,
+            {
+                # 다시 쓰는 섹션 비율만큼만 출력 토큰 예산 사용 (잘리면 이어쓰기)
+                "maxTokens": min(1500, 300 + 1500 * len(targets) // (len(PRD_SECTIONS) + 1)),
+                "temperature": 0.7,
+                "topP": 0.9
+            },
+            (lambda text: on_chunk(splice(text))) if on_chunk else None,
+            fresh,
+            priority="prd",
+            label="prd_incremental",
+            prompt_prefix=PRD_PROMPT_PREFIX
+        )
+        
+        regenerated = [key for key in targets if key in split_prd_sections(result["text"])]
+        if not regenerated:
+            # 지정한 헤더 형식으로 답하지 않았으면 전체 생성으로 대체
+            prd_content = generate_streamlit_prd(idea_content, on_chunk, metrics, fresh)
+            if metrics is not None:
+                metrics.update(mode="full", changed_idea_sections=sorted(changed), regenerated_sections=[])
+            return prd_content
+        
+        prd_content = splice(result["text"])
+        artifact_id = record_artifact("prd", {"idea_content": idea_content}, dict(result, text=prd_content))
+        
+        if metrics is not None:
+            metrics.update(
+                ttft=result["ttft"],
+                latency=result["latency"],
+                stop_reason=result["stop_reason"],
+                usage=result["usage"],
+                continuation_rounds=result["continuation_rounds"],
+                cache_hit=result["cache_hit"],
+                queue_wait=result["queue_wait"],
+                model_id=result["model_id"],
+                artifact_id=artifact_id,
+                mode="incremental",
+                changed_idea_sections=sorted(changed),
+                regenerated_sections=regenerated,
+                savings=savings((result["usage"] or {}).get("outputTokens", 0), result["latency"])
+            )
+        
+        return prd_content
+        
+    except ClientError as e:
+        if is_throttling_error(e):
+            return "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."
+        return f"❌ AWS API 호출 오류: {e}"
+    except Exception as e:
+        return f"❌ PRD 생성 중 오류 발생: {e}"
+
+def save_prd_to_markdown(prd_content, filename=None):
+    """PRD 내용을 Markdown 파일로 내보내기
+
+    생성한 PRD는 기록 저장소에 자동으로 남으므로 앱에서는 쓰지 않으며, 파일이 꼭
+    필요한 경우(스크립트 등)에만 사용합니다.
+    """
+    try:
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"streamlit_app_prd_{timestamp}.md"
+        
+        # 현재 디렉토리에 저장
+        filepath = os.path.join(os.getcwd(), filename)
+        
+        get_telemetry()
+        with measure("prd", "file_write", chars=len(prd_content)):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(prd_content)
+        
+        return True, filepath
+    except Exception as e:
+        return False, str(e)
+
+def submit_idea_job(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통", stream=True, fresh=False, parallel_sections=False, enforce_section_limits=False):
+    """아이디어 생성을 백그라운드 작업으로 등록하고 작업 ID 반환
+
+    stream=True이면 부분 결과를 작업의 partial로 계속 갱신합니다. 작업 결과는
+    session_state.current_idea와 같은 {"generated_content", "idea_length", "metrics"}입니다.
+    디버깅 정보는 작업 스레드에서 화면에 쓸 수 없으므로 metrics로만 남깁니다.
+    """
+    def run(job):
+        metrics = {}
+        generated_content = generate_hackathon_idea_with_nova(
+            problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length,
+            on_chunk=job.publish if stream else None,
+            metrics=metrics,
+            fresh=fresh,
+            parallel_sections=parallel_sections,
+            enforce_section_limits=enforce_section_limits
+        )
+        return {"generated_content": generated_content, "idea_length": idea_length, "metrics": metrics}
+    
+    return get_job_queue().submit("idea", run)
+
+def submit_idea_candidates_job(problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length="보통", num_candidates=3, fresh=False):
+    """아이디어 후보 동시 생성을 백그라운드 작업으로 등록하고 작업 ID 반환
+
+    후보가 도착할 때마다 지금까지 도착한 후보를 마크다운으로 partial에 갱신합니다.
+    작업 결과는 {"candidates", "error", "idea_length"}입니다.
+    """
+    def run(job):
+        arrived = []
+        
+        def on_candidate(candidate):
+            arrived.append(candidate)
+            job.report(len(arrived) / num_candidates, f"후보 {len(arrived)}/{num_candidates}개 도착")
+            job.publish("\n\n---\n\n".join(
+                f"### 🎲 후보 {index} (temperature {item['temperature']}, topP {item['top_p']})\n\n{item['text']}"
+                for index, item in enumerate(arrived, 1)
+            ))
+        
+        result = generate_idea_candidates(
+            problem_area, target_problem, ai_technology, target_users, expected_impact, idea_length,
+            num_candidates, on_candidate, fresh
+        )
+        return dict(result, idea_length=idea_length)
+    
+    return get_job_queue().submit("idea_candidates", run)
+
+# 미리 생성한 PRD 보관 한도: 항목 수, 찾아가지 않은 결과의 보관 시간(초), 동시 실행 수, 시간당 추정 토큰
+SPECULATIVE_MAX_ENTRIES = 32
+SPECULATIVE_TTL_SECONDS = 10 * 60
+SPECULATIVE_MAX_INFLIGHT = 2
+SPECULATIVE_TOKENS_PER_HOUR = 100000
+# 호출 속도 조절기의 예상 대기가 이 시간(초)을 넘으면 미리 생성하지 않음
+SPECULATIVE_MAX_QUEUE_WAIT = 2.0
+
+# 아이디어가 완성되자마자 미리 생성한 PRD 저장소 (모든 세션이 공유)
+@st.cache_resource
+def get_speculative_store():
+    return SpeculativeStore(SPECULATIVE_MAX_ENTRIES, SPECULATIVE_TTL_SECONDS, SPECULATIVE_MAX_INFLIGHT, SPECULATIVE_TOKENS_PER_HOUR)
+
+def speculative_prd_key(idea_content):
+    return make_input_hash("prd", {"idea_content": idea_content})
+
+def start_speculative_prd(idea_content):
+    """사용자가 요청하기 전에 PRD 생성을 백그라운드로 시작하고 시작 여부 반환
+
+    bulk 우선순위로 호출하므로 대화형 요청을 밀어내지 않으며, 호출 대기열이 이미 밀려 있거나
+    미리 생성 예산(동시 실행 수, 시간당 추정 토큰)을 다 쓴 경우에는 시작하지 않습니다.
+    결과는 기록 저장소에 남기지 않고, submit_prd_job이 찾아갈 때 기록합니다.
+    """
+    if not idea_content or idea_content.startswith(("❌", "⏳")):
+        return False
+    if get_rate_governor().status()["estimated_wait"] > SPECULATIVE_MAX_QUEUE_WAIT:
+        return False
+    
+    def run(publish):
+        metrics = {}
+        prd_content = generate_streamlit_prd(
+            idea_content, on_chunk=publish, metrics=metrics,
+            priority="bulk", label="prd_speculative", record_history=False
+        )
+        return {"prd_content": prd_content, "metrics": metrics}
+    
+    # 입력(프롬프트 앞부분 + 아이디어)과 최대 출력 토큰으로 추정한 사용량
+    estimated_tokens = (len(PRD_PROMPT_PREFIX) + len(idea_content)) // 2 + 1500
+    return get_speculative_store().start(speculative_prd_key(idea_content), run, estimated_tokens)
+
+def speculative_stats_report():
+    return get_speculative_store().stats()
+
+def claim_speculative_prd(idea_content, on_chunk=None):
+    """미리 생성한 PRD가 있으면 (진행 중이면 끝날 때까지 부분 결과를 전달하며) 가져와 반환
+
+    없거나 만료되었거나 미리 생성이 실패했으면 None을 반환하며, 이때는 새로 생성하면 됩니다.
+    가져온 결과는 이때 기록 저장소에 남기고 metrics에 speculative=True를 표시합니다.
+    """
+    entry = get_speculative_store().claim(speculative_prd_key(idea_content))
+    if entry is None:
+        return None
+    
+    published = None
+    while True:
+        done = bool(wait([entry.future], timeout=0.2).done)
+        if on_chunk and entry.partial != published:
+            published = entry.partial
+            on_chunk(published)
+        if done:
+            break
+    
+    try:
+        result = entry.future.result()
+    except Exception:
+        return None
+    prd_content = result["prd_content"]
+    if prd_content.startswith(("❌", "⏳")) or not result["metrics"]:
+        return None
+    
+    metrics = dict(result["metrics"], speculative=True)
+    metrics["artifact_id"] = record_artifact("prd", {"idea_content": idea_content}, dict(metrics, text=prd_content))
+    if on_chunk:
+        on_chunk(prd_content)
+    return {"prd_content": prd_content, "metrics": metrics}
+
+def submit_prd_job(idea_content, stream=True, fresh=False, previous=None):
+    """PRD 생성을 백그라운드 작업으로 등록하고 작업 ID 반환 (결과는 {"prd_content", "idea_content", "metrics"})
+
+    previous에 이전 {"idea_content", "prd_content", "metrics"}를 주면 바뀐 섹션만 다시 생성합니다.
+    같은 아이디어로 미리 생성한 PRD가 있으면 (fresh가 아닐 때) 그 결과를 사용합니다.
+    """
+    def run(job):
+        metrics = {}
+        on_chunk = job.publish if stream else None
+        if not fresh and not previous:
+            speculative = claim_speculative_prd(idea_content, on_chunk)
+            if speculative:
+                return dict(speculative, idea_content=idea_content)
+        if previous:
+            prd_content = regenerate_prd_incrementally(
+                previous["idea_content"], previous["prd_content"], idea_content, previous.get("metrics"),
+                on_chunk=on_chunk, metrics=metrics, fresh=fresh
+            )
+        else:
+            prd_content = generate_streamlit_prd(idea_content, on_chunk=on_chunk, metrics=metrics, fresh=fresh)
+        return {"prd_content": prd_content, "idea_content": idea_content, "metrics": metrics}
+    
+    return get_job_queue().submit("prd", run)
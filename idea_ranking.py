@@ -0,0 +1,59 @@
+from idea_sections import IDEA_SECTIONS, find_overlong_sections, section_char_limit, split_idea_sections
+from similarity_index import shingle_hashes
+
+# 후보 점수의 항목별 가중치 (합계 1)
+RANKING_WEIGHTS = {"completeness": 0.5, "length": 0.3, "diversity": 0.2}
+
+# 전체 글자 수가 목표의 이 비율보다 짧으면 내용이 부족한 것으로 보고 감점
+MIN_LENGTH_RATIO = 0.5
+
+
+def completeness_score(section_texts):
+    """내용이 있는 아이디어 섹션의 비율"""
+    return sum(1 for key, _, _ in IDEA_SECTIONS if section_texts.get(key)) / len(IDEA_SECTIONS)
+
+
+def length_score(text, section_texts, settings):
+    """전체 글자 수와 섹션별 글자 수 제한을 지킨 정도 (0~1)"""
+    char_limit = settings["char_limit"]
+    total = len(text)
+    if total > char_limit:
+        total_score = max(0.0, 1 - (total - char_limit) / char_limit)
+    else:
+        total_score = min(1.0, total / (char_limit * MIN_LENGTH_RATIO))
+
+    limits = {key: section_char_limit(limit_text) for key, limit_text in settings["sections"].items()}
+    if not section_texts:
+        return total_score / 2
+    overlong = find_overlong_sections(section_texts, limits)
+    return (total_score + 1 - len(overlong) / len(section_texts)) / 2
+
+
+def jaccard(left, right):
+    return len(left & right) / len(left | right) if left or right else 1.0
+
+
+def rank_candidates(texts, settings, weights=RANKING_WEIGHTS):
+    """후보 아이디어를 점수 순으로 정렬한 [{"index", "score", "scores"}] (index는 texts에서의 위치)
+
+    섹션 완성도, 길이 옵션의 글자 수 제한 준수, 다른 후보와의 차이(글자 3-gram 자카드
+    유사도가 가장 높은 후보와의 거리)를 가중 합산합니다. 모델 호출 없이 계산하므로
+    후보가 몇 개든 밀리초 단위로 끝납니다.
+    """
+    shingles = [shingle_hashes(text) for text in texts]
+    ranked = []
+    for index, text in enumerate(texts):
+        section_texts = split_idea_sections(text)
+        others = [jaccard(shingles[index], shingles[other]) for other in range(len(texts)) if other != index]
+        scores = {
+            "completeness": completeness_score(section_texts),
+            "length": length_score(text, section_texts, settings),
+            "diversity": 1 - max(others) if others else 1.0
+        }
+        ranked.append({
+            "index": index,
+            "score": sum(weights[key] * value for key, value in scores.items()),
+            "scores": scores
+        })
+    ranked.sort(key=lambda item: item["score"], reverse=True)
+    return ranked
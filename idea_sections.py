@@ -0,0 +1,137 @@
+import re
+
+# 아이디어 섹션 구성 (키, 헤더, 작성 안내) - 단일 호출 프롬프트와 같은 순서
+IDEA_SECTIONS = [
+    ("title", "🎯 프로젝트 제목", "창의적이고 임팩트 있는 프로젝트명"),
+    ("overview", "📋 프로젝트 개요", "프로젝트의 핵심 내용과 목적을 간단명료하게 설명"),
+    ("problem", "🌍 해결 문제", "구체적인 문제 정의와 현재 상황을 설명"),
+    ("ai_tech", "🤖 AI 기술 활용", "어떤 AI 기술을 어떻게 활용할지 구체적으로 설명"),
+    ("users", "👥 타겟 사용자", "주요 사용자와 이해관계자를 나열"),
+    ("features", "💡 핵심 기능", "주요 기능을 간단한 문장으로 나열\n- 기능 1: (한 줄 설명)\n- 기능 2: (한 줄 설명)\n- 기능 3: (한 줄 설명)"),
+    ("impact", "🎊 기대 효과", "지속가능성 측면에서의 기대효과를 구체적 수치나 결과로 설명"),
+    ("tech_stack", "🛠️ 기술 스택", "개발에 필요한 핵심 기술들을 나열"),
+    ("test_plan", "📊 실증 계획", "실제 환경에서의 테스트 방법을 설명"),
+    ("expansion", "🚀 확장 가능성", "향후 발전 방향을 설명")
+]
+
+# 섹션 병렬 생성에서 먼저 함께 생성하는 공통 개요 섹션
+OUTLINE_SECTION_KEYS = ["title", "overview"]
+
+# 섹션 글자 수 제한을 넘었다고 판단하는 허용 배수
+SECTION_LIMIT_TOLERANCE = 1.2
+
+
+def section_char_limit(limit_text):
+    """'250자 이내, 4-5개 기능' 같은 섹션 제한 문구에서 글자 수 추출"""
+    match = re.search(r'(\d+)\s*자', limit_text)
+    return int(match.group(1)) if match else None
+
+
+def match_section_heading(line):
+    """'## 🎯 프로젝트 제목 (30자 이내)' 같은 헤더 줄의 섹션 키 (아이디어 섹션이 아니면 None)"""
+    if not line.startswith("## "):
+        return None
+    title = line[3:].strip()
+    for key, heading, _ in IDEA_SECTIONS:
+        # 이모지 변형(VS16 유무)과 무관하게 비교
+        if title.replace("\ufe0f", "").startswith(heading.replace("\ufe0f", "")):
+            return key
+    return None
+
+
+class IdeaSectionParser:
+    """아이디어 마크다운을 '## ' 섹션 단위로 점진적으로 분리하는 파서
+
+    스트리밍 중 누적 텍스트를 feed()로 계속 넣으면 다음 헤더가 시작되어 끝난 것이
+    확실한 섹션부터 on_section(key, body)로 알려 주고, finish()에서 마지막 섹션을
+    닫습니다. sections에는 섹션별 본문과 원문 내 본문 위치(start, end)가 기록됩니다.
+    """
+
+    def __init__(self, on_section=None):
+        self.on_section = on_section
+        self.sections = {}
+        self._text = ""
+        self._offset = 0
+        self._current_key = None
+        self._body_start = 0
+
+    def feed(self, text):
+        """지금까지의 누적 텍스트를 넣고 완성된 줄만 처리"""
+        self._text = text
+        while True:
+            newline = text.find("\n", self._offset)
+            if newline == -1:
+                break
+            self._process_line(text[self._offset:newline], self._offset, newline + 1)
+            self._offset = newline + 1
+
+    def finish(self):
+        """남은 마지막 줄과 마지막 섹션을 처리하고 섹션 목록 반환"""
+        if self._offset < len(self._text):
+            self._process_line(self._text[self._offset:], self._offset, len(self._text))
+            self._offset = len(self._text)
+        self._close_current(len(self._text))
+        return self.sections
+
+    def _process_line(self, line, start, end):
+        if not line.startswith("## "):
+            return
+        self._close_current(start)
+        self._current_key = match_section_heading(line)
+        self._body_start = end
+
+    def _close_current(self, end):
+        if self._current_key is None:
+            return
+        key = self._current_key
+        self._current_key = None
+        # 같은 섹션이 반복되면 첫 번째만 사용
+        if key in self.sections:
+            return
+        body = self._text[self._body_start:end]
+        self.sections[key] = {"body": body.strip(), "start": self._body_start, "end": end}
+        if self.on_section:
+            self.on_section(key, self.sections[key]["body"])
+
+
+def split_idea_sections(markdown):
+    """아이디어 마크다운을 섹션 키별 본문으로 분리 (헤더를 찾지 못한 섹션은 제외)"""
+    parser = IdeaSectionParser()
+    parser.feed(markdown)
+    return {key: section["body"] for key, section in parser.finish().items()}
+
+
+def assemble_idea_sections(section_texts):
+    """섹션 본문을 단일 호출과 같은 '## 헤더' 마크다운 레이아웃으로 조립 (없는 섹션은 생략)"""
+    parts = []
+    for key, heading, _ in IDEA_SECTIONS:
+        if section_texts.get(key):
+            parts.append(f"## {heading}\n{section_texts[key]}")
+    return "\n\n".join(parts)
+
+
+def find_overlong_sections(section_texts, limits, tolerance=SECTION_LIMIT_TOLERANCE):
+    """글자 수 제한을 허용 배수 이상 넘은 섹션의 {키: (글자 수, 제한)}"""
+    overlong = {}
+    for key, body in section_texts.items():
+        limit = limits.get(key)
+        if limit and len(body) > limit * tolerance:
+            overlong[key] = (len(body), limit)
+    return overlong
+
+
+def replace_section_bodies(markdown, replacements):
+    """헤더 줄과 나머지 레이아웃은 그대로 두고 지정한 섹션의 본문만 교체"""
+    parser = IdeaSectionParser()
+    parser.feed(markdown)
+    sections = parser.finish()
+
+    # 뒤쪽 섹션부터 바꿔야 앞쪽 위치가 어긋나지 않음
+    result = markdown
+    for key in sorted(replacements, key=lambda k: sections[k]["start"] if k in sections else -1, reverse=True):
+        if key not in sections:
+            continue
+        section = sections[key]
+        trailing = "\n\n" if section["end"] < len(markdown) else "\n"
+        result = result[:section["start"]] + replacements[key].strip() + trailing + result[section["end"]:]
+    return result
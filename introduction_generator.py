@@ -0,0 +1,69 @@
+from botocore.exceptions import ClientError
+from nova_engine import NOVA_LITE_MODEL_ID, generate_with_continuation
+from hackathon_generator import get_bedrock_client, get_rate_governor, get_telemetry
+
+
+# 자기소개서 생성 설정 (실시간 호출과 배치 추론이 같은 값을 사용)
+INTRODUCTION_INFERENCE_CONFIG = {
+    "maxTokens": 1000,
+    "temperature": 0.7,
+    "topP": 0.9
+}
+
+
+def build_introduction_request(name, major, hobby, experiences, target_job):
+    """자기소개서 프롬프트와 추론 설정 (prompt, inference_config)"""
+    prompt = f"""
+당신은 전문적인 자기소개서 작성 도우미입니다. 다음 정보를 바탕으로 매력적이고 전문적인 자기소개서를 작성해주세요.
+
+개인 정보:
+- 이름: {name}
+- 전공: {major}
+- 취미: {hobby}
+- 경험/활동: {experiences}
+- 희망 직무: {target_job}
+
+다음 구조로 자기소개서를 작성해주세요:
+1. 인사말 및 자기소개
+2. 전공 관련 역량
+3. 경험 및 활동
+4. 취미를 통한 개성 표현
+5. 희망 직무에 대한 열정
+6. 마무리
+
+한국어로 작성하며, 진정성 있고 전문적인 톤으로 작성해주세요.
+"""
+    return prompt, dict(INTRODUCTION_INFERENCE_CONFIG)
+
+
+def generate_introduction_with_nova(name, major, hobby, experiences, target_job, on_chunk=None):
+    """Nova Lite 모델을 사용하여 자기소개서 생성
+
+    on_chunk가 주어지면 스트리밍 API로 호출하여 부분 결과를 실시간으로 전달합니다.
+    """
+    bedrock_client = get_bedrock_client()
+    get_telemetry()  # 메트릭 훅이 등록되어 있도록 보장
+
+    if not bedrock_client:
+        return "❌ AWS Bedrock 연결에 실패했습니다."
+
+    prompt, inference_config = build_introduction_request(name, major, hobby, experiences, target_job)
+
+    try:
+        # Nova Lite 모델 호출 (잘린 경우 이어서 생성, 다른 생성기와 같은 호출 속도 조절기 사용)
+        result = generate_with_continuation(
+            bedrock_client,
+            NOVA_LITE_MODEL_ID,
+            prompt,
+            inference_config,
+            on_chunk,
+            get_rate_governor(),
+            label="introduction"
+        )
+
+        return result["text"] or '자기소개서 생성에 실패했습니다.'
+
+    except ClientError as e:
+        return f"❌ AWS API 호출 오류: {e}"
+    except Exception as e:
+        return f"❌ 자기소개서 생성 중 오류 발생: {e}"
@@ -0,0 +1,163 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+ACTIVE_JOB_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+# 작업을 실행할 스레드 풀 (대화형 생성과 오래 걸리는 대량/배치 작업을 나눔)
+INTERACTIVE_POOL = "interactive"
+BULK_POOL = "bulk"
+
+
+class Job:
+    """백그라운드 작업 하나의 진행 상황과 결과
+
+    작업 함수는 Job을 인자로 받아 publish(text)로 부분 결과를, report(fraction, message)로
+    진행률을 알리고, 반환값이 작업 결과(result)가 됩니다.
+    """
+
+    def __init__(self, job_id, kind, condition):
+        self.job_id = job_id
+        self.kind = kind
+        self.status = JOB_QUEUED
+        self.partial = ""
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._condition = condition
+
+    def publish(self, text):
+        """지금까지 생성된 부분 결과 갱신"""
+        with self._condition:
+            self.partial = text
+            self._touch()
+
+    def report(self, fraction, message=""):
+        """진행률(0~1)과 상태 메시지 갱신"""
+        with self._condition:
+            self.progress = fraction
+            self.message = message
+            self._touch()
+
+    def snapshot(self):
+        with self._condition:
+            return {
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "status": self.status,
+                "partial": self.partial,
+                "progress": self.progress,
+                "message": self.message,
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "version": self.version
+            }
+
+    def _touch(self):
+        self.version += 1
+        self._condition.notify_all()
+
+
+class JobQueue:
+    """Streamlit 스크립트 실행과 분리된 백그라운드 생성 작업 대기열
+
+    작업은 프로세스 전체가 공유하는 스레드 풀에서 실행되고 작업 ID로 조회하므로,
+    버튼 클릭이나 연결 끊김으로 스크립트가 다시 실행되어도 진행 중인 Bedrock 호출과
+    결과가 사라지지 않습니다. 끝난 작업은 ttl_seconds 동안 보관하며, 보관 개수가
+    max_finished_jobs를 넘으면 오래된 것부터 삭제합니다.
+
+    대화형 작업(아이디어/PRD)은 max_workers개, 대량/배치 작업은 bulk_workers개의 스레드를 가진
+    별도 풀에서 실행하므로, 몇 시간씩 걸리는 대량 작업이 대화형 요청의 자리를 차지하지 않습니다.
+    """
+
+    def __init__(self, max_workers=8, bulk_workers=2, max_finished_jobs=500, ttl_seconds=60 * 60):
+        self.max_finished_jobs = max_finished_jobs
+        self.ttl_seconds = ttl_seconds
+        self._executors = {
+            INTERACTIVE_POOL: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation-job"),
+            BULK_POOL: ThreadPoolExecutor(max_workers=bulk_workers, thread_name_prefix="bulk-job")
+        }
+        self._condition = threading.Condition()
+        self._jobs = {}
+
+    def submit(self, kind, fn, pool=INTERACTIVE_POOL):
+        """fn(job)을 pool 스레드 풀에서 실행하도록 등록하고 작업 ID 반환"""
+        executor = self._executors[pool]
+        with self._condition:
+            self._evict(time.time())
+            job = Job(uuid.uuid4().hex, kind, self._condition)
+            self._jobs[job.job_id] = job
+        executor.submit(self._run, job, fn)
+        return job.job_id
+
+    def get(self, job_id):
+        """작업 상태 스냅샷 (없거나 만료된 작업이면 None)"""
+        with self._condition:
+            job = self._jobs.get(job_id)
+        return job.snapshot() if job else None
+
+    def wait(self, job_id, since_version=0, timeout=1.0):
+        """작업이 since_version 이후로 갱신되거나 끝날 때까지 기다린 뒤 스냅샷 반환"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            while job.version <= since_version and job.status in ACTIVE_JOB_STATES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(timeout=remaining)
+        return job.snapshot()
+
+    def stats(self):
+        """상태별 작업 수"""
+        with self._condition:
+            counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_ERROR: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _run(self, job, fn):
+        with self._condition:
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            job._touch()
+        try:
+            result = fn(job)
+        except Exception as e:
+            with self._condition:
+                job.status = JOB_ERROR
+                job.error = str(e)
+                job.finished_at = time.time()
+                job._touch()
+            return
+        with self._condition:
+            job.status = JOB_DONE
+            job.result = result
+            job.finished_at = time.time()
+            job._touch()
+
+    def _evict(self, now):
+        finished = sorted(
+            (job for job in self._jobs.values() if job.status not in ACTIVE_JOB_STATES),
+            key=lambda job: job.finished_at
+        )
+        excess = len(finished) - self.max_finished_jobs
+        for index, job in enumerate(finished):
+            if index < excess or now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job.job_id]
@@ -0,0 +1,238 @@
+"""생성 경로 부하 테스트 (기본값은 로컬 bedrock-runtime 대역 서버를 사용하므로 비용 없음)
+
+N개의 동시 세션이 각각 요청을 순서대로 보내는 상황을 흉내 내어 처리량, 지연 시간
+p50/p95/p99, 이어쓰기/스로틀링으로 늘어난 업스트림 호출 배수, 세션당 메모리를 보고합니다.
+
+    python load_benchmark.py --sessions 20 --requests 3 --scenario flow
+    python load_benchmark.py --sessions 50 --stop-mix end_turn=0.7,max_tokens=0.3 --throttle-rate 0.05 --json result.json
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from bedrock_stub import BedrockStubServer, parse_stop_mix
+
+# 생성기 모듈(hackathon_generator 등)은 불러올 때 BEDROCK_REGIONS를 읽으므로
+# 대역 서버 주소를 환경 변수에 넣은 뒤 main()에서 불러옴
+
+SCENARIOS = ["idea", "prd", "introduction", "flow"]
+
+
+class UpstreamCounter:
+    """엔진이 실제로 보낸 Bedrock 호출 수를 세는 메트릭 훅"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def __call__(self, event):
+        if event.get("operation") not in ("invoke", "stream"):
+            return
+        with self._lock:
+            self.calls += 1
+            if event.get("error"):
+                self.errors += 1
+
+
+def is_error_text(text):
+    return text.startswith("❌") or text.startswith("⏳")
+
+
+def run_session(generators, scenario, session_index, requests, idea_length, stream, records, lock):
+    """세션 하나가 요청을 순서대로 보내고 요청별 기록을 records에 추가"""
+    hackathon_generator, introduction_generator = generators
+    on_chunk = (lambda text: None) if stream else None
+
+    for request_index in range(requests):
+        # 요청마다 입력을 달리하여 응답 캐시/요청 합치기가 측정을 가리지 않도록 함
+        tag = f"세션{session_index}-요청{request_index}"
+        steps = ["idea", "prd"] if scenario == "flow" else [scenario]
+        idea_text = f"{tag} 음식물 쓰레기 감소를 위한 AI 리빙랩 아이디어"
+
+        for step in steps:
+            metrics = {}
+            start_time = time.perf_counter()
+            if step == "idea":
+                text = hackathon_generator.generate_hackathon_idea_with_nova(
+                    "폐기물 관리", f"{tag} 음식물 쓰레기 문제", "자연어 처리", "일반 가정", "쓰레기 30% 감소",
+                    idea_length, on_chunk=on_chunk, metrics=metrics, fresh=True
+                )
+                idea_text = text
+            elif step == "prd":
+                text = hackathon_generator.generate_streamlit_prd(idea_text, on_chunk=on_chunk, metrics=metrics, fresh=True)
+            else:
+                text = introduction_generator.generate_introduction_with_nova(
+                    f"{tag} 홍길동", "컴퓨터공학과", "독서", "웹 개발 프로젝트", "소프트웨어 개발자", on_chunk=on_chunk
+                )
+            record = {
+                "step": step,
+                "status": "error" if is_error_text(text) else "ok",
+                "latency": time.perf_counter() - start_time,
+                "ttft": metrics.get("ttft"),
+                "continuation_rounds": metrics.get("continuation_rounds", 0),
+                "stop_reason": metrics.get("stop_reason")
+            }
+            with lock:
+                records.append(record)
+
+
+def summarize(records, elapsed, sessions, upstream, stub_stats, memory):
+    from bulk_generation import percentile
+    succeeded = [record for record in records if record["status"] == "ok"]
+    latencies = [record["latency"] for record in succeeded]
+    ttfts = [record["ttft"] for record in succeeded if record["ttft"] is not None]
+    summary = {
+        "sessions": sessions,
+        "requests": len(records),
+        "succeeded": len(succeeded),
+        "failed": len(records) - len(succeeded),
+        "elapsed_seconds": elapsed,
+        "requests_per_second": len(succeeded) / elapsed if elapsed else 0.0,
+        "p50_latency": percentile(latencies, 0.50),
+        "p95_latency": percentile(latencies, 0.95),
+        "p99_latency": percentile(latencies, 0.99),
+        "p50_ttft": percentile(ttfts, 0.50),
+        "p95_ttft": percentile(ttfts, 0.95),
+        "continuation_rounds": sum(record["continuation_rounds"] for record in records),
+        # 논리 요청 하나당 엔진이 보낸 호출 수 (이어쓰기 + 스로틀링 재시도 + 섹션 호출 포함)
+        "engine_calls": upstream.calls,
+        "engine_amplification": upstream.calls / len(records) if records else 0.0,
+        "memory_peak_bytes": memory["peak"],
+        "memory_per_session_bytes": memory["peak"] / sessions if sessions else 0,
+        "memory_retained_bytes": memory["retained"]
+    }
+    if stub_stats:
+        # SDK 재시도까지 포함해 대역 서버가 실제로 받은 요청 수
+        summary["stub_requests"] = stub_stats["requests"]
+        summary["stub_amplification"] = stub_stats["requests"] / len(records) if records else 0.0
+        summary["stub_throttled"] = stub_stats["throttled"]
+        summary["stub_stop_reasons"] = stub_stats["stop_reasons"]
+    return summary
+
+
+def format_report(summary):
+    def seconds(value):
+        return f"{value:.2f}초" if value is not None else "-"
+
+    lines = [
+        f"👥 세션 {summary['sessions']}개 · 요청 {summary['requests']}건 (성공 {summary['succeeded']} / 실패 {summary['failed']})",
+        f"⏱️ 전체 {summary['elapsed_seconds']:.1f}초 · 처리량 {summary['requests_per_second']:.2f}건/초",
+        f"📈 지연 시간 p50 {seconds(summary['p50_latency'])} · p95 {seconds(summary['p95_latency'])} · p99 {seconds(summary['p99_latency'])}",
+        f"⚡ 첫 토큰 p50 {seconds(summary['p50_ttft'])} · p95 {seconds(summary['p95_ttft'])}",
+        f"🔁 이어쓰기 {summary['continuation_rounds']}회 · 엔진 호출 {summary['engine_calls']}회 (요청당 {summary['engine_amplification']:.2f}배)",
+        f"🧠 메모리 최대 {summary['memory_peak_bytes'] / 1024:,.0f}KB · 세션당 {summary['memory_per_session_bytes'] / 1024:,.1f}KB"
+        f" · 종료 후 남은 메모리 {summary['memory_retained_bytes'] / 1024:,.0f}KB"
+    ]
+    if "stub_requests" in summary:
+        lines.append(
+            f"🧪 대역 서버 요청 {summary['stub_requests']}회 (요청당 {summary['stub_amplification']:.2f}배) · "
+            f"스로틀링 {summary['stub_throttled']}회 · 종료 이유 {summary['stub_stop_reasons']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동시 세션 부하로 생성 경로의 처리량과 지연 시간을 측정합니다.")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수 (기본값: 10)")
+    parser.add_argument("--requests", type=int, default=3, help="세션당 요청 수 (기본값: 3)")
+    parser.add_argument("--scenario", default="idea", choices=SCENARIOS, help="flow는 아이디어 생성 후 그 아이디어로 PRD 생성")
+    parser.add_argument("--idea-length", default="보통", choices=["간단", "보통", "상세"])
+    parser.add_argument("--no-stream", action="store_true", help="스트리밍 대신 블로킹 호출 사용")
+    parser.add_argument("--rpm", type=int, default=None, help="호출 속도 조절기 분당 요청 수 (기본값: 앱 설정)")
+    parser.add_argument("--tpm", type=int, default=None, help="호출 속도 조절기 분당 토큰 수 (기본값: 앱 설정)")
+    parser.add_argument("--live", action="store_true", help="대역 서버 대신 BEDROCK_REGIONS의 실제 Bedrock 호출 (비용 발생)")
+    parser.add_argument("--keep-state", action="store_true", help="현재 디렉터리의 응답 캐시/토큰 예산 DB 사용 (기본값: 임시 디렉터리)")
+    parser.add_argument("--json", help="요약을 JSON으로 저장할 경로")
+    stub_group = parser.add_argument_group("대역 서버 설정")
+    stub_group.add_argument("--stub-regions", type=int, default=1, help="대역 서버 수 (리전 풀 분배 확인용)")
+    stub_group.add_argument("--ttft-median", type=float, default=0.4)
+    stub_group.add_argument("--ttft-sigma", type=float, default=0.5)
+    stub_group.add_argument("--tokens-per-second", type=float, default=120.0)
+    stub_group.add_argument("--output-tokens-mean", type=int, default=700)
+    stub_group.add_argument("--output-tokens-sigma", type=int, default=200)
+    stub_group.add_argument("--stop-mix", default="end_turn=0.9,max_tokens=0.1")
+    stub_group.add_argument("--throttle-rate", type=float, default=0.0)
+    stub_group.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    stubs = []
+    if not args.live:
+        for _ in range(args.stub_regions):
+            stubs.append(BedrockStubServer(
+                ttft_median=args.ttft_median, ttft_sigma=args.ttft_sigma, tokens_per_second=args.tokens_per_second,
+                output_tokens_mean=args.output_tokens_mean, output_tokens_sigma=args.output_tokens_sigma,
+                stop_mix=parse_stop_mix(args.stop_mix), throttle_rate=args.throttle_rate, seed=args.seed
+            ).start())
+        # 생성기 모듈을 불러오기 전에 리전 풀이 대역 서버를 보도록 설정
+        os.environ["BEDROCK_REGIONS"] = ",".join(f"stub-{index}={stub.endpoint_url}" for index, stub in enumerate(stubs))
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "stub")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "stub")
+    if args.json:
+        args.json = os.path.abspath(args.json)
+    if not args.keep_state:
+        os.chdir(tempfile.mkdtemp(prefix="load_benchmark_"))
+
+    hackathon_generator = importlib.import_module("hackathon_generator")
+    introduction_generator = importlib.import_module("introduction_generator")
+    if args.rpm:
+        hackathon_generator.BEDROCK_REQUESTS_PER_MINUTE = args.rpm
+    if args.tpm:
+        hackathon_generator.BEDROCK_TOKENS_PER_MINUTE = args.tpm
+
+    upstream = UpstreamCounter()
+    hackathon_generator.add_metrics_hook(upstream)
+
+    records = []
+    lock = threading.Lock()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=((hackathon_generator, introduction_generator), args.scenario, index, args.requests,
+                  args.idea_length, not args.no_stream, records, lock)
+        )
+        for index in range(args.sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start_time
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    stub_stats = None
+    if stubs:
+        stub_stats = {"requests": 0, "throttled": 0, "stop_reasons": {}}
+        for stub in stubs:
+            stats = stub.stats()
+            stub_stats["requests"] += stats["requests"]
+            stub_stats["throttled"] += stats["throttled"]
+            for reason, count in stats["stop_reasons"].items():
+                stub_stats["stop_reasons"][reason] = stub_stats["stop_reasons"].get(reason, 0) + count
+            stub.stop()
+
+    summary = summarize(records, elapsed, args.sessions, upstream, stub_stats, {"peak": peak, "retained": retained})
+    print(format_report(summary))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from nova_engine import NOVA_LITE_MODEL_ID
+
+NOVA_MICRO_MODEL_ID = "amazon.nova-micro-v1:0"
+NOVA_PRO_MODEL_ID = "amazon.nova-pro-v1:0"
+
+# 요청 종류별 후보 모델 (앞쪽이 기본 모델, 뒤쪽이 대체 모델)
+ROUTE_CANDIDATES = {
+    "간단": [NOVA_MICRO_MODEL_ID, NOVA_LITE_MODEL_ID],
+    "보통": [NOVA_LITE_MODEL_ID, NOVA_MICRO_MODEL_ID],
+    "상세": [NOVA_LITE_MODEL_ID, NOVA_PRO_MODEL_ID],
+    "prd": [NOVA_LITE_MODEL_ID, NOVA_PRO_MODEL_ID]
+}
+
+# 요청 종류별 호출 1회 지연 시간 예산 (초) - 롤링 p95가 넘으면 대체 모델을 먼저 사용
+LATENCY_BUDGETS = {
+    "간단": 8.0,
+    "보통": 15.0,
+    "상세": 30.0,
+    "prd": 30.0
+}
+
+# 이보다 긴 프롬프트는 Micro 모델로 보내지 않음 (글자 수)
+MICRO_MAX_PROMPT_CHARS = 6000
+
+# 지연 시간 히스토그램 구간 경계 (초)
+LATENCY_BUCKETS = [0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0]
+
+
+class ModelRouter:
+    """요청별로 Nova 모델을 고르고 관측된 지연 시간으로 순서를 조정하는 라우터
+
+    요청 종류(길이 옵션 또는 PRD)와 프롬프트 크기로 후보 모델을 정하고, 같은 요청 종류에서
+    모델의 최근 지연 시간 p95가 예산을 넘거나 최근에 스로틀링된 모델은 뒤로 미룹니다.
+    메트릭 훅으로 등록하면 모든 invoke/stream 이벤트의 지연 시간을 (요청 종류, 모델)별로
+    기록하므로, 긴 상세/PRD 호출이 짧은 간단/보통 예산과 비교되지 않습니다.
+    """
+
+    def __init__(self, window_size=100, min_samples=5, throttle_cooldown=30.0):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.throttle_cooldown = throttle_cooldown
+        self._lock = threading.Lock()
+        self._latencies = {}  # (요청 종류, 모델) -> 최근 지연 시간
+        self._histograms = {}
+        self._throttled_until = {}
+        self._decisions = {}
+        self._fallbacks = {}
+
+    def __call__(self, event):
+        if event.get("operation") not in ("invoke", "stream") or event.get("error") or not event.get("model_id"):
+            return
+        self.record_latency(event["model_id"], event["latency"], event.get("route_key") or "")
+
+    def route(self, route_key, prompt_chars=0):
+        """후보 모델 순서와 선택 이유 {"models", "primary", "reason", "budget"}"""
+        candidates = list(ROUTE_CANDIDATES.get(route_key, ROUTE_CANDIDATES["prd"]))
+        budget = LATENCY_BUDGETS.get(route_key, LATENCY_BUDGETS["prd"])
+        reason = "default"
+
+        if prompt_chars > MICRO_MAX_PROMPT_CHARS and NOVA_MICRO_MODEL_ID in candidates and len(candidates) > 1:
+            candidates.remove(NOVA_MICRO_MODEL_ID)
+            reason = "prompt_size"
+
+        now = time.monotonic()
+        with self._lock:
+            primary = candidates[0]
+            if self._throttled_until.get(primary, 0.0) > now:
+                healthy = [model for model in candidates if self._throttled_until.get(model, 0.0) <= now]
+                if healthy:
+                    candidates.remove(healthy[0])
+                    candidates.insert(0, healthy[0])
+                    reason = "throttled"
+            else:
+                p95 = self._p95(route_key, primary)
+                if p95 is not None and p95 > budget:
+                    # 기록이 없거나 예산 안인 대체 모델 중 첫 번째로 전환
+                    for model in candidates[1:]:
+                        alternative = self._p95(route_key, model)
+                        if alternative is None or alternative <= budget:
+                            candidates.remove(model)
+                            candidates.insert(0, model)
+                            reason = "latency"
+                            break
+
+            decision_key = (route_key, candidates[0], reason)
+            self._decisions[decision_key] = self._decisions.get(decision_key, 0) + 1
+
+        return {"models": candidates, "primary": candidates[0], "reason": reason, "budget": budget}
+
+    def record_latency(self, model_id, latency, route_key=""):
+        with self._lock:
+            samples = self._latencies.setdefault((route_key, model_id), deque(maxlen=self.window_size))
+            samples.append(latency)
+            histogram = self._histograms.setdefault((route_key, model_id), [0] * (len(LATENCY_BUCKETS) + 1))
+            histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_throttle(self, model_id):
+        """스로틀링된 모델은 throttle_cooldown 동안 후순위로 미룸"""
+        with self._lock:
+            self._throttled_until[model_id] = time.monotonic() + self.throttle_cooldown
+
+    def record_fallback(self, from_model, to_model):
+        with self._lock:
+            key = (from_model, to_model)
+            self._fallbacks[key] = self._fallbacks.get(key, 0) + 1
+
+    def report(self):
+        """(요청 종류, 모델)별 지연 시간 요약/히스토그램과 라우팅 결정, 대체 호출 횟수"""
+        with self._lock:
+            labels = [f"≤{bound:g}초" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}초"]
+            models = []
+            for (route_key, model_id), samples in sorted(self._latencies.items()):
+                models.append({
+                    "요청 종류": route_key or "-",
+                    "모델": model_id,
+                    "표본 수": len(samples),
+                    "p50": round(self._percentile(samples, 0.50), 2),
+                    "p95": round(self._percentile(samples, 0.95), 2),
+                    **dict(zip(labels, self._histograms[(route_key, model_id)]))
+                })
+            decisions = [
+                {"요청 종류": route_key, "선택 모델": model_id, "이유": reason, "횟수": count}
+                for (route_key, model_id, reason), count in sorted(self._decisions.items())
+            ]
+            fallbacks = [
+                {"기본 모델": from_model, "대체 모델": to_model, "횟수": count}
+                for (from_model, to_model), count in sorted(self._fallbacks.items())
+            ]
+        return {"models": models, "decisions": decisions, "fallbacks": fallbacks}
+
+    def _p95(self, route_key, model_id):
+        samples = self._latencies.get((route_key, model_id))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return self._percentile(samples, 0.95)
+
+    @staticmethod
+    def _percentile(samples, fraction):
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(fraction * len(ordered)))
+        return ordered[rank - 1]
@@ -0,0 +1,422 @@
+import boto3
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from botocore.config import Config
+
+NOVA_LITE_MODEL_ID = "amazon.nova-lite-v1:0"
+DEFAULT_REGION = "us-east-1"
+
+# bedrock-runtime 클라이언트 연결 설정
+# - 여러 세션/작업자 스레드가 한 클라이언트를 공유하므로 연결 풀을 넉넉하게 유지
+# - 스로틀링 재시도는 호출 속도 조절기가 담당하므로 botocore 재시도는 네트워크 오류 대비 1회만 허용
+CLIENT_CONFIG = Config(
+    connect_timeout=5,
+    read_timeout=120,
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"total_max_attempts": 2, "mode": "standard"}
+)
+
+# 잘린 응답 이어쓰기 설정
+CONTINUATION_MAX_ROUNDS = 3  # 최대 이어쓰기 횟수
+CONTINUATION_MAX_TOKENS = 1000  # 이어쓰기 1회당 최대 토큰
+CONTINUATION_OVERLAP_WINDOW = 200  # 이음새 중복 검사 범위 (글자 수)
+
+# Bedrock 프롬프트 캐싱(cachePoint)을 지원하는 모델
+PROMPT_CACHE_MODELS = {
+    "amazon.nova-micro-v1:0",
+    "amazon.nova-lite-v1:0",
+    "amazon.nova-pro-v1:0"
+}
+
+_metrics_hooks = []
+
+# 현재 실행 흐름의 모든 측정 이벤트에 덧붙일 필드 (생성기, 길이 옵션 등)
+_metrics_context = contextvars.ContextVar("metrics_context", default={})
+
+
+def create_bedrock_client(region_name=DEFAULT_REGION, endpoint_url=None):
+    """연결 풀/keep-alive/타임아웃/재시도가 조정된 bedrock-runtime 클라이언트 생성
+
+    endpoint_url을 주면 로컬 스텁 서버 등 다른 엔드포인트로 요청을 보냅니다.
+    """
+    return boto3.client('bedrock-runtime', region_name=region_name, endpoint_url=endpoint_url, config=CLIENT_CONFIG)
+
+
+def supports_prompt_cache(model_id):
+    """모델이 Bedrock 프롬프트 캐싱(cachePoint)을 지원하는지 확인"""
+    return model_id in PROMPT_CACHE_MODELS
+
+
+def build_request_body(prompt, inference_config, assistant_prefill=None, prompt_prefix=None, model_id=None):
+    """Nova messages API 요청 본문 구성 (assistant_prefill이 있으면 응답 앞부분으로 미리 채움)
+
+    prompt_prefix는 호출마다 바뀌지 않는 정적 앞부분으로, 모델이 프롬프트 캐싱을 지원하면
+    뒤에 cachePoint를 두어 Bedrock이 캐시하도록 하고, 지원하지 않으면 prompt 앞에 붙입니다.
+    """
+    if prompt_prefix and supports_prompt_cache(model_id):
+        content = [{"text": prompt_prefix}, {"cachePoint": {"type": "default"}}, {"text": prompt}]
+    elif prompt_prefix:
+        content = [{"text": prompt_prefix + prompt}]
+    else:
+        content = [{"text": prompt}]
+    messages = [{"role": "user", "content": content}]
+    if assistant_prefill:
+        messages.append({"role": "assistant", "content": [{"text": assistant_prefill}]})
+    return {"messages": messages, "inferenceConfig": dict(inference_config)}
+
+
+def estimate_request_tokens(request_body):
+    """요청 하나가 차지할 토큰 수 추정 (입력 글자 수 기반 추정 + 요청한 maxTokens)"""
+    input_chars = sum(
+        len(block.get('text', ''))
+        for message in request_body["messages"]
+        for block in message["content"]
+    )
+    # 한국어 프롬프트는 대략 2글자당 1토큰 이상이므로 보수적으로 추정
+    return input_chars // 2 + request_body["inferenceConfig"]["maxTokens"]
+
+
+def add_metrics_hook(hook):
+    """모든 호출/측정 구간이 끝날 때마다 hook(event)를 호출하도록 등록"""
+    if hook not in _metrics_hooks:
+        _metrics_hooks.append(hook)
+
+
+def remove_metrics_hook(hook):
+    if hook in _metrics_hooks:
+        _metrics_hooks.remove(hook)
+
+
+@contextmanager
+def metrics_context(**fields):
+    """블록 안에서 같은 스레드가 보내는 측정 이벤트에 fields를 덧붙임 (이벤트의 값이 우선)"""
+    token = _metrics_context.set(dict(_metrics_context.get(), **fields))
+    try:
+        yield
+    finally:
+        _metrics_context.reset(token)
+
+
+def emit_metrics(event):
+    """등록된 훅에 측정 이벤트 전달 (훅 오류가 호출 경로를 깨지 않도록 무시)"""
+    context = _metrics_context.get()
+    if context:
+        event = dict(context, **event)
+    for hook in list(_metrics_hooks):
+        try:
+            hook(event)
+        except Exception:
+            pass
+
+
+@contextmanager
+def measure(label, operation, **fields):
+    """임의의 구간을 Bedrock 호출과 같은 형태의 이벤트로 측정
+
+    블록 안에서 yield된 딕셔너리에 값을 채우면 이벤트에 함께 기록됩니다.
+    """
+    event = {"label": label, "operation": operation, "error": None}
+    event.update(fields)
+    start_time = time.perf_counter()
+    try:
+        yield event
+    except Exception as e:
+        event["error"] = type(e).__name__
+        raise
+    finally:
+        event["latency"] = time.perf_counter() - start_time
+        emit_metrics(event)
+
+
+def extract_text(response_body):
+    """Nova 응답 본문에서 생성된 텍스트 추출 (없으면 빈 문자열)"""
+    content = response_body.get('output', {}).get('message', {}).get('content')
+    if content and len(content) > 0 and 'text' in content[0]:
+        return content[0]['text']
+    return ""
+
+
+def invoke_nova_response(bedrock_client, model_id, request_body, label=None, metrics_fields=None):
+    """Nova 블로킹 호출 결과를 스트리밍 호출과 같은 형태로 반환"""
+    with measure(label, "invoke", model_id=model_id, **(metrics_fields or {})) as event:
+        start_time = time.perf_counter()
+
+        response = bedrock_client.invoke_model(
+            modelId=model_id,
+            body=json.dumps(request_body)
+        )
+
+        # 응답 파싱
+        response_body = json.loads(response.get('body').read())
+        latency = time.perf_counter() - start_time
+
+        # 블로킹 호출은 전체 응답이 한 번에 도착하므로 첫 토큰 시간 = 전체 지연 시간
+        result = {
+            "text": extract_text(response_body),
+            # Nova는 stopReason을 최상위에 담아 응답함 (output 안에 있는 형식도 허용)
+            "stop_reason": response_body.get('stopReason') or response_body.get('output', {}).get('stopReason'),
+            "usage": response_body.get('usage'),
+            "ttft": latency,
+            "latency": latency
+        }
+        event.update(ttft=latency, stop_reason=result["stop_reason"], usage=result["usage"])
+        return result
+
+
+def stream_nova_response(bedrock_client, model_id, request_body, on_chunk=None, label=None, metrics_fields=None):
+    """Nova 스트리밍 응답을 청크 단위로 전달하고 최종 텍스트와 지연 시간을 반환"""
+    with measure(label, "stream", model_id=model_id, **(metrics_fields or {})) as event:
+        start_time = time.perf_counter()
+        first_token_time = None
+        generated_text = ""
+        stop_reason = None
+        usage = None
+
+        response = bedrock_client.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=json.dumps(request_body)
+        )
+
+        # 소비 중 예외(on_chunk 오류 등)가 나도 스트림을 닫아 리전 풀의 진행 중 호출 수를 바로 반환
+        body = response.get('body')
+        try:
+            for stream_event in body:
+                chunk = stream_event.get('chunk')
+                if not chunk:
+                    continue
+
+                chunk_body = json.loads(chunk.get('bytes').decode('utf-8'))
+
+                # 텍스트 조각이 도착할 때마다 누적 후 콜백으로 전달
+                if 'contentBlockDelta' in chunk_body:
+                    text = chunk_body['contentBlockDelta'].get('delta', {}).get('text', '')
+                    if text:
+                        if first_token_time is None:
+                            first_token_time = time.perf_counter()
+                        generated_text += text
+                        if on_chunk:
+                            on_chunk(generated_text)
+                elif 'messageStop' in chunk_body:
+                    stop_reason = chunk_body['messageStop'].get('stopReason')
+                elif 'metadata' in chunk_body:
+                    usage = chunk_body['metadata'].get('usage')
+        finally:
+            close = getattr(body, 'close', None)
+            if close:
+                close()
+
+        result = {
+            "text": generated_text,
+            "stop_reason": stop_reason,
+            "usage": usage,
+            "ttft": (first_token_time - start_time) if first_token_time else None,
+            "latency": time.perf_counter() - start_time
+        }
+        event.update(ttft=result["ttft"], stop_reason=stop_reason, usage=usage)
+        return result
+
+
+def stitch_continuation(previous_text, continuation_text):
+    """이어쓴 텍스트를 붙이면서 이음새에서 반복된 부분을 제거"""
+    # 앞 텍스트의 끝과 이어쓴 텍스트의 시작이 겹치는 가장 긴 구간을 찾음
+    max_overlap = min(len(previous_text), len(continuation_text), CONTINUATION_OVERLAP_WINDOW)
+    for size in range(max_overlap, 0, -1):
+        if previous_text.endswith(continuation_text[:size]):
+            return previous_text + continuation_text[size:]
+    return previous_text + continuation_text
+
+
+def generate_with_continuation(bedrock_client, model_id, prompt, inference_config, on_chunk=None,
+                               governor=None, priority="interactive", max_retries=None, label=None,
+                               prompt_prefix=None):
+    """max_tokens로 잘린 응답을 처음부터 다시 만들지 않고 이어서 생성
+
+    부분 응답을 assistant 메시지로 미리 채워 보내 모델이 멈춘 지점부터 계속 작성하게 하고,
+    응답이 완료되거나 이어쓰기 예산(CONTINUATION_MAX_ROUNDS)을 모두 쓸 때까지 반복합니다.
+    governor가 주어지면 각 호출은 priority 우선순위로 호출 속도 조절기를 거치며,
+    스로틀링 시 재시도합니다. prompt_prefix는 프롬프트 캐싱 대상인 정적 앞부분입니다.
+    결과는 text, stop_reason, usage, ttft, latency, continuation_rounds, queue_wait,
+    attempts를 담은 딕셔너리입니다.
+    """
+    config = dict(inference_config)
+    generated_text = ""
+    first_ttft = None
+    total_latency = 0.0
+    queue_wait = 0.0
+    attempts = 0
+    usage = {"inputTokens": 0, "outputTokens": 0}
+    rounds = 0
+    
+    # 프롬프트 캐시 효과 측정용 정보 (캐싱 미지원 모델은 로컬에서 재사용 가능 토큰을 추정)
+    metrics_fields = None
+    if prompt_prefix:
+        metrics_fields = {
+            "prefix_key": hashlib.sha256(prompt_prefix.encode('utf-8')).hexdigest()[:16],
+            "prefix_tokens": len(prompt_prefix) // 2,
+            "prompt_cache_supported": supports_prompt_cache(model_id)
+        }
+
+    while True:
+        # 모델은 끝 공백이 있는 assistant 메시지를 받지 않으므로 잘라서 보냄
+        prefill = generated_text.rstrip()
+        seam = generated_text[len(prefill):]
+        request_body = build_request_body(prompt, config, prefill, prompt_prefix, model_id)
+        # 몇 번째 이어쓰기 호출인지 함께 기록 (0은 첫 호출)
+        round_fields = dict(metrics_fields or {}, continuation_round=rounds)
+
+        if on_chunk:
+            call = lambda: stream_nova_response(
+                bedrock_client, model_id, request_body,
+                lambda text: on_chunk(prefill + text), label, round_fields
+            )
+        else:
+            call = lambda: invoke_nova_response(bedrock_client, model_id, request_body, label, round_fields)
+
+        # 대기열/속도 제한/스로틀링 백오프에 쓴 시간은 모델 지연 시간과 구분하여 기록
+        call_start = time.perf_counter()
+        if governor:
+            result, call_attempts = governor.execute(call, estimate_request_tokens(request_body), priority, max_retries)
+        else:
+            result, call_attempts = call(), 1
+        call_queue_wait = time.perf_counter() - call_start - result["latency"]
+        queue_wait += call_queue_wait
+        attempts += call_attempts
+        emit_metrics({
+            "label": label, "operation": "queue_wait", "model_id": model_id, "error": None,
+            "latency": call_queue_wait, "attempts": call_attempts
+        })
+
+        piece = result["text"]
+        if prefill:
+            # 잘라낸 이음새 공백은 이어쓴 텍스트가 공백으로 시작하지 않을 때만 복원
+            if piece and not piece[0].isspace():
+                piece = seam + piece
+            generated_text = stitch_continuation(prefill, piece)
+        else:
+            generated_text = piece
+
+        if first_ttft is None:
+            first_ttft = result["ttft"]
+        total_latency += result["latency"]
+        # 프롬프트 캐시 읽기/쓰기 토큰 등 응답에 있는 모든 사용량 항목을 합산
+        for key, value in (result["usage"] or {}).items():
+            if isinstance(value, (int, float)):
+                usage[key] = usage.get(key, 0) + value
+
+        stop_reason = result["stop_reason"]
+        if stop_reason != 'max_tokens' or not piece.strip() or rounds >= CONTINUATION_MAX_ROUNDS:
+            break
+
+        rounds += 1
+        config["maxTokens"] = CONTINUATION_MAX_TOKENS
+
+    if on_chunk:
+        on_chunk(generated_text)
+
+    return {
+        "text": generated_text,
+        "stop_reason": stop_reason,
+        "usage": usage,
+        "ttft": first_ttft,
+        "latency": total_latency,
+        "continuation_rounds": rounds,
+        "queue_wait": queue_wait,
+        "attempts": attempts
+    }
+
+
+class InvocationStats:
+    """측정 이벤트를 "label/operation"별로 모으는 메트릭 훅 (호출 수, 오류, 지연 시간, 토큰)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels = {}
+
+    def __call__(self, event):
+        with self._lock:
+            key = f"{event.get('label') or 'unlabeled'}/{event.get('operation')}"
+            stats = self._labels.setdefault(key, {
+                "calls": 0,
+                "errors": 0,
+                "total_latency": 0.0,
+                "max_latency": 0.0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cache_read_tokens": 0,
+                "cache_write_tokens": 0,
+                "stop_reasons": {}
+            })
+            stats["calls"] += 1
+            if event.get("error"):
+                stats["errors"] += 1
+            stats["total_latency"] += event["latency"]
+            stats["max_latency"] = max(stats["max_latency"], event["latency"])
+            usage = event.get("usage") or {}
+            stats["input_tokens"] += usage.get("inputTokens", 0)
+            stats["output_tokens"] += usage.get("outputTokens", 0)
+            stats["cache_read_tokens"] += usage.get("cacheReadInputTokenCount", 0)
+            stats["cache_write_tokens"] += usage.get("cacheWriteInputTokenCount", 0)
+            if event.get("stop_reason"):
+                reasons = stats["stop_reasons"]
+                reasons[event["stop_reason"]] = reasons.get(event["stop_reason"], 0) + 1
+
+    def snapshot(self):
+        """"label/operation"별 통계 복사본 (평균 지연 시간 포함)"""
+        with self._lock:
+            snapshot = {}
+            for label, stats in self._labels.items():
+                copied = dict(stats, stop_reasons=dict(stats["stop_reasons"]))
+                copied["average_latency"] = stats["total_latency"] / stats["calls"] if stats["calls"] else 0.0
+                snapshot[label] = copied
+            return snapshot
+
+
+class PromptCacheStats:
+    """정적 프롬프트 앞부분의 캐시 효과를 모으는 메트릭 훅
+
+    프롬프트 캐싱을 지원하는 모델은 Bedrock이 보고한 캐시 읽기/쓰기 토큰을 그대로 모으고,
+    지원하지 않는 모델은 같은 앞부분이 이전에 전송된 적이 있으면 그 추정 토큰 수를
+    캐싱했다면 절약할 수 있었던 입력 토큰으로 기록합니다.
+    """
+
+    def __init__(self, max_prefixes=1024):
+        self.max_prefixes = max_prefixes
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+        self._stats = {
+            "calls": 0,
+            "input_tokens": 0,
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+            "local_reusable_tokens": 0
+        }
+
+    def __call__(self, event):
+        if not event.get("prefix_key") or event.get("operation") not in ("invoke", "stream"):
+            return
+        usage = event.get("usage") or {}
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["input_tokens"] += usage.get("inputTokens", 0)
+            if event.get("prompt_cache_supported"):
+                self._stats["cache_read_tokens"] += usage.get("cacheReadInputTokenCount", 0)
+                self._stats["cache_write_tokens"] += usage.get("cacheWriteInputTokenCount", 0)
+            elif event["prefix_key"] in self._seen_prefixes:
+                self._stats["local_reusable_tokens"] += event.get("prefix_tokens", 0)
+            elif len(self._seen_prefixes) < self.max_prefixes:
+                self._seen_prefixes.add(event["prefix_key"])
+
+    def snapshot(self):
+        """누적 캐시 토큰과 전체 입력 토큰 대비 절약 비율"""
+        with self._lock:
+            stats = dict(self._stats)
+        # Bedrock은 캐시에서 읽은 토큰을 inputTokens와 별도로 보고함
+        total_input = stats["input_tokens"] + stats["cache_read_tokens"]
+        saved = stats["cache_read_tokens"] + stats["local_reusable_tokens"]
+        stats["saved_ratio"] = saved / total_input if total_input else 0.0
+        return stats
@@ -0,0 +1,53 @@
+import threading
+import time
+from nova_engine import emit_metrics
+
+# 세션마다 보관하는 최근 재실행 기록 수
+RERUN_HISTORY_SIZE = 20
+
+_local = threading.local()
+
+
+def begin_rerun_probe(scope, root=False):
+    """화면 재실행 구간 측정 시작 (scope는 "app" 또는 프래그먼트 이름)
+
+    다른 측정 구간 안에서 시작하면(전체 재실행 중에 실행되는 프래그먼트) nested가 True입니다.
+    root=True(스크립트 맨 앞)이면 st.rerun() 등으로 중단되어 끝나지 못한 이전 구간을 버립니다.
+    """
+    if root:
+        _local.probes = []
+    probes = _local.__dict__.setdefault("probes", [])
+    probe = {"scope": scope, "nested": bool(probes), "job_wait": 0.0, "started_at": time.perf_counter()}
+    probes.append(probe)
+    return probe
+
+
+def record_job_wait(seconds):
+    """진행 중인 측정 구간에서 백그라운드 작업을 기다린 시간 (실행 시간에서 제외)"""
+    for probe in getattr(_local, "probes", []):
+        probe["job_wait"] += seconds
+
+
+def end_rerun_probe(probe):
+    """측정을 끝내고 작업 대기를 뺀 실행 시간(seconds)을 채운 probe 반환
+
+    중첩된 구간도 각자 측정하지만, 사용자 조작 한 번에 해당하는 바깥 구간(전체 재실행 또는
+    프래그먼트만 다시 실행)만 측정 이벤트(label "app", operation "page_run")로 내보내
+    재실행 시간 분포를 봅니다.
+    """
+    probes = getattr(_local, "probes", [])
+    if probe in probes:
+        probes.remove(probe)
+    elapsed = time.perf_counter() - probe["started_at"]
+    probe["seconds"] = max(0.0, elapsed - probe["job_wait"])
+    if probe["nested"]:
+        return probe
+    emit_metrics({
+        "label": "app",
+        "operation": "page_run",
+        "scope": probe["scope"],
+        "error": None,
+        "latency": probe["seconds"],
+        "job_wait": probe["job_wait"]
+    })
+    return probe
@@ -0,0 +1,128 @@
+import re
+from idea_sections import IDEA_SECTIONS, split_idea_sections
+
+# PRD 섹션 구성 (키, 헤더) - PRD_PROMPT_PREFIX의 구조와 같은 순서
+PRD_SECTIONS = [
+    ("overview", "📋 프로젝트 개요"),
+    ("features", "🎯 주요 기능"),
+    ("app_layout", "📱 Streamlit 앱 구성"),
+    ("data", "💾 데이터 처리"),
+    ("ai", "🤖 AI 기능"),
+    ("libraries", "📚 필요한 라이브러리"),
+    ("roadmap", "⚡ 구현 순서"),
+    ("expansion", "🚀 향후 확장 계획")
+]
+
+# '# 프로젝트명 (MVP 버전)' 제목 줄의 키
+PRD_TITLE_KEY = "title"
+
+# PRD 섹션마다 내용이 기대는 아이디어 섹션 (이 중 하나라도 바뀌면 PRD 섹션을 다시 생성)
+PRD_SECTION_DEPENDENCIES = {
+    PRD_TITLE_KEY: ["title"],
+    "overview": ["title", "overview", "problem", "users"],
+    "features": ["features", "ai_tech", "problem"],
+    "app_layout": ["features", "users"],
+    "data": ["features", "ai_tech"],
+    "ai": ["ai_tech", "features"],
+    "libraries": ["tech_stack", "ai_tech"],
+    "roadmap": ["features", "test_plan"],
+    "expansion": ["expansion", "impact"]
+}
+
+PRD_SECTION_HEADINGS = dict(PRD_SECTIONS, **{PRD_TITLE_KEY: "프로젝트명 (MVP 버전)"})
+
+
+def match_prd_heading(line):
+    """'## 🎯 주요 기능 (MVP 핵심)' 같은 헤더 줄의 PRD 섹션 키 (PRD 섹션이 아니면 None)"""
+    if line.startswith("# "):
+        return PRD_TITLE_KEY
+    if not line.startswith("## "):
+        return None
+    title = line[3:].strip().replace("\ufe0f", "")
+    for key, heading in PRD_SECTIONS:
+        # 이모지 변형(VS16 유무)과 무관하게 비교
+        if title.startswith(heading.replace("\ufe0f", "")):
+            return key
+    return None
+
+
+def parse_prd_sections(markdown):
+    """PRD 마크다운의 섹션별 {"heading", "body", "start", "end"} (start/end는 본문 위치)
+
+    제목은 '# ' 줄 자체를 본문으로 보고, 나머지는 '## ' 헤더 다음 줄부터 다음 '## ' 헤더
+    전까지입니다. 코드 블록 안의 '#' 줄은 헤더로 보지 않습니다.
+    """
+    sections = {}
+    current = None
+    in_code_block = False
+    offset = 0
+
+    def close(end):
+        if current and current["key"] not in sections:
+            sections[current["key"]] = {
+                "heading": current["heading"],
+                "body": markdown[current["start"]:end].strip(),
+                "start": current["start"],
+                "end": end
+            }
+
+    for line in markdown.splitlines(keepends=True):
+        stripped = line.rstrip("\r\n")
+        if stripped.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+        elif not in_code_block and stripped.startswith("#"):
+            key = match_prd_heading(stripped)
+            if key == PRD_TITLE_KEY:
+                close(offset)
+                current = None
+                if key not in sections:
+                    sections[key] = {"heading": "", "body": stripped[2:].strip(), "start": offset, "end": offset + len(stripped)}
+            elif stripped.startswith("## "):
+                close(offset)
+                current = {"key": key, "heading": stripped, "start": offset + len(line)} if key else None
+        offset += len(line)
+    close(len(markdown))
+    return sections
+
+
+def split_prd_sections(markdown):
+    """PRD 마크다운을 섹션 키별 본문으로 분리 (찾지 못한 섹션은 제외)"""
+    return {key: section["body"] for key, section in parse_prd_sections(markdown).items()}
+
+
+def replace_prd_sections(markdown, replacements):
+    """헤더 줄과 나머지 레이아웃은 그대로 두고 지정한 PRD 섹션의 본문(제목은 제목 줄)만 교체"""
+    sections = parse_prd_sections(markdown)
+    result = markdown
+    # 뒤쪽 섹션부터 바꿔야 앞쪽 위치가 어긋나지 않음
+    for key in sorted((key for key in replacements if key in sections), key=lambda k: sections[k]["start"], reverse=True):
+        section = sections[key]
+        if key == PRD_TITLE_KEY:
+            replacement = "# " + replacements[key].strip().lstrip("#").strip()
+        else:
+            trailing = "\n\n" if section["end"] < len(markdown) else "\n"
+            replacement = replacements[key].strip() + trailing
+        result = result[:section["start"]] + replacement + result[section["end"]:]
+    return result
+
+
+def normalize_section(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def changed_idea_sections(previous_idea, idea):
+    """두 아이디어 사이에 내용이 바뀐 아이디어 섹션 키 집합 (섹션 구조를 찾지 못하면 None)"""
+    previous_sections = split_idea_sections(previous_idea)
+    sections = split_idea_sections(idea)
+    if not previous_sections or not sections:
+        return None
+    return {
+        key for key, _, _ in IDEA_SECTIONS
+        if normalize_section(previous_sections.get(key, "")) != normalize_section(sections.get(key, ""))
+    }
+
+
+def dependent_prd_sections(changed_keys):
+    """바뀐 아이디어 섹션에 기대는 PRD 섹션 키 목록 (PRD 순서)"""
+    order = [PRD_TITLE_KEY] + [key for key, _ in PRD_SECTIONS]
+    return [key for key in order if set(PRD_SECTION_DEPENDENCIES[key]) & set(changed_keys)]
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+
+# 스로틀링으로 판단하여 재시도할 오류 코드
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException"
+}
+
+# 작업 종류별 우선순위 지연 (초) - 값이 작을수록 먼저 처리되고, 오래 기다린 작업은 결국 앞서게 됨
+PRIORITY_DELAYS = {
+    "interactive": 0.0,
+    "prd": 5.0,
+    "bulk": 30.0
+}
+
+
+def is_throttling_error(error):
+    """botocore ClientError의 오류 코드가 스로틀링/일시적 오류인지 확인"""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class TokenBucket:
+    """분당 허용량을 초당 속도로 채우는 토큰 버킷"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount):
+        """amount만큼 쌓일 때까지 남은 시간 (초)"""
+        deficit = amount - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class _Ticket:
+    def __init__(self, priority, estimated_tokens, sequence):
+        self.priority = priority
+        self.estimated_tokens = estimated_tokens
+        self.enqueued_at = time.monotonic()
+        self.sort_key = (self.enqueued_at + PRIORITY_DELAYS.get(priority, 0.0), sequence)
+
+
+class RateGovernor:
+    """모든 세션이 공유하는 Bedrock 호출 속도 조절기
+
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 토큰 버킷으로 호출을 제한하고,
+    대기 중인 요청은 작업 종류별 우선순위 지연을 더한 도착 시각 순으로 처리하여
+    대화형 요청이 대량/PRD 작업보다 먼저 처리되면서도 굶지 않도록 합니다.
+    스로틀링이 발생하면 프로세스 전체가 지터가 있는 지수 백오프만큼 쉬었다가 재시도합니다.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_retries=4, base_delay=1.0):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = 0
+        self._paused_until = 0.0
+        self._stats = {"admitted": 0, "throttled": 0, "total_wait": 0.0}
+
+    def execute(self, fn, estimated_tokens, priority="interactive", max_retries=None):
+        """대기열 순서와 속도 제한에 맞춰 fn()을 실행하고 (결과, 시도 횟수)를 반환
+
+        fn의 결과에 usage가 있으면 예상 토큰과 실제 사용량의 차이를 버킷에 반영합니다.
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        # 한 번에 버킷 용량보다 큰 요청은 영원히 대기하지 않도록 용량으로 제한
+        estimated_tokens = min(estimated_tokens, self.token_bucket.capacity)
+        attempts = 0
+
+        while True:
+            attempts += 1
+            self._acquire(estimated_tokens, priority)
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_throttling_error(e) or attempts > max_retries:
+                    raise
+                self._back_off(attempts)
+                continue
+
+            self._reconcile(estimated_tokens, result)
+            return result, attempts
+
+    def status(self):
+        """대기열 깊이(작업 종류별)와 대기열이 모두 처리될 때까지의 예상 대기 시간"""
+        with self._condition:
+            now = time.monotonic()
+            self.request_bucket.refill(now)
+            self.token_bucket.refill(now)
+
+            depth = {priority: 0 for priority in PRIORITY_DELAYS}
+            for ticket in self._queue:
+                depth[ticket.priority] = depth.get(ticket.priority, 0) + 1
+            queued_tokens = sum(ticket.estimated_tokens for ticket in self._queue)
+
+            estimated_wait = max(
+                self.request_bucket.time_until(len(self._queue)),
+                self.token_bucket.time_until(queued_tokens),
+                self._paused_until - now,
+                0.0
+            )
+            admitted = self._stats["admitted"]
+            return {
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": depth,
+                "estimated_wait": estimated_wait,
+                "admitted": admitted,
+                "throttled": self._stats["throttled"],
+                "average_wait": self._stats["total_wait"] / admitted if admitted else 0.0
+            }
+
+    def _acquire(self, estimated_tokens, priority):
+        with self._condition:
+            self._sequence += 1
+            ticket = _Ticket(priority, estimated_tokens, self._sequence)
+            self._queue.append(ticket)
+
+            while True:
+                now = time.monotonic()
+                self.request_bucket.refill(now)
+                self.token_bucket.refill(now)
+
+                head = min(self._queue, key=lambda queued: queued.sort_key)
+                if head is ticket:
+                    wait = max(
+                        self.request_bucket.time_until(1),
+                        self.token_bucket.time_until(estimated_tokens),
+                        self._paused_until - now
+                    )
+                    if wait <= 0:
+                        self.request_bucket.tokens -= 1
+                        self.token_bucket.tokens -= estimated_tokens
+                        self._queue.remove(ticket)
+                        self._stats["admitted"] += 1
+                        self._stats["total_wait"] += now - ticket.enqueued_at
+                        # 다음 순서의 요청이 바로 확인할 수 있도록 깨움
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait(timeout=wait)
+                else:
+                    # 앞선 요청이 처리되면 notify로 깨어나지만, 우선순위 역전을 위해 주기적으로도 확인
+                    self._condition.wait(timeout=1.0)
+
+    def _back_off(self, attempts):
+        delay = self.base_delay * (2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+        with self._condition:
+            self._stats["throttled"] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._condition.notify_all()
+        time.sleep(delay)
+
+    def _reconcile(self, estimated_tokens, result):
+        usage = result.get("usage") if isinstance(result, dict) else None
+        if not usage:
+            return
+        actual_tokens = usage.get("inputTokens", 0) + usage.get("outputTokens", 0)
+        with self._condition:
+            self.token_bucket.tokens = min(
+                self.token_bucket.capacity,
+                self.token_bucket.tokens + estimated_tokens - actual_tokens
+            )
+            self._condition.notify_all()
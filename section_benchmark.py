@@ -0,0 +1,77 @@
+"""'상세' 아이디어의 단일 호출 생성과 섹션 병렬 생성의 대기 시간 비교
+
+실제 Bedrock을 호출하므로 비용이 발생합니다. 캐시를 건너뛰고(fresh) 매번 새로 생성합니다.
+
+    python section_benchmark.py --runs 3 --workers 8
+"""
+import argparse
+import statistics
+import sys
+import time
+from hackathon_generator import (
+    build_idea_request, generate_idea_by_sections, generate_with_routing, get_bedrock_client
+)
+
+# 벤치마크 기본 입력 (앱의 예시 입력과 동일)
+DEFAULT_INPUTS = (
+    "폐기물 관리",
+    "음식물 쓰레기 증가로 인한 환경 오염과 자원 낭비 문제",
+    "컴퓨터 비전, 자연어 처리, 머신러닝 예측 모델",
+    "일반 가정, 식당 운영자, 지자체",
+    "음식물 쓰레기 30% 감소, CO2 배출량 저감, 자원 순환 촉진"
+)
+
+
+def time_single_call(bedrock_client, idea_length):
+    prompt_prefix, prompt, inference_config, _ = build_idea_request(*DEFAULT_INPUTS, idea_length)
+    start_time = time.perf_counter()
+    result = generate_with_routing(
+        bedrock_client, idea_length, prompt, inference_config, fresh=True, label="idea", prompt_prefix=prompt_prefix
+    )
+    return time.perf_counter() - start_time, result
+
+
+def time_sectioned(bedrock_client, idea_length, max_workers):
+    start_time = time.perf_counter()
+    result = generate_idea_by_sections(bedrock_client, *DEFAULT_INPUTS, idea_length, fresh=True, max_workers=max_workers)
+    return time.perf_counter() - start_time, result
+
+
+def summarize(label, samples):
+    walls = [wall for wall, _ in samples]
+    chars = [len(result["text"]) for _, result in samples]
+    tokens = [result["usage"]["outputTokens"] for _, result in samples]
+    return (
+        f"{label}: 중앙값 {statistics.median(walls):.2f}초 · 평균 {statistics.mean(walls):.2f}초 · "
+        f"최대 {max(walls):.2f}초 · 평균 {statistics.mean(chars):,.0f}자 · 출력 토큰 평균 {statistics.mean(tokens):,.0f}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="단일 호출과 섹션 병렬 생성의 전체 대기 시간을 비교합니다.")
+    parser.add_argument("--runs", type=int, default=3, help="방식별 반복 횟수 (기본값: 3)")
+    parser.add_argument("--workers", type=int, default=8, help="섹션 병렬 생성 동시 호출 수 (기본값: 8)")
+    parser.add_argument("--idea-length", default="상세", choices=["간단", "보통", "상세"])
+    args = parser.parse_args(argv)
+
+    bedrock_client = get_bedrock_client()
+    if not bedrock_client:
+        print("❌ AWS Bedrock 연결에 실패했습니다.")
+        return 1
+
+    # 두 방식을 번갈아 실행하여 시간대별 부하 차이가 한쪽에 몰리지 않도록 함
+    single, sectioned = [], []
+    for run in range(1, args.runs + 1):
+        single.append(time_single_call(bedrock_client, args.idea_length))
+        sectioned.append(time_sectioned(bedrock_client, args.idea_length, args.workers))
+        print(f"[{run}/{args.runs}] 단일 {single[-1][0]:.2f}초 · 섹션 병렬 {sectioned[-1][0]:.2f}초", flush=True)
+
+    print(summarize("단일 호출", single))
+    print(summarize("섹션 병렬", sectioned))
+    speedup = statistics.median(wall for wall, _ in single) / statistics.median(wall for wall, _ in sectioned)
+    print(f"⚡ 중앙값 기준 속도 향상: {speedup:.2f}배")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+
+def compression_codec():
+    """사용할 압축 방식 (zstandard가 설치되어 있으면 zstd, 없으면 zlib)"""
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress_value(value, codec):
+    data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    if codec == "zstd":
+        return len(data), zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return len(data), zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_value(blob, codec):
+    if codec == "zstd":
+        data = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        data = zlib.decompress(blob)
+    return json.loads(data.decode("utf-8"))
+
+
+class SessionResultStore:
+    """세션별 생성 결과(아이디어/PRD 등)를 압축해 보관하는 서버 측 저장소
+
+    session_state에는 put()이 돌려준 작은 핸들만 두고 본문은 여기에 둡니다. 메모리에 둔
+    압축 본문의 합이 memory_budget_bytes를 넘거나 세션이 idle_seconds 동안 접근되지 않으면
+    가장 오래 접근하지 않은 세션부터 본문을 spill_dir의 파일로 내리고, 다시 읽을 때 메모리로
+    올립니다. disk_ttl_seconds 동안 접근하지 않은 세션(브라우저를 닫은 세션 등)은 삭제합니다.
+    이전 프로세스의 핸들은 쓸 수 없으므로 시작할 때 spill_dir를 비웁니다.
+    """
+
+    def __init__(self, spill_dir, memory_budget_bytes=64 * 1024 * 1024, idle_seconds=30 * 60, disk_ttl_seconds=24 * 60 * 60):
+        self.spill_dir = spill_dir
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_seconds = idle_seconds
+        self.disk_ttl_seconds = disk_ttl_seconds
+        self.codec = compression_codec()
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # 세션 ID -> {"handles", "last_access"} (오래 접근하지 않은 순)
+        self._items = {}  # 핸들 -> {"session_id", "codec", "raw_bytes", "stored_bytes", "blob"} (디스크에 있으면 blob은 None)
+        self._memory_bytes = 0
+        self._counters = {"spills": 0, "loads": 0, "expired_sessions": 0}
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        os.makedirs(spill_dir, exist_ok=True)
+
+    def put(self, session_id, value):
+        """값을 압축해 보관하고 핸들 반환"""
+        raw_bytes, blob = compress_value(value, self.codec)
+        handle = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            self._items[handle] = {
+                "session_id": session_id, "codec": self.codec, "raw_bytes": raw_bytes, "stored_bytes": len(blob), "blob": blob
+            }
+            self._touch(session_id, now)["handles"].add(handle)
+            self._memory_bytes += len(blob)
+            self._enforce(now, keep=session_id)
+        return handle
+
+    def get(self, handle):
+        """핸들의 값 (없거나 만료되었으면 None, 디스크에 있으면 메모리로 다시 올림)"""
+        now = time.monotonic()
+        with self._lock:
+            self._enforce(now)
+            item = self._items.get(handle)
+            if item is None:
+                return None
+            if item["blob"] is None:
+                path = self._spill_path(handle)
+                try:
+                    with open(path, 'rb') as f:
+                        item["blob"] = f.read()
+                except OSError:
+                    self._remove(handle)
+                    return None
+                os.remove(path)
+                self._memory_bytes += item["stored_bytes"]
+                self._counters["loads"] += 1
+            self._touch(item["session_id"], now)
+            self._enforce(now, keep=item["session_id"])
+            blob, codec = item["blob"], item["codec"]
+        return decompress_value(blob, codec)
+
+    def delete(self, handle):
+        with self._lock:
+            self._remove(handle)
+
+    def session_stats(self, session_id):
+        """세션 하나의 보관 항목 수와 메모리/디스크/압축 전 바이트 수"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return self._summarize(session["handles"] if session else ())
+
+    def stats(self):
+        """전체 메모리/디스크 사용량, 세션 수, 압축률과 세션별 사용량"""
+        with self._lock:
+            self._enforce(time.monotonic())
+            sessions = {session_id: self._summarize(session["handles"]) for session_id, session in self._sessions.items()}
+            totals = self._summarize(self._items)
+            counters = dict(self._counters)
+        return dict(
+            totals,
+            **counters,
+            sessions=sessions,
+            session_count=len(sessions),
+            memory_budget_bytes=self.memory_budget_bytes,
+            codec=self.codec,
+            compression_ratio=totals["stored_bytes"] / totals["raw_bytes"] if totals["raw_bytes"] else 0.0
+        )
+
+    def _summarize(self, handles):
+        items = [self._items[handle] for handle in handles]
+        return {
+            "items": len(items),
+            "memory_bytes": sum(item["stored_bytes"] for item in items if item["blob"] is not None),
+            "disk_bytes": sum(item["stored_bytes"] for item in items if item["blob"] is None),
+            "raw_bytes": sum(item["raw_bytes"] for item in items),
+            "stored_bytes": sum(item["stored_bytes"] for item in items)
+        }
+
+    def _touch(self, session_id, now):
+        session = self._sessions.setdefault(session_id, {"handles": set(), "last_access": now})
+        session["last_access"] = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _spill_path(self, handle):
+        return os.path.join(self.spill_dir, handle + ".bin")
+
+    def _remove(self, handle):
+        item = self._items.pop(handle, None)
+        if item is None:
+            return
+        if item["blob"] is not None:
+            self._memory_bytes -= item["stored_bytes"]
+        else:
+            try:
+                os.remove(self._spill_path(handle))
+            except OSError:
+                pass
+        session = self._sessions.get(item["session_id"])
+        if session:
+            session["handles"].discard(handle)
+
+    def _spill(self, session):
+        for handle in session["handles"]:
+            item = self._items[handle]
+            if item["blob"] is None:
+                continue
+            try:
+                with open(self._spill_path(handle), 'wb') as f:
+                    f.write(item["blob"])
+            except OSError:
+                # 디스크에 쓰지 못하면 메모리에 그대로 둠 (예산을 잠시 넘더라도 결과를 잃지 않도록)
+                continue
+            item["blob"] = None
+            self._memory_bytes -= item["stored_bytes"]
+            self._counters["spills"] += 1
+
+    def _enforce(self, now, keep=None):
+        # 오래 접근하지 않은 세션부터: 보관 기간이 지났으면 삭제, 유휴 상태이거나 예산을 넘었으면 디스크로 내림
+        for session_id, session in list(self._sessions.items()):
+            idle = now - session["last_access"]
+            over_budget = self._memory_bytes > self.memory_budget_bytes
+            if idle <= self.idle_seconds and not over_budget:
+                break
+            if session_id == keep:
+                continue
+            if idle > self.disk_ttl_seconds or not session["handles"]:
+                for handle in list(session["handles"]):
+                    self._remove(handle)
+                del self._sessions[session_id]
+                self._counters["expired_sessions"] += 1
+            else:
+                self._spill(session)
@@ -0,0 +1,148 @@
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+# MinHash 서명 길이와 LSH 밴드 구성 (NUM_BANDS * BAND_ROWS == NUM_PERMUTATIONS)
+# 밴드 16개 × 4행이면 자카드 유사도 약 0.5부터 후보가 되기 시작하고 0.75 이상은 거의 놓치지 않음
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+BAND_ROWS = NUM_PERMUTATIONS // NUM_BANDS
+SHINGLE_SIZE = 3  # 글자 n-gram 크기 (한국어는 띄어쓰기/조사가 달라도 3글자 조각이 많이 겹침)
+MERSENNE_PRIME = (1 << 31) - 1
+# lsh_buckets의 버킷 값 계산 방식 버전 (PRAGMA user_version, 바뀌면 저장된 서명으로 버킷을 다시 만듦)
+BUCKET_SCHEMA_VERSION = 1
+
+_random = random.Random(20240601)  # 서명이 프로세스 사이에서 같도록 고정 시드 사용
+PERMUTATIONS = [(_random.randrange(1, MERSENNE_PRIME), _random.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def normalize_text(text):
+    """소문자화하고 문장 부호/연속 공백을 공백 하나로 정리"""
+    return re.sub(r"[\W_]+", " ", text.lower()).strip()
+
+
+def shingle_hashes(text):
+    """정규화한 텍스트의 글자 n-gram 해시 집합"""
+    text = normalize_text(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[index:index + SHINGLE_SIZE].encode('utf-8')) for index in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text):
+    """글자 n-gram 집합의 MinHash 서명 (NUM_PERMUTATIONS개 정수, 빈 텍스트면 None)"""
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+    return array('I', [min((a * value + b) % MERSENNE_PRIME for value in hashes) for a, b in PERMUTATIONS])
+
+
+def band_buckets(signature):
+    """밴드별 버킷 값 [(밴드 번호, 버킷 해시)]
+
+    버킷 값은 SQLite에 저장되므로 파이썬 버전이나 프로세스와 무관하게 같아야 합니다.
+    밴드 값을 고정된 바이트 순서로 묶어 blake2b 다이제스트 8바이트를 부호 있는 정수로 씁니다.
+    """
+    buckets = []
+    for band in range(NUM_BANDS):
+        packed = struct.pack(f"<{BAND_ROWS}I", *signature[band * BAND_ROWS:(band + 1) * BAND_ROWS])
+        buckets.append((band, int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little", signed=True)))
+    return buckets
+
+
+def estimate_similarity(signature, other):
+    """두 MinHash 서명이 일치하는 비율 (자카드 유사도 추정값)"""
+    return sum(1 for left, right in zip(signature, other) if left == right) / NUM_PERMUTATIONS
+
+
+class SimilarityIndex:
+    """글자 n-gram MinHash와 LSH 밴드로 비슷한 이전 입력을 찾는 SQLite 색인
+
+    서명과 밴드별 버킷을 모두 SQLite에 두므로 프로세스를 다시 시작해도 색인을 새로 만들
+    필요가 없고, 항목 추가는 밴드 수만큼의 행 삽입, 조회는 (밴드, 버킷) 색인 조회와
+    후보 서명 비교뿐이라 기록이 10만 건이어도 몇 밀리초 안에 끝납니다. 같은 자리 표시자
+    문장처럼 아주 흔한 입력도 후보를 max_candidates개(최신순)까지만 비교합니다.
+    """
+
+    def __init__(self, db_path, max_candidates=200):
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "item_id INTEGER PRIMARY KEY, signature BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lsh_buckets (band INTEGER NOT NULL, bucket INTEGER NOT NULL, item_id INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets (band, bucket, item_id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_lsh_buckets_item ON lsh_buckets (item_id)")
+        self._db.commit()
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < BUCKET_SCHEMA_VERSION:
+            self._rebuild_buckets()
+
+    def _rebuild_buckets(self):
+        # 이전 방식(파이썬 내장 hash)으로 만든 버킷을 저장된 서명에서 다시 계산
+        with self._lock:
+            self._db.execute("DELETE FROM lsh_buckets")
+            for item_id, blob in self._db.execute("SELECT item_id, signature FROM signatures").fetchall():
+                self._db.executemany(
+                    "INSERT INTO lsh_buckets (band, bucket, item_id) VALUES (?, ?, ?)",
+                    [(band, bucket, item_id) for band, bucket in band_buckets(array('I', blob))]
+                )
+            self._db.execute(f"PRAGMA user_version = {BUCKET_SCHEMA_VERSION}")
+            self._db.commit()
+
+    def add(self, item_id, text):
+        """item_id의 텍스트를 색인에 추가 (이미 있으면 교체)"""
+        signature = minhash_signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            self._db.execute("DELETE FROM lsh_buckets WHERE item_id = ?", (item_id,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO signatures (item_id, signature, created_at) VALUES (?, ?, ?)",
+                (item_id, signature.tobytes(), time.time())
+            )
+            self._db.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, item_id) VALUES (?, ?, ?)",
+                [(band, bucket, item_id) for band, bucket in band_buckets(signature)]
+            )
+            self._db.commit()
+
+    def query(self, text, threshold=0.75, limit=3):
+        """추정 유사도가 threshold 이상인 항목 [{"item_id", "similarity"}] (유사도 높은 순)"""
+        signature = minhash_signature(text)
+        if signature is None:
+            return []
+        buckets = band_buckets(signature)
+        condition = " OR ".join(["(band = ? AND bucket = ?)"] * len(buckets))
+        params = [value for pair in buckets for value in pair]
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT item_id, signature FROM signatures WHERE item_id IN ("
+                f"SELECT DISTINCT item_id FROM lsh_buckets WHERE {condition} ORDER BY item_id DESC LIMIT ?)",
+                params + [self.max_candidates]
+            ).fetchall()
+
+        matches = []
+        for item_id, blob in rows:
+            similarity = estimate_similarity(signature, array('I', blob))
+            if similarity >= threshold:
+                matches.append({"item_id": item_id, "similarity": similarity})
+        matches.sort(key=lambda match: (match["similarity"], match["item_id"]), reverse=True)
+        return matches[:limit]
+
+    def max_item_id(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(item_id), 0) FROM signatures").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {"items": self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]}
@@ -0,0 +1,90 @@
+import threading
+
+
+class _Call:
+    """진행 중인 하나의 업스트림 호출 상태"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.done = False
+        self.result = None
+        self.error = None
+        self.partial = None
+        self.version = 0
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 하나의 업스트림 호출로 합치는 프로세스 단위 계층
+
+    먼저 도착한 요청(리더)만 실제로 호출하고, 같은 키의 나머지 요청(팔로워)은
+    리더가 끝날 때까지 기다렸다가 같은 결과(또는 같은 예외)를 공유합니다.
+    리더가 publish로 부분 결과를 알리면 팔로워의 on_progress로도 전달됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"leaders": 0, "followers": 0}
+
+    def do(self, key, fn, on_progress=None):
+        """fn(publish)를 키당 한 번만 실행하고 (결과, 공유 여부)를 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["leaders"] += 1
+            else:
+                self._stats["followers"] += 1
+
+        if is_leader:
+            return self._run(key, call, fn), False
+        return self._wait(call, on_progress), True
+
+    def stats(self):
+        """리더/팔로워 수와 현재 진행 중인 호출 수 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+    def _run(self, key, call, fn):
+        def publish(partial):
+            with call.condition:
+                call.partial = partial
+                call.version += 1
+                call.condition.notify_all()
+
+        try:
+            call.result = fn(publish)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # 완료 후에는 새 요청이 새 호출을 시작하도록 먼저 등록을 해제
+            with self._lock:
+                self._calls.pop(key, None)
+            with call.condition:
+                call.done = True
+                call.condition.notify_all()
+
+    def _wait(self, call, on_progress):
+        seen_version = 0
+        while True:
+            with call.condition:
+                while not call.done and call.version == seen_version:
+                    call.condition.wait()
+                done = call.done
+                partial = call.partial
+                seen_version = call.version
+
+            if done:
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            # 콜백은 락 밖에서 호출하여 리더를 막지 않음
+            if on_progress and partial is not None:
+                on_progress(partial)
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SpeculativeEntry:
+    """미리 시작한 작업 하나 (진행 중이면 partial에 부분 결과가 쌓이고, 끝나면 future에 결과)"""
+
+    def __init__(self, key, estimated_tokens):
+        self.key = key
+        self.estimated_tokens = estimated_tokens
+        self.partial = ""
+        self.future = None
+        self.created_at = time.monotonic()
+        self.finished_at = None
+
+    def publish(self, text):
+        self.partial = text
+
+
+class SpeculativeStore:
+    """사용자가 요청하기 전에 미리 실행한 작업의 결과를 잠시 보관하는 저장소
+
+    start(key, fn)은 전체 예산 안에서만 fn(publish)을 백그라운드로 실행하고, claim(key)은
+    끝났거나 진행 중인 항목을 꺼내 돌려줍니다. 끝난 뒤 ttl_seconds 동안 찾아가지 않은
+    결과는 버리며, 보관 항목은 max_entries개를 넘지 않습니다. 예산은 동시에 실행하는
+    작업 수(max_inflight)와 최근 1시간 동안 미리 쓸 수 있는 추정 토큰 수로 제한합니다.
+    """
+
+    def __init__(self, max_entries=64, ttl_seconds=10 * 60, max_inflight=4, token_budget_per_hour=200000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_inflight = max_inflight
+        self.token_budget_per_hour = token_budget_per_hour
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="speculative")
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._reservations = []  # (시작 시각, 추정 토큰 수)
+        self._stats = {"started": 0, "claimed": 0, "claimed_in_flight": 0, "misses": 0, "expired": 0, "rejected": 0}
+
+    def start(self, key, fn, estimated_tokens):
+        """예산이 남아 있으면 fn(publish)을 백그라운드로 시작하고 True (이미 있거나 예산 초과면 False)"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            if key in self._entries:
+                return False
+            # 보관 한도에 닿았으면 오래된 끝난 항목부터 비움
+            finished = [old_key for old_key, entry in self._entries.items() if entry.finished_at is not None]
+            for old_key in finished[:max(0, len(self._entries) - self.max_entries + 1)]:
+                del self._entries[old_key]
+                self._stats["expired"] += 1
+            self._reservations = [(at, tokens) for at, tokens in self._reservations if now - at < 60 * 60]
+            inflight = sum(1 for entry in self._entries.values() if entry.finished_at is None)
+            reserved = sum(tokens for _, tokens in self._reservations)
+            if (inflight >= self.max_inflight or len(self._entries) >= self.max_entries
+                    or reserved + estimated_tokens > self.token_budget_per_hour):
+                self._stats["rejected"] += 1
+                return False
+
+            entry = SpeculativeEntry(key, estimated_tokens)
+            self._entries[key] = entry
+            self._reservations.append((now, estimated_tokens))
+            self._stats["started"] += 1
+            entry.future = self._executor.submit(self._run, entry, fn)
+            return True
+
+    def claim(self, key):
+        """key의 항목을 꺼내 반환 (없거나 만료되었으면 None, 진행 중이면 future로 기다릴 수 있음)"""
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["claimed"] += 1
+            if entry.finished_at is None:
+                self._stats["claimed_in_flight"] += 1
+            return entry
+
+    def stats(self):
+        """시작/적중/만료/예산 초과 횟수와 현재 보관 중인 항목 수"""
+        with self._lock:
+            self._evict(time.monotonic())
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["in_flight"] = sum(1 for entry in self._entries.values() if entry.finished_at is None)
+        stats["hit_rate"] = stats["claimed"] / stats["started"] if stats["started"] else 0.0
+        return stats
+
+    def _run(self, entry, fn):
+        try:
+            return fn(entry.publish)
+        finally:
+            with self._lock:
+                entry.finished_at = time.monotonic()
+
+    def _evict(self, now):
+        # 끝난 뒤 TTL이 지나도록 찾아가지 않은 항목 삭제
+        for key, entry in list(self._entries.items()):
+            if entry.finished_at is not None and now - entry.finished_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats["expired"] += 1
@@ -0,0 +1,212 @@
+"""측정 이벤트를 Prometheus 텍스트 형식 메트릭과 (선택) OpenTelemetry 스팬으로 내보내는 훅
+
+nova_engine의 측정 이벤트(emit_metrics)를 받아 생성기(label)와 길이 옵션(idea_length)별로
+집계하므로 디버그 모드를 켜지 않아도 운영 중인 앱의 상태를 수집할 수 있습니다.
+
+    METRICS_PORT=9464 streamlit run app.py  # 127.0.0.1:9464/metrics 제공 (기본값은 끔)
+    curl http://127.0.0.1:9464/metrics
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+# /metrics를 제공할 포트 (지정하지 않거나 0이면 별도 HTTP 서버를 띄우지 않음)
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0") or 0)
+
+# OpenTelemetry SDK가 설치되어 있고 이 값이 켜져 있으면 측정 이벤트를 스팬으로도 기록
+OTEL_SPANS_ENABLED = os.environ.get("OTEL_SPANS_ENABLED", "").lower() in ("1", "true", "yes")
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+FILE_WRITE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+PAGE_RUN_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_HELP = {
+    "nova_bedrock_request_duration_seconds": ("histogram", "Bedrock 호출 한 번의 지연 시간"),
+    "nova_bedrock_requests_total": ("counter", "Bedrock 호출 수 (outcome=ok/error)"),
+    "nova_bedrock_tokens_total": ("counter", "Bedrock이 보고한 토큰 수 (direction=input/output/cache_read/cache_write)"),
+    "nova_bedrock_stop_reasons_total": ("counter", "Bedrock 응답의 stopReason 분포"),
+    "nova_truncation_retries_total": ("counter", "maxTokens로 잘려 이어쓰기한 호출 수"),
+    "nova_response_cache_lookups_total": ("counter", "응답 캐시 조회 수 (result=hit/miss)"),
+    "nova_queue_wait_seconds": ("histogram", "호출 속도 조절기/스로틀링 재시도로 기다린 시간"),
+    "nova_prd_file_writes_total": ("counter", "PRD 파일 저장 수 (outcome=ok/error)"),
+    "nova_prd_file_write_chars_total": ("counter", "저장한 PRD 글자 수"),
+    "nova_prd_file_write_duration_seconds": ("histogram", "PRD 파일 저장 시간"),
+    "nova_page_run_duration_seconds": ("histogram", "화면 재실행 시간 (scope=app/프래그먼트, 작업 대기 제외)"),
+}
+
+
+def escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusMetrics:
+    """측정 이벤트를 카운터/히스토그램으로 모아 Prometheus 텍스트 형식으로 내보내는 메트릭 훅
+
+    Bedrock 호출은 generator(이벤트의 label), idea_length, model_id 레이블로 나뉩니다.
+    add_gauge_collector(fn)로 등록한 함수는 수집(render) 시점에 호출되어
+    [(메트릭 이름, {레이블}, 값)] 목록을 게이지로 덧붙입니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauge_collectors = []
+
+    def add_gauge_collector(self, collector):
+        self._gauge_collectors.append(collector)
+
+    def __call__(self, event):
+        operation = event.get("operation")
+        base = (
+            ("generator", event.get("label") or "unlabeled"),
+            ("idea_length", event.get("idea_length") or ""),
+        )
+        with self._lock:
+            if operation in ("invoke", "stream"):
+                labels = base + (("model_id", event.get("model_id") or ""), ("operation", operation))
+                self._observe("nova_bedrock_request_duration_seconds", labels, event["latency"], LATENCY_BUCKETS)
+                self._increment("nova_bedrock_requests_total", labels + (("outcome", "error" if event.get("error") else "ok"),))
+                usage = event.get("usage") or {}
+                for direction, key in (("input", "inputTokens"), ("output", "outputTokens"),
+                                       ("cache_read", "cacheReadInputTokenCount"), ("cache_write", "cacheWriteInputTokenCount")):
+                    if usage.get(key):
+                        self._increment("nova_bedrock_tokens_total", labels + (("direction", direction),), usage[key])
+                if event.get("stop_reason"):
+                    self._increment("nova_bedrock_stop_reasons_total", base + (("stop_reason", event["stop_reason"]),))
+                if event.get("continuation_round"):
+                    self._increment("nova_truncation_retries_total", base)
+            elif operation == "cache_lookup" and not event.get("error"):
+                self._increment("nova_response_cache_lookups_total", base + (("result", "hit" if event.get("cache_hit") else "miss"),))
+            elif operation == "queue_wait":
+                self._observe("nova_queue_wait_seconds", base, event["latency"], LATENCY_BUCKETS)
+            elif operation == "file_write" and event.get("label") == "prd":
+                outcome = "error" if event.get("error") else "ok"
+                self._increment("nova_prd_file_writes_total", (("outcome", outcome),))
+                if not event.get("error"):
+                    self._increment("nova_prd_file_write_chars_total", (), event.get("chars") or 0)
+                self._observe("nova_prd_file_write_duration_seconds", (), event["latency"], FILE_WRITE_BUCKETS)
+            elif operation == "page_run":
+                self._observe("nova_page_run_duration_seconds", (("scope", event.get("scope") or "app"),), event["latency"], PAGE_RUN_BUCKETS)
+
+    def _increment(self, name, labels, amount=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                histogram["counts"][index] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식(0.0.4) 문자열"""
+        samples = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                samples.setdefault(name, []).append(f"{name}{format_labels(labels)} {format_value(value)}")
+            for (name, labels), histogram in self._histograms.items():
+                lines = samples.setdefault(name, [])
+                for bound, count in zip(histogram["buckets"], histogram["counts"]):
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', format_value(bound)),))} {count}")
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(histogram['sum'])}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram['count']}")
+
+        gauges = {}
+        for collector in self._gauge_collectors:
+            try:
+                for name, labels, value in collector():
+                    gauges.setdefault(name, []).append(f"{name}{format_labels(tuple(labels.items()))} {format_value(value)}")
+            except Exception:
+                continue
+
+        output = []
+        for name, lines in sorted(samples.items()):
+            kind, help_text = METRIC_HELP.get(name, ("untyped", ""))
+            output += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"] + lines
+        for name, lines in sorted(gauges.items()):
+            output += [f"# TYPE {name} gauge"] + sorted(lines)
+        return "\n".join(output) + "\n"
+
+
+class OpenTelemetrySpans:
+    """측정 이벤트를 OpenTelemetry 스팬으로 기록하는 메트릭 훅
+
+    이벤트는 구간이 끝난 뒤 전달되므로 지연 시간으로 시작 시각을 거꾸로 계산해 스팬을
+    만듭니다. 내보내기(exporter) 설정은 OpenTelemetry SDK의 표준 환경 변수를 따릅니다.
+    """
+
+    def __init__(self, tracer=None):
+        self._tracer = tracer or otel_trace.get_tracer("nova_engine")
+
+    def __call__(self, event):
+        end_time = time.time_ns()
+        start_time = end_time - int(event.get("latency", 0.0) * 1e9)
+        attributes = {
+            f"nova.{key}": value for key, value in event.items()
+            if isinstance(value, (str, bool, int, float)) and key != "latency"
+        }
+        for key, value in (event.get("usage") or {}).items():
+            if isinstance(value, (int, float)):
+                attributes[f"nova.usage.{key}"] = value
+        name = f"{event.get('label') or 'unlabeled'}.{event.get('operation')}"
+        span = self._tracer.start_span(name, start_time=start_time, attributes=attributes)
+        if event.get("error"):
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(event["error"])))
+        span.end(end_time=end_time)
+
+
+def opentelemetry_available():
+    return otel_trace is not None
+
+
+def start_metrics_server(metrics, host=METRICS_HOST, port=METRICS_PORT):
+    """GET /metrics로 metrics.render()를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,41 @@
+import io
+import os
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import bulk_generation
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+BRIEFS_CSV = (
+    "problem_area,target_problem,ai_technology,target_users,expected_impact,idea_length\n"
+    "폐기물 관리,음식물 쓰레기,자연어 처리,일반 가정,쓰레기 30% 감소,간단\n"
+)
+
+
+class UploadedBriefs(io.BytesIO):
+    name = "briefs.csv"
+
+
+def test_bulk_tab_starts_job(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(bulk_generation, "BULK_OUTPUT_DIR", str(tmp_path / "bulk_outputs"))
+    submitted = []
+
+    def fake_submit(briefs, output_path, concurrency=4, max_retries=4):
+        submitted.append((briefs, output_path))
+        return "bulk-test-job"
+
+    monkeypatch.setattr(bulk_generation, "submit_bulk_job", fake_submit)
+    # AppTest는 파일 업로드를 지원하지 않으므로 업로드된 파일을 대신 반환
+    monkeypatch.setattr(st, "file_uploader", lambda *args, **kwargs: UploadedBriefs(BRIEFS_CSV.encode("utf-8")))
+
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    [button for button in at.button if "대량 생성 시작" in button.label][0].click().run()
+
+    assert not at.exception
+    assert len(submitted) == 1
+    briefs, output_path = submitted[0]
+    assert len(briefs) == 1
+    assert output_path == os.path.join(str(tmp_path / "bulk_outputs"), "bulk_ideas.jsonl")
@@ -0,0 +1,18 @@
+import hackathon_generator
+
+
+def test_unparseable_idea_falls_back_to_full_generation(monkeypatch):
+    calls = []
+
+    def fake_generate(idea_content, on_chunk=None, metrics=None, fresh=False):
+        calls.append(idea_content)
+        return "# 새 PRD"
+
+    monkeypatch.setattr(hackathon_generator, "generate_streamlit_prd", fake_generate)
+    metrics = {}
+    prd = hackathon_generator.regenerate_prd_incrementally(
+        "no headings here", "# X\n## 📋 프로젝트 개요\nfoo\n", "still no headings", None, metrics=metrics
+    )
+    assert prd == "# 새 PRD"
+    assert calls == ["still no headings"]
+    assert metrics["mode"] == "full"
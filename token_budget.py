@@ -0,0 +1,108 @@
+import math
+import sqlite3
+import threading
+import time
+
+
+class TokenBudgetEstimator:
+    """실제 usage 기록으로 길이 옵션별 maxTokens를 보정하는 추정기
+
+    길이 옵션(간단/보통/상세)마다 최근 응답의 글자 수, 출력 토큰 수, 첫 호출의
+    잘림 여부를 SQLite에 롤링 기록으로 저장합니다. 이어쓰기로 완료된 응답의
+    전체 출력 토큰은 그 요청에 실제로 필요했던 토큰 수이므로, 목표 잘림 비율에
+    해당하는 분위수를 maxTokens로 사용합니다. 기록이 부족하면 기본값을 그대로 씁니다.
+    """
+
+    def __init__(self, db_path, target_truncation_rate=0.05, history_size=200, min_samples=10,
+                 safety_margin=1.05, rounding=100, max_tokens_ceiling=5000):
+        self.target_truncation_rate = target_truncation_rate
+        self.history_size = history_size
+        self.min_samples = min_samples
+        self.safety_margin = safety_margin
+        self.rounding = rounding
+        self.max_tokens_ceiling = max_tokens_ceiling
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS token_observations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, tier TEXT NOT NULL, output_chars INTEGER NOT NULL, "
+            "output_tokens INTEGER NOT NULL, max_tokens INTEGER NOT NULL, predicted_tokens INTEGER, "
+            "truncated INTEGER NOT NULL, completed INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_token_observations_tier ON token_observations (tier, id)")
+        self._db.commit()
+
+    def max_tokens_for(self, tier, default_max_tokens):
+        """목표 잘림 비율을 맞추는 maxTokens (기록이 부족하면 기본값)"""
+        needs = [row[1] for row in self._history(tier) if row[4]]
+        if len(needs) < self.min_samples:
+            return default_max_tokens
+
+        needs.sort()
+        rank = max(1, math.ceil((1 - self.target_truncation_rate) * len(needs)))
+        budget = needs[rank - 1] * self.safety_margin
+        # 캐시 키가 자주 바뀌지 않도록 일정 단위로 올림
+        budget = int(math.ceil(budget / self.rounding) * self.rounding)
+        return max(self.rounding, min(budget, self.max_tokens_ceiling))
+
+    def predict_tokens(self, tier, char_limit):
+        """학습된 글자/토큰 비율로 목표 글자 수에 필요한 출력 토큰 수 예측 (기록이 없으면 None)"""
+        ratio = self.chars_per_token(tier)
+        return int(math.ceil(char_limit / ratio)) if ratio else None
+
+    def chars_per_token(self, tier):
+        rows = self._history(tier)
+        total_tokens = sum(row[1] for row in rows)
+        return sum(row[0] for row in rows) / total_tokens if total_tokens else None
+
+    def record(self, tier, output_chars, output_tokens, max_tokens, truncated, completed, predicted_tokens=None):
+        """응답 하나의 실제 사용량 기록 (길이 옵션별 최근 history_size개만 유지)"""
+        if output_tokens <= 0:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO token_observations "
+                "(tier, output_chars, output_tokens, max_tokens, predicted_tokens, truncated, completed, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (tier, output_chars, output_tokens, max_tokens, predicted_tokens, int(truncated), int(completed), time.time())
+            )
+            self._db.execute(
+                "DELETE FROM token_observations WHERE tier = ? AND id NOT IN ("
+                "SELECT id FROM token_observations WHERE tier = ? ORDER BY id DESC LIMIT ?)",
+                (tier, tier, self.history_size)
+            )
+            self._db.commit()
+
+    def report(self, defaults):
+        """길이 옵션별 예측 토큰과 실제 토큰 비교 리포트
+
+        defaults는 {길이 옵션: 기본 maxTokens} 딕셔너리입니다.
+        """
+        rows = []
+        for tier, default_max_tokens in defaults.items():
+            history = self._history(tier)
+            actual = [row[1] for row in history]
+            predicted_pairs = [(row[3], row[1]) for row in history if row[3]]
+            ratio = self.chars_per_token(tier)
+            rows.append({
+                "길이": tier,
+                "표본 수": len(history),
+                "글자/토큰": round(ratio, 2) if ratio else None,
+                "기본 maxTokens": default_max_tokens,
+                "보정 maxTokens": self.max_tokens_for(tier, default_max_tokens),
+                "잘림 비율": round(sum(row[2] for row in history) / len(history), 3) if history else None,
+                "평균 예측 토큰": round(sum(pair[0] for pair in predicted_pairs) / len(predicted_pairs)) if predicted_pairs else None,
+                "평균 실제 토큰": round(sum(actual) / len(actual)) if actual else None,
+                "평균 절대 오차": round(sum(abs(p - a) for p, a in predicted_pairs) / len(predicted_pairs)) if predicted_pairs else None
+            })
+        return rows
+
+    def _history(self, tier):
+        """(output_chars, output_tokens, truncated, predicted_tokens, completed) 목록"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT output_chars, output_tokens, truncated, predicted_tokens, completed "
+                "FROM token_observations WHERE tier = ? ORDER BY id DESC LIMIT ?",
+                (tier, self.history_size)
+            ).fetchall()